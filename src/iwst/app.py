@@ -20,6 +20,11 @@ import logging
 logger = logging.getLogger()
 
 from iwst.utils.login import User, restrict_access
+from iwst.utils.cache import get_result_cache
+from iwst.utils.images import IMAGES_URL, get_image_store
+from iwst.utils.config import get_compute_config, set_app_config
+from iwst.routes.home.artifacts import load_default_artifacts, serve_default_artifacts
+from iwst.routes.home.components.tabs import set_polar_renderer
 from iwst.routes.home.layout import layout as homelayout
 from iwst.routes.homeevaluation.layout import layout as homelayout_trial
 
@@ -27,6 +32,34 @@ from iwst.routes.home.callbacks import register_callbacks as register_callbacks_
 from iwst.routes.homeevaluation.callbacks import register_callbacks as register_callbacks_homeevaluation
 
 
+def create_background_callback_manager(config: Optional[Dict[str, Any]] = None) -> Optional[dash.DiskcacheManager]:
+    """Manager of the background callbacks of the polar plots.
+
+    Jobs are run in processes of their own, started by the web workers, with their state
+    in a disk cache shared by the workers of the node.
+
+    Args:
+        config: configuration settings of the app
+
+    Returns:
+        DiskcacheManager, None if the background callbacks are disabled or not available
+
+    """
+    compute = getattr(config, 'compute', None)
+    if compute is None or not compute.background:
+        return None
+
+    try:
+        import diskcache
+        manager = dash.DiskcacheManager(diskcache.Cache(compute.background_dir))
+    except ImportError:
+        logger.warning('Background callbacks not available (pip install -e .[background]). Callbacks run in the web workers.')
+        return None
+
+    logger.info(f'Background callbacks enabled ({compute.background_dir}).')
+    return manager
+
+
 def create_app(config: Optional[Dict[str, Any]] = None) -> Union[flask.Flask, dash.Dash]:
     """Start a dash application. 
     
@@ -55,6 +88,14 @@ def create_app(config: Optional[Dict[str, Any]] = None) -> Union[flask.Flask, da
     server.config.update(
         IWST=config
     )
+    set_app_config(config)
+
+    # polar plots drawn by the server or by the browser
+    set_polar_renderer(get_compute_config().polar_renderer)
+
+    # pages start with the plots of the default scenario, built by `iwst` before the
+    # workers start (only loaded here, the workers never race to build them)
+    serve_default_artifacts(load_default_artifacts(get_compute_config().artifacts_dir))
     
     # separate cookies path and name
     session_cookie_path = '/'
@@ -82,6 +123,15 @@ def create_app(config: Optional[Dict[str, Any]] = None) -> Union[flask.Flask, da
         logout_user()
         return flask.redirect('/login')
 
+    # Create a route with the result cache counters of this worker (admins only)
+    @server.route("/cachestats")
+    @login_required
+    def cachestats():
+        config = current_app.config.get('IWST')
+        if config.users is None or not config.users.is_admin(current_user.username):
+            return current_app.login_manager.unauthorized()
+        return flask.jsonify(get_result_cache().stats())
+
     # Create a login route
     @server.route('/login', methods=['GET', 'POST'])
     def login():
@@ -163,7 +213,8 @@ def create_app(config: Optional[Dict[str, Any]] = None) -> Union[flask.Flask, da
         suppress_callback_exceptions=True,
         url_base_pathname='/full/',
         prevent_initial_callbacks="initial_duplicate",
-        on_error=on_callback_error
+        on_error=on_callback_error,
+        background_callback_manager=create_background_callback_manager(config)
     )
 
     app.title = "IWST - Isamgeo Wellbore Stability Tool"
@@ -194,10 +245,31 @@ def create_app(config: Optional[Dict[str, Any]] = None) -> Union[flask.Flask, da
     )
     def display_page(pathname):
         if pathname == '/full/home':
-            return homelayout
+            # id of the page, a newer computation of the page supersedes the older ones
+            return [dcc.Store(id='request-session', data=secrets.token_hex(16)), homelayout]
         else:
             return None
 
+    # rendered images of the plots, by the hash of their content: they never change, so
+    # the browser keeps them and checks them again with a conditional request at most
+    # (the endpoint is a view of the full app, restricted below)
+    @server.route(f"{IMAGES_URL}<name>", endpoint=IMAGES_URL)
+    def image(name):
+        path = get_image_store().path(name)
+        if path is None:
+            flask.abort(404)
+        response = flask.send_file(
+            path,
+            mimetype='image/png',
+            etag=name.split('.')[0],
+            conditional=True,
+            max_age=365 * 86400,
+        )
+        response.cache_control.public = False
+        response.cache_control.private = True
+        response.cache_control.immutable = True
+        return response
+
     # prevent views if not logged
     for view_name, view_method in app.server.view_functions.items():
         if view_name.startswith(app.config.url_base_pathname):
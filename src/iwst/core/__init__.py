@@ -0,0 +1,21 @@
+"""Numeric core of IWST
+
+Stress transformations, Kirsch wall stresses and the batched analyses behind the plots:
+borehole stress profiles and Mohr-Coulomb failure (`calculate_borehole_stress`),
+breakouts and tensile fracture polar fields (`calculate_polar_fields`, or the reduction
+and post-processing stages of `POLAR_STAGES` on their own). Only NumPy is imported,
+optional kernel backends are loaded on first use.
+"""
+from iwst.core.borehole import BoreholeStress, calculate_borehole_stress
+from iwst.core.mohr import calculate_mohr_coulomb_circle, calculate_mohr_coulomb_failure
+from iwst.core.polar import (
+    ComputationCancelled,
+    OrientationBasis,
+    PolarFields,
+    calculate_polar_fields,
+    calculate_polar_reduction,
+    postprocess_polar_fields,
+)
+from iwst.core.stages import POLAR_STAGES, Stage, StageGraph
+from iwst.core.basis import ensure_basis, load_basis
+from iwst.core.kernels import get_kernel, warmup_kernel
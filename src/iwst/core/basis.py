@@ -0,0 +1,99 @@
+import numpy as np
+import os
+import tempfile
+
+from pathlib import Path
+from typing import Dict, Tuple
+from iwst.core.polar import (
+    AZIMUTH_STEP,
+    INCLINATION_STEP,
+    THETA_STEP,
+    OrientationBasis,
+    calculate_orientation_basis,
+)
+import logging
+logger = logging.getLogger()
+
+
+DEFAULT_BASIS_DIR = os.path.join(Path.home(), '.cache/iwst/basis')
+
+# memory-mapped bases by folder, one per process
+_bases: Dict[str, OrientationBasis] = {}
+
+
+def basis_paths(folder: str) -> Tuple[str, str]:
+    """Paths of the orientation and theta basis files
+
+    The grid steps are part of the file names, so a change of the grid never picks up
+    stale files.
+    """
+    orientations = os.path.join(folder, f'orientations-az{AZIMUTH_STEP}-inc{INCLINATION_STEP}.npy')
+    theta = os.path.join(folder, f'theta-{THETA_STEP}.npy')
+    return orientations, theta
+
+def _save(path: str, array: np.ndarray):
+    """Write an array atomically, concurrent readers see either no file or the whole file"""
+    fid, tmppath = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.npy')
+    try:
+        with os.fdopen(fid, 'wb') as tmpfile:
+            np.save(tmpfile, array)
+        os.replace(tmppath, path)
+    except BaseException:
+        os.remove(tmppath)
+        raise
+
+def build_basis(folder: str = DEFAULT_BASIS_DIR):
+    """Compute the orientation basis and store it as .npy files in a folder"""
+    os.makedirs(folder, exist_ok=True)
+    basis = calculate_orientation_basis()
+    orientations_path, theta_path = basis_paths(folder)
+    _save(orientations_path, basis.borehole_rotation_matrices)
+    _save(theta_path, basis.theta_trig)
+    logger.info(f'Orientation basis stored in {folder}.')
+
+def ensure_basis(folder: str = DEFAULT_BASIS_DIR):
+    """Build the orientation basis if its files are missing"""
+    if not all(os.path.exists(path) for path in basis_paths(folder)):
+        build_basis(folder)
+
+def load_basis(folder: str = DEFAULT_BASIS_DIR) -> OrientationBasis:
+    """Memory-map the orientation basis of a folder (read-only).
+
+    The pages of the files are shared by all the processes mapping them. The basis is
+    built first if missing or if it does not match the current grid.
+
+    Args:
+        folder: folder of the basis files
+
+    Returns:
+        OrientationBasis backed by read-only memory maps
+
+    """
+    basis = _bases.get(folder)
+    if basis is not None:
+        return basis
+
+    ensure_basis(folder)
+    basis = _map_basis(folder)
+    if (basis.borehole_rotation_matrices.shape, basis.theta_trig.shape) != _expected_shapes():
+        logger.warning(f'Orientation basis in {folder} does not match the grid. Rebuilding.')
+        build_basis(folder)
+        basis = _map_basis(folder)
+
+    _bases[folder] = basis
+    return basis
+
+def _map_basis(folder: str) -> OrientationBasis:
+    """Open the basis files of a folder as read-only memory maps"""
+    orientations_path, theta_path = basis_paths(folder)
+    return OrientationBasis(
+        borehole_rotation_matrices=np.load(orientations_path, mmap_mode='r'),
+        theta_trig=np.load(theta_path, mmap_mode='r'),
+    )
+
+def _expected_shapes() -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """Shapes of the basis arrays for the current grid"""
+    azimuths = len(np.arange(0, 360 + AZIMUTH_STEP, AZIMUTH_STEP))
+    inclinations = len(np.arange(0, 90 + INCLINATION_STEP, INCLINATION_STEP))
+    samples = len(np.arange(0, 180, THETA_STEP))
+    return (azimuths * inclinations, 3, 3), (5, samples)
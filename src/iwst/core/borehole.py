@@ -0,0 +1,133 @@
+import numpy as np
+
+from dataclasses import dataclass
+from typing import Optional, Union
+from iwst.core.mohr import calculate_mohr_coulomb_failure
+from iwst.core.stress import (
+    calculate_borehole_rotation_matrices,
+    calculate_rotation_matrix,
+    calculate_stress_matrix,
+    transform_stress,
+)
+from iwst.core.wall import calculate_principal_tangential_extremum, calculate_tangential_stress
+
+
+WALL_THETA_STEP = 0.1  # degrees, samples of the stress profiles around the wall
+
+ArrayLike = Union[float, np.ndarray]
+
+
+@dataclass
+class BoreholeStress:
+    """Stresses around the wall of one or more well orientations.
+
+    Profiles have shape orientations + (theta,), the other fields the shape of the
+    orientations (scalars for a single well).
+
+    Args:
+        theta: wall angles of the profiles (degrees)
+        max_tangential: maximum principal tangential stress profile
+        min_tangential: minimum principal tangential stress profile
+        szz: axial stress profile
+        stt: tangential stress profile
+        max_tangential_peak: maximum around the wall of the maximum principal tangential stress
+        min_tangential_peak: maximum around the wall of the minimum principal tangential stress
+        ucs: UCS required to prevent breakouts [MPa]
+        intercept: shear stress intercept of the failure envelope [MPa]
+
+    """
+    theta: np.ndarray
+    max_tangential: np.ndarray
+    min_tangential: np.ndarray
+    szz: np.ndarray
+    stt: np.ndarray
+    max_tangential_peak: ArrayLike
+    min_tangential_peak: ArrayLike
+    ucs: ArrayLike
+    intercept: ArrayLike
+
+
+def calculate_borehole_stress(
+    pore_pressure: float,
+    mud_pressure: float,
+    s1: float,
+    s2: float,
+    s3: float,
+    poisson_ratio: float,
+    friction_coefficient: float,
+    azimuth: ArrayLike,
+    inclination: ArrayLike,
+    alpha_angle: float,
+    beta_angle: float,
+    gamma_angle: float,
+    theta: Optional[np.ndarray] = None,
+    backend: str = 'numpy'
+) -> BoreholeStress:
+    """Calculate the wall stress profiles and the Mohr-Coulomb failure of well orientations.
+
+    Orientations are evaluated at once, azimuth and inclination can be scalars or arrays
+    of the same shape.
+
+    Args:
+        pore_pressure: pore pressure [MPa]
+        mud_pressure: mud pressure [MPa]
+        s1: maximum principal stress [MPa]
+        s2: intermediate principal stress [MPa]
+        s3: minimum principal stress [MPa]
+        poisson_ratio: Poisson's ratio of the material
+        friction_coefficient: internal friction coefficient
+        azimuth: azimuth of the wells [deg]
+        inclination: inclination of the wells [deg]
+        alpha_angle: first Euler angle [deg]
+        beta_angle: second Euler angle [deg]
+        gamma_angle: third Euler angle [deg]
+        theta: wall angles of the profiles [deg], 0 to 360 every WALL_THETA_STEP if None
+        backend: kernel backend of the wall stresses (see kernels.KERNEL_BACKENDS)
+
+    Returns:
+        BoreholeStress of the orientations
+
+    """
+    if theta is None:
+        theta = np.arange(0, 360, WALL_THETA_STEP)
+    shape = np.broadcast(azimuth, inclination).shape
+
+    # Adjust stresses by subtracting pore pressure
+    stress_matrix = calculate_stress_matrix(
+        s1 - pore_pressure, s2 - pore_pressure, s3 - pore_pressure
+    )
+    rotation_matrix = calculate_rotation_matrix(alpha_angle, beta_angle, gamma_angle)
+    azimuth, inclination = np.broadcast_arrays(np.deg2rad(azimuth), np.deg2rad(inclination))
+    borehole_rotation_matrices = calculate_borehole_rotation_matrices(azimuth, inclination)
+    transformed_stress = transform_stress(stress_matrix, rotation_matrix, borehole_rotation_matrices)
+
+    pressure_difference = mud_pressure - pore_pressure
+    max_tangential, min_tangential, szz, stt = calculate_tangential_stress(
+        transformed_stress, theta, poisson_ratio, pressure_difference, backend=backend
+    )
+    # peaks of the principal tangential stresses for the Mohr circles
+    max_tangential_peak, _ = calculate_principal_tangential_extremum(
+        transformed_stress, poisson_ratio, pressure_difference, 'max'
+    )
+    min_tangential_peak, _ = calculate_principal_tangential_extremum(
+        transformed_stress, poisson_ratio, pressure_difference, 'min'
+    )
+    ucs, intercept = calculate_mohr_coulomb_failure(
+        max_tangential_peak, pressure_difference, friction_coefficient
+    )
+
+    def reshape(values, profile=False):
+        values = np.reshape(values, shape + theta.shape if profile else shape)
+        return values if profile or shape else values[()]
+
+    return BoreholeStress(
+        theta=theta,
+        max_tangential=reshape(max_tangential, True),
+        min_tangential=reshape(min_tangential, True),
+        szz=reshape(szz, True),
+        stt=reshape(stt, True),
+        max_tangential_peak=reshape(max_tangential_peak),
+        min_tangential_peak=reshape(min_tangential_peak),
+        ucs=reshape(ucs),
+        intercept=reshape(intercept),
+    )
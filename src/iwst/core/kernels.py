@@ -0,0 +1,179 @@
+import numpy as np
+import os
+
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+import logging
+logger = logging.getLogger()
+
+
+KERNEL_BACKENDS = ('numpy', 'numexpr', 'numba')
+DEFAULT_JIT_CACHE_DIR = os.path.join(Path.home(), '.cache/iwst/numba')
+
+# loaded kernels by backend name
+_kernels: Dict[str, Callable] = {}
+
+
+def _stress_components(transformed_stress: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Components s11, s22, s33, s12, s23, s13 as (N, 1) columns"""
+    return tuple(
+        transformed_stress[..., i, j, np.newaxis]
+        for i, j in ((0, 0), (1, 1), (2, 2), (0, 1), (1, 2), (0, 2))
+    )
+
+def theta_trig(theta: np.ndarray) -> np.ndarray:
+    """Rows cos(theta), sin(theta), cos(2 theta), sin(2 theta) for angles in degrees"""
+    theta_rad = np.deg2rad(theta)
+    return np.stack([
+        np.cos(theta_rad), np.sin(theta_rad), np.cos(2 * theta_rad), np.sin(2 * theta_rad)
+    ])
+
+def numpy_kernel(
+    transformed_stress: np.ndarray,
+    theta: np.ndarray,
+    poisson_ratio: float,
+    pressure_difference: float,
+    trig: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Kirsch stresses at the borehole wall with plain NumPy.
+
+    Args:
+        transformed_stress: A (N, 3, 3) stack of stress tensors in the borehole frame.
+        theta: Angles (in degrees) around the wall.
+        poisson_ratio: Poisson's ratio of the material.
+        pressure_difference: Pressure difference applied to the system.
+        trig: precomputed `theta_trig(theta)`, computed on the fly if None.
+
+    Returns:
+        A tuple of (N, len(theta)) arrays containing:
+        - Maximum tangential stress.
+        - Minimum tangential stress.
+        - Axial stress (szz).
+        - Tangential stress (stt).
+        - Shear stress (tau).
+
+    """
+    if trig is None:
+        trig = theta_trig(theta)
+    cos_theta, sin_theta, cos_2theta, sin_2theta = trig.astype(transformed_stress.dtype, copy=False)
+    s11, s22, s33, s12, s23, s13 = _stress_components(transformed_stress)
+    szz = s33 - 2 * poisson_ratio * (s11 - s22) * cos_2theta - 4 * poisson_ratio * s12 * sin_2theta
+    stt = s11 + s22 - 2 * (s11 - s22) * cos_2theta - 4 * s12 * sin_2theta - pressure_difference
+    tau = 2 * (s23 * cos_theta - s13 * sin_theta)
+    radius = np.sqrt((szz - stt)**2 + 4 * tau**2)
+    ts_max = (szz + stt + radius) / 2
+    ts_min = (szz + stt - radius) / 2
+    return ts_max, ts_min, szz, stt, tau
+
+def _load_numexpr() -> Callable:
+    """Kirsch stresses evaluated by numexpr (fused and multithreaded expressions)"""
+    import numexpr as ne
+
+    def numexpr_kernel(transformed_stress, theta, poisson_ratio, pressure_difference, trig=None):
+        dtype = transformed_stress.dtype.type
+        if trig is None:
+            trig = theta_trig(theta)
+        # trigonometric terms depend on theta only
+        c1, s1, c2, s2 = trig.astype(transformed_stress.dtype, copy=False)
+        s11, s22, s33, s12, s23, s13 = _stress_components(transformed_stress)
+        values = dict(
+            s11=s11, s22=s22, s33=s33, s12=s12, s23=s23, s13=s13,
+            c1=c1, s1=s1, c2=c2, s2=s2,
+            nu=dtype(poisson_ratio), dp=dtype(pressure_difference)
+        )
+        szz = ne.evaluate('s33 - 2 * nu * (s11 - s22) * c2 - 4 * nu * s12 * s2', local_dict=values)
+        stt = ne.evaluate('s11 + s22 - 2 * (s11 - s22) * c2 - 4 * s12 * s2 - dp', local_dict=values)
+        tau = ne.evaluate('2 * (s23 * c1 - s13 * s1)', local_dict=values)
+        values = dict(szz=szz, stt=stt, tau=tau)
+        ts_max = ne.evaluate('(szz + stt + sqrt((szz - stt)**2 + 4 * tau**2)) / 2', local_dict=values)
+        ts_min = ne.evaluate('(szz + stt - sqrt((szz - stt)**2 + 4 * tau**2)) / 2', local_dict=values)
+        return ts_max, ts_min, szz, stt, tau
+
+    return numexpr_kernel
+
+def _load_numba() -> Callable:
+    """Kirsch stresses evaluated by a Numba-JIT loop, compiled code is cached on disk
+
+    The cache folder is NUMBA_CACHE_DIR (set from the config file), it must be set
+    before importing numba.
+    """
+    cache_dir = os.environ.setdefault('NUMBA_CACHE_DIR', DEFAULT_JIT_CACHE_DIR)
+    os.makedirs(cache_dir, exist_ok=True)
+    import numba
+
+    @numba.njit(cache=True, parallel=True)
+    def wall_stresses(stress, trig, poisson_ratio, pressure_difference, ts_max, ts_min, szz, stt, tau):
+        cos_theta = trig[0]
+        sin_theta = trig[1]
+        cos_2theta = trig[2]
+        sin_2theta = trig[3]
+        for n in numba.prange(stress.shape[0]):
+            s11 = stress[n, 0, 0]; s22 = stress[n, 1, 1]; s33 = stress[n, 2, 2]
+            s12 = stress[n, 0, 1]; s23 = stress[n, 1, 2]; s13 = stress[n, 0, 2]
+            for t in range(trig.shape[1]):
+                zz = s33 - 2 * poisson_ratio * (s11 - s22) * cos_2theta[t] - 4 * poisson_ratio * s12 * sin_2theta[t]
+                tt = s11 + s22 - 2 * (s11 - s22) * cos_2theta[t] - 4 * s12 * sin_2theta[t] - pressure_difference
+                shear = 2 * (s23 * cos_theta[t] - s13 * sin_theta[t])
+                radius = np.sqrt((zz - tt)**2 + 4 * shear**2)
+                ts_max[n, t] = (zz + tt + radius) / 2
+                ts_min[n, t] = (zz + tt - radius) / 2
+                szz[n, t] = zz
+                stt[n, t] = tt
+                tau[n, t] = shear
+
+    def numba_kernel(transformed_stress, theta, poisson_ratio, pressure_difference, trig=None):
+        dtype = transformed_stress.dtype
+        stress = np.ascontiguousarray(transformed_stress.reshape(-1, 3, 3))
+        if trig is None:
+            trig = theta_trig(np.atleast_1d(theta))
+        trig = np.ascontiguousarray(trig, dtype=dtype)
+        shape = transformed_stress.shape[:-2] + trig.shape[1:]
+        outputs = [np.empty((stress.shape[0], trig.shape[1]), dtype=dtype) for _ in range(5)]
+        wall_stresses(
+            stress, trig, dtype.type(poisson_ratio), dtype.type(pressure_difference), *outputs
+        )
+        return tuple(output.reshape(shape) for output in outputs)
+
+    return numba_kernel
+
+_LOADERS: Dict[str, Callable[[], Callable]] = {
+    'numexpr': _load_numexpr,
+    'numba': _load_numba,
+}
+
+def get_kernel(backend: str = 'numpy') -> Callable:
+    """Get the Kirsch stresses kernel of a backend.
+
+    Optional backends are loaded on first use; if their package is not installed the
+    NumPy kernel is used instead. All kernels share the signature and the outputs of
+    `numpy_kernel`.
+
+    Args:
+        backend: one of KERNEL_BACKENDS
+
+    Returns:
+        kernel function
+
+    """
+    if backend not in KERNEL_BACKENDS:
+        raise ValueError(f"Unknown kernel backend '{backend}'. Available choices: {', '.join(KERNEL_BACKENDS)}")
+
+    kernel = _kernels.get(backend)
+    if kernel is None:
+        if backend == 'numpy':
+            kernel = numpy_kernel
+        else:
+            try:
+                kernel = _LOADERS[backend]()
+                logger.debug(f"Kernel backend '{backend}' loaded.")
+            except ImportError:
+                logger.warning(f"Kernel backend '{backend}' is not installed. Fall back to 'numpy'.")
+                kernel = numpy_kernel
+        _kernels[backend] = kernel
+    return kernel
+
+def warmup_kernel(backend: str = 'numpy'):
+    """Load a backend and run its kernel once, so JIT code is compiled (and cached) up front"""
+    kernel = get_kernel(backend)
+    for dtype in ('float64', 'float32'):
+        kernel(np.eye(3, dtype=dtype)[np.newaxis], np.arange(0, 180, 45.0), 0.25, 0.0)
@@ -0,0 +1,59 @@
+import numpy as np
+
+from typing import Tuple
+
+
+MOHR_CIRCLE_POINTS = 181  # points of a Mohr circle, one per degree of the parametric angle
+
+
+def calculate_mohr_coulomb_circle(
+    max_principal_stress: float, 
+    min_principal_stress: float,
+    points: int = MOHR_CIRCLE_POINTS
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Calculate the Mohr-Coulomb failure circle for the given principal stresses.
+    This function computes the x and y coordinates of the upper half of the Mohr circle
+    from its parametric form, so the number of points does not depend on the stresses.
+
+    Args:
+        max_principal_stress: Maximum principal stress.
+        min_principal_stress: Minimum principal stress.
+        points: Number of points of the circle.
+
+    Returns:
+        A tuple containing:
+        - x-coordinates of the Mohr-Coulomb circle (from the minimum to the maximum stress).
+        - y-coordinates of the Mohr-Coulomb circle.
+
+    """
+    radius = (max_principal_stress - min_principal_stress) / 2
+    center = (max_principal_stress + min_principal_stress) / 2
+    angle = np.linspace(np.pi, 0, points)
+    x_coordinates = center + radius * np.cos(angle)
+    y_coordinates = np.abs(radius) * np.sin(angle)
+    return x_coordinates, y_coordinates
+
+def calculate_mohr_coulomb_failure(
+    max_principal_stress: float, 
+    min_principal_stress: float, 
+    friction_coefficient: float
+) -> Tuple[float, float]:
+    """Calculate the Unconfined Compressive Strength (UCS) and the failure envelope intercept.
+    The failure envelope is the line tangent to the circle of the maximum and minimum
+    principal stresses with slope equal to the internal friction coefficient.
+
+    Args:
+        max_principal_stress: Maximum principal stress.
+        min_principal_stress: Minimum principal stress.
+        friction_coefficient: Internal friction coefficient (Mu).
+
+    Returns:
+        A tuple containing:
+        - Unconfined Compressive Strength (UCS).
+        - Shear stress intercept of the failure envelope (cohesion).
+        
+    """
+    factor = (friction_coefficient**2 + 1)**0.5 + friction_coefficient
+    ucs = max_principal_stress - min_principal_stress * factor**2
+    intercept = (max_principal_stress - min_principal_stress) / 2 / factor
+    return ucs, intercept
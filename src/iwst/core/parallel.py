@@ -0,0 +1,294 @@
+import numpy as np
+import atexit
+import multiprocessing
+import os
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Tuple
+from iwst.core.basis import load_basis
+from iwst.core.polar import (
+    ANALYSES,
+    DEFAULT_CHUNK_SIZE,
+    ComputationCancelled,
+    OrientationBasis,
+    PolarFields,
+    calculate_orientation_basis,
+    check_options,
+    fit_chunk_size,
+    orientation_grid,
+    reduce_orientations,
+)
+from iwst.core.stress import get_stress_response, superpose_stress
+import logging
+logger = logging.getLogger()
+
+
+# output fields of each analysis, stored in shared memory
+ANALYSIS_FIELDS = {
+    'breakouts': ('max_tangential_peak', 'ucs_theta'),
+    'tensile': ('min_tangential', 'mud_pressure_theta'),
+}
+
+# seconds between two checks of the cancellation while waiting for the tasks
+CANCEL_POLL_INTERVAL = 0.1
+
+# process pool of this process, its size and the process owning it
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_pid = 0
+
+# orientation basis of a pool process, by folder (None if computed on the fly)
+_bases: Dict[Optional[str], OrientationBasis] = {}
+
+
+@dataclass
+class PolarTile:
+    """Task of the process pool: one analysis on a range of azimuths of the grid.
+
+    Args:
+        analysis: one of ANALYSES
+        azimuths: first and last (excluded) azimuth index of the tile
+        shared_name: name of the shared memory block of the output fields
+        fields: output fields of the block, in order
+        scenario: inputs of `calculate_polar_reduction` (pressures, stresses, Poisson's
+            ratio and Euler angles, in its order)
+        theta_method: 'extremum' or 'grid'
+        chunk_size: orientations evaluated per chunk
+        dtype: floating point precision of the chunks
+        backend: kernel backend of the wall stresses
+        basis_dir: folder of the memory-mapped orientation basis (None to compute it)
+
+    """
+    analysis: str
+    azimuths: Tuple[int, int]
+    shared_name: str
+    fields: Tuple[str, ...]
+    scenario: Tuple[float, ...]
+    theta_method: str
+    chunk_size: int
+    dtype: str
+    backend: str
+    basis_dir: Optional[str]
+
+
+def _get_basis(folder: Optional[str]) -> OrientationBasis:
+    """Orientation basis of a pool process"""
+    basis = _bases.get(folder)
+    if basis is None:
+        basis = load_basis(folder) if folder is not None else calculate_orientation_basis()
+        _bases[folder] = basis
+    return basis
+
+def evaluate_tile(tile: PolarTile):
+    """Evaluate a tile in a pool process and write its fields into the shared memory block
+
+    The byte after the fields in the block is the cancellation flag of the computation,
+    checked by the tile before every chunk.
+    """
+    (
+        pore_pressure, mud_pressure, s1, s2, s3, poisson_ratio, alpha_angle, beta_angle,
+        gamma_angle
+    ) = tile.scenario
+    basis = _get_basis(tile.basis_dir)
+    shape = orientation_grid()[0].shape
+    first, last = tile.azimuths
+    cancel_flag = len(tile.fields) * int(np.prod(shape)) * 8
+
+    # stress response of the whole grid is cached by the process, the tile takes its columns
+    response = get_stress_response(
+        alpha_angle, beta_angle, gamma_angle, basis.borehole_rotation_matrices
+    )
+    response = response.reshape((3,) + shape + (3, 3))[:, :, first:last].reshape(3, -1, 3, 3)
+    transformed_stress = superpose_stress(
+        response, s1 - pore_pressure, s2 - pore_pressure, s3 - pore_pressure
+    ).astype(tile.dtype, copy=False)
+
+    block = shared_memory.SharedMemory(name=tile.shared_name)
+    try:
+        results = reduce_orientations(
+            transformed_stress,
+            pore_pressure,
+            mud_pressure,
+            poisson_ratio,
+            basis.theta_trig[0],
+            basis.theta_trig[1:].astype(tile.dtype, copy=False),
+            theta_method=tile.theta_method,
+            chunk_size=tile.chunk_size,
+            backend=tile.backend,
+            analyses=(tile.analysis,),
+            cancelled=lambda: block.buf[cancel_flag] != 0,
+        )
+
+        output = np.ndarray((len(tile.fields),) + shape, dtype=np.float64, buffer=block.buf)
+        for field in ANALYSIS_FIELDS[tile.analysis]:
+            output[tile.fields.index(field), :, first:last] = results[field].reshape(shape[0], -1)
+        del output
+    finally:
+        block.close()
+
+def get_pool(workers: int) -> ProcessPoolExecutor:
+    """Process pool of this process, created on first use and resized on demand
+
+    Pool processes are spawned, so they never inherit the threads or the sockets of a
+    web worker. The pool is meant for long-lived processes (the web workers), which shut
+    it down at exit: a short-lived process such as a background callback job would
+    start a pool of its own, never reused, and `atexit` does not run in multiprocessing
+    children, so the polar fields are not computed with a pool there (see
+    `ComputeConfig.workers`). The pool inherited by a forked process belongs to the parent.
+    """
+    global _pool, _pool_workers, _pool_pid
+    if _pool is not None and _pool_pid != os.getpid():
+        _pool = None
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+        _pool_workers = workers
+        _pool_pid = os.getpid()
+        logger.debug(f'Process pool of {workers} workers started.')
+    return _pool
+
+def shutdown_pool():
+    """Stop the process pool of this process"""
+    global _pool, _pool_workers
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.shutdown(wait=True, cancel_futures=True)
+    _pool = None
+    _pool_workers = 0
+
+atexit.register(shutdown_pool)
+
+def azimuth_tiles(azimuths: int, tiles: int) -> List[Tuple[int, int]]:
+    """Split the azimuth indices of the grid in contiguous ranges of similar size"""
+    bounds = np.linspace(0, azimuths, min(tiles, azimuths) + 1).round().astype(int)
+    return [(int(first), int(last)) for first, last in zip(bounds[:-1], bounds[1:])]
+
+def calculate_polar_reduction_parallel(
+    pore_pressure: float,
+    mud_pressure: float,
+    s1: float,
+    s2: float,
+    s3: float,
+    poisson_ratio: float,
+    alpha_angle: float,
+    beta_angle: float,
+    gamma_angle: float,
+    workers: int = 2,
+    tiles: Optional[int] = None,
+    theta_method: str = 'extremum',
+    chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE,
+    dtype: str = 'float64',
+    max_memory: Optional[int] = None,
+    backend: str = 'numpy',
+    basis_dir: Optional[str] = None,
+    analyses: Tuple[str, ...] = ANALYSES,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancelled: Optional[Callable[[], bool]] = None
+) -> PolarFields:
+    """Reduce the wall stresses of the polar grid of a scenario with a process pool.
+
+    The azimuths of the grid are split in tiles and every (tile, analysis) pair is a task
+    of the pool. Tasks write their columns of the fields of the analyses straight into
+    one shared memory block, which is copied once into the result: the block is unlinked
+    when the call returns, while the result outlives it (e.g. in the result cache, or
+    pickled by a shared one), and a view would keep a mapping of every block alive.
+    If a task fails or the computation is cancelled, the other tasks are stopped.
+    Same inputs and results as `calculate_polar_reduction` (without the wall stresses).
+
+    Args:
+        pore_pressure: pore pressure [MPa]
+        mud_pressure: mud pressure [MPa]
+        s1: maximum principal stress [MPa]
+        s2: intermediate principal stress [MPa]
+        s3: minimum principal stress [MPa]
+        poisson_ratio: Poisson's ratio of the material
+        alpha_angle: first Euler angle [deg]
+        beta_angle: second Euler angle [deg]
+        gamma_angle: third Euler angle [deg]
+        workers: processes of the pool
+        tiles: azimuth tiles of the grid (default: one per worker)
+        theta_method: 'extremum' or 'grid' (see `calculate_polar_reduction`)
+        chunk_size: orientations evaluated per chunk by a task
+        dtype: floating point precision of the chunks ('float64' or 'float32')
+        max_memory: cap of the estimated peak memory of all the workers (bytes)
+        backend: kernel backend of the wall stresses (see kernels.KERNEL_BACKENDS)
+        basis_dir: folder of the memory-mapped orientation basis (see `basis.load_basis`),
+            computed by every pool process if None
+        analyses: analyses to evaluate, a subset of ANALYSES; the fields of the others
+            are None
+        progress: called after every task with the tasks done and the total
+        cancelled: checked while waiting for the tasks, ComputationCancelled is raised
+            when true; queued tasks are dropped and running ones stop at their next chunk
+
+    Returns:
+        PolarFields of the scenario, without ucs and mud_pressure_required
+
+    """
+    check_options(theta_method, dtype, analyses)
+    azimuth_mesh, inclination_mesh = orientation_grid()
+    shape = azimuth_mesh.shape
+    ranges = azimuth_tiles(shape[1], tiles or workers)
+    tile_orientations = shape[0] * max(last - first for first, last in ranges)
+    chunk_size, peak_memory = fit_chunk_size(
+        tile_orientations, chunk_size, dtype, theta_method, False,
+        None if max_memory is None else max_memory // workers
+    )
+    scenario = (
+        pore_pressure, mud_pressure, s1, s2, s3, poisson_ratio, alpha_angle, beta_angle,
+        gamma_angle
+    )
+
+    # output fields of the analyses evaluated, then the cancellation flag of the tasks
+    fields = tuple(field for analysis in analyses for field in ANALYSIS_FIELDS[analysis])
+    cancel_flag = len(fields) * azimuth_mesh.size * 8
+    block = shared_memory.SharedMemory(create=True, size=cancel_flag + 1)
+    block.buf[cancel_flag] = 0
+    try:
+        pool = get_pool(workers)
+        futures = [
+            pool.submit(evaluate_tile, PolarTile(
+                analysis, azimuths, block.name, fields, scenario, theta_method, chunk_size,
+                dtype, backend, basis_dir
+            ))
+            for azimuths in ranges
+            for analysis in analyses
+        ]
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+                if done and progress is not None:
+                    progress(len(futures) - len(pending), len(futures))
+                if pending and cancelled is not None and cancelled():
+                    raise ComputationCancelled(f'Cancelled with {len(pending)} of {len(futures)} tasks left.')
+        except BaseException:
+            # queued tasks are dropped, running ones stop at their next chunk
+            block.buf[cancel_flag] = 1
+            for future in pending:
+                future.cancel()
+            wait(pending)
+            raise
+        output = np.array(np.ndarray((len(fields),) + shape, dtype=np.float64, buffer=block.buf))
+    finally:
+        block.close()
+        block.unlink()
+
+    logger.debug(
+        f'Polar fields computed in {len(futures)} tasks on {workers} processes, '
+        f'estimated peak memory {workers * peak_memory / 1024**2:.1f} MB.'
+    )
+
+    return PolarFields(
+        azimuth_mesh=azimuth_mesh,
+        inclination_mesh=inclination_mesh,
+        peak_memory=workers * peak_memory,
+        **{
+            field: output[fields.index(field)] if field in fields else None
+            for analysis in ANALYSES
+            for field in ANALYSIS_FIELDS[analysis]
+        }
+    )
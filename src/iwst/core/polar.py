@@ -0,0 +1,498 @@
+import numpy as np
+
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Optional, Tuple
+from iwst.core.kernels import get_kernel, theta_trig
+from iwst.core.mohr import calculate_mohr_coulomb_failure
+from iwst.core.stress import calculate_borehole_rotation_matrices, get_stress_response, superpose_stress
+from iwst.core.wall import (
+    THETA_BRACKET_STEP,
+    calculate_minimum_tangential_stress,
+    calculate_principal_tangential_extremum,
+)
+import logging
+logger = logging.getLogger()
+
+
+AZIMUTH_STEP = 2  # degrees
+INCLINATION_STEP = 2  # degrees
+THETA_STEP = 0.1  # degrees
+THETA_METHODS = ('grid', 'extremum')
+ANALYSES = ('breakouts', 'tensile')
+DTYPES = ('float64', 'float32')
+DEFAULT_CHUNK_SIZE = 512  # orientations per chunk
+# arrays of shape (chunk, theta) alive at the same time while reducing a chunk
+GRID_TEMPORARIES = 10
+EXTREMUM_TEMPORARIES = 24
+
+
+class ComputationCancelled(Exception):
+    """Raised when a computation is cancelled between two chunks of orientations"""
+
+
+@dataclass
+class PolarFields:
+    """Fields computed on the azimuth/inclination grid for one scenario.
+
+    The reduction of the wall stresses (peaks and their wall angles) does not depend on
+    the friction coefficient and the tensile strength, which only enter the
+    post-processing (see `postprocess_polar_fields`) of ucs and mud_pressure_required.
+
+    Args:
+        azimuth_mesh: azimuth of every orientation (radians)
+        inclination_mesh: inclination of every orientation (radians)
+        ucs_theta: wall angle of the maximum principal tangential stress (degrees), None
+            if the breakouts are not evaluated
+        mud_pressure_theta: wall angle of the minimum tangential stress (degrees), None if
+            the tensile fractures are not evaluated
+        max_tangential_peak: maximum principal tangential stress at the wall [MPa]
+        min_tangential: minimum tangential stress at the wall (tensile pressure difference) [MPa]
+        ucs: UCS required to prevent breakouts [MPa]
+        mud_pressure_required: mud pressure required for tensile failure [MPa]
+        szz: axial stress at the wall, shape (inclinations, azimuths, theta)
+        stt: tangential stress at the wall (breakouts pressure difference)
+        tau: shear stress at the wall
+        peak_memory: estimated peak memory of the computation (bytes)
+
+    """
+    azimuth_mesh: np.ndarray
+    inclination_mesh: np.ndarray
+    ucs_theta: Optional[np.ndarray]
+    mud_pressure_theta: Optional[np.ndarray]
+    max_tangential_peak: Optional[np.ndarray] = None
+    min_tangential: Optional[np.ndarray] = None
+    ucs: Optional[np.ndarray] = None
+    mud_pressure_required: Optional[np.ndarray] = None
+    szz: Optional[np.ndarray] = None
+    stt: Optional[np.ndarray] = None
+    tau: Optional[np.ndarray] = None
+    peak_memory: int = 0
+
+
+@dataclass
+class OrientationBasis:
+    """Quantities of the polar grid that do not depend on the scenario.
+
+    Args:
+        borehole_rotation_matrices: (N, 3, 3) borehole rotation matrices of the grid
+        theta_trig: rows theta [deg], cos(theta), sin(theta), cos(2 theta), sin(2 theta)
+            of the wall samples
+
+    """
+    borehole_rotation_matrices: np.ndarray
+    theta_trig: np.ndarray
+
+
+def orientation_grid() -> Tuple[np.ndarray, np.ndarray]:
+    """Azimuth and inclination meshes (radians) of the polar plots."""
+    azimuth_list = np.radians(np.arange(0, 360 + AZIMUTH_STEP, AZIMUTH_STEP))
+    inclination_list = np.radians(np.arange(0, 90 + INCLINATION_STEP, INCLINATION_STEP))
+    return np.meshgrid(azimuth_list, inclination_list)
+
+def calculate_orientation_basis() -> OrientationBasis:
+    """Calculate the rotation matrices and the wall trigonometric terms of the polar grid."""
+    azimuth_mesh, inclination_mesh = orientation_grid()
+    theta = np.arange(0, 180, THETA_STEP)
+    return OrientationBasis(
+        borehole_rotation_matrices=calculate_borehole_rotation_matrices(azimuth_mesh, inclination_mesh),
+        theta_trig=np.concatenate([theta[np.newaxis], theta_trig(theta)]),
+    )
+
+def check_options(theta_method: str, dtype: str, analyses: Tuple[str, ...] = ANALYSES):
+    """Raise ValueError for an unknown theta method, dtype or analysis."""
+    for analysis in analyses:
+        if analysis not in ANALYSES:
+            raise ValueError(f"Unknown analysis '{analysis}'. Available choices: {', '.join(ANALYSES)}")
+    if theta_method not in THETA_METHODS:
+        raise ValueError(f"Unknown theta method '{theta_method}'. Available choices: {', '.join(THETA_METHODS)}")
+    if dtype not in DTYPES:
+        raise ValueError(f"Unknown dtype '{dtype}'. Available choices: {', '.join(DTYPES)}")
+
+def estimate_memory(
+    orientations: int,
+    dtype: str = 'float64',
+    theta_method: str = 'extremum',
+    wall_stresses: bool = False
+) -> Tuple[int, int]:
+    """Estimate the memory needed to compute the polar fields.
+
+    Args:
+        orientations: number of orientations of the grid
+        dtype: floating point precision of the chunks
+        theta_method: method used to reduce over the wall angle
+        wall_stresses: whether szz, stt and tau are kept for the whole grid
+
+    Returns:
+        A tuple containing:
+        - Memory independent of the chunk size (bytes).
+        - Memory for each orientation of a chunk (bytes).
+
+    """
+    itemsize = np.dtype(dtype).itemsize
+    theta_samples = int(round(180 / THETA_STEP))
+    # rotation matrices, stress response, transformed stresses and the float64 output fields
+    fixed = orientations * (2 * 9 * 8 + 3 * 9 * 8 + 9 * itemsize + 6 * 8)
+    if wall_stresses:
+        fixed += 3 * orientations * theta_samples * itemsize
+    if theta_method == 'grid':
+        per_orientation = GRID_TEMPORARIES * theta_samples * itemsize
+    else:
+        bracket_samples = int(round(180 / THETA_BRACKET_STEP))
+        per_orientation = EXTREMUM_TEMPORARIES * bracket_samples * itemsize
+        if wall_stresses:
+            per_orientation += 4 * theta_samples * itemsize
+    return fixed, per_orientation
+
+def fit_chunk_size(
+    orientations: int,
+    chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE,
+    dtype: str = 'float64',
+    theta_method: str = 'extremum',
+    wall_stresses: bool = False,
+    max_memory: Optional[int] = None
+) -> Tuple[int, int]:
+    """Bound the chunk size of a computation with a memory cap.
+
+    Args:
+        orientations: number of orientations of the computation
+        chunk_size: requested orientations per chunk (None for all at once)
+        dtype: floating point precision of the chunks
+        theta_method: method used to reduce over the wall angle
+        wall_stresses: whether szz, stt and tau are kept for all the orientations
+        max_memory: cap of the estimated peak memory (bytes), None for no cap
+
+    Returns:
+        A tuple containing:
+        - Chunk size fitting the cap.
+        - Estimated peak memory (bytes).
+
+    """
+    if chunk_size is None or chunk_size > orientations:
+        chunk_size = orientations
+    fixed_memory, orientation_memory = estimate_memory(
+        orientations, dtype, theta_method, wall_stresses
+    )
+    if max_memory is not None:
+        fitting = (max_memory - fixed_memory) // orientation_memory
+        if fitting < 1:
+            raise MemoryError(
+                f'Polar fields need at least {(fixed_memory + orientation_memory) / 1024**2:.1f} MB, '
+                f'cap is {max_memory / 1024**2:.1f} MB.'
+            )
+        if fitting < chunk_size:
+            logger.debug(f'Chunk size reduced from {chunk_size} to {fitting} to fit the memory cap.')
+            chunk_size = int(fitting)
+    return chunk_size, fixed_memory + chunk_size * orientation_memory
+
+def reduce_orientations(
+    transformed_stress: np.ndarray,
+    pore_pressure: float,
+    mud_pressure: float,
+    poisson_ratio: float,
+    theta: np.ndarray,
+    wall_trig: np.ndarray,
+    theta_method: str = 'extremum',
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    backend: str = 'numpy',
+    analyses: Tuple[str, ...] = ANALYSES,
+    wall_stresses: bool = False,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancelled: Optional[Callable[[], bool]] = None
+) -> Dict[str, np.ndarray]:
+    """Reduce the wall stresses of a set of orientations, chunk by chunk.
+
+    Args:
+        transformed_stress: A (N, 3, 3) stack of effective stress tensors in the borehole frame.
+        pore_pressure: pore pressure [MPa]
+        mud_pressure: mud pressure [MPa]
+        poisson_ratio: Poisson's ratio of the material
+        theta: wall angles of the samples (degrees)
+        wall_trig: `kernels.theta_trig(theta)` in the dtype of the stresses
+        theta_method: 'extremum' or 'grid' (see `calculate_polar_reduction`)
+        chunk_size: orientations evaluated per chunk
+        backend: kernel backend of the wall stresses (see kernels.KERNEL_BACKENDS)
+        analyses: analyses to evaluate, a subset of ANALYSES
+        wall_stresses: whether to keep szz, stt and tau
+        progress: called after every chunk with the orientations done and the total
+        cancelled: checked before every chunk, ComputationCancelled is raised when true
+
+    Returns:
+        Arrays of the orientations by name: 'max_tangential_peak' and 'ucs_theta' for the
+        breakouts, 'min_tangential' and 'mud_pressure_theta' for the tensile fractures,
+        'szz', 'stt' and 'tau' (N, theta) for the wall stresses.
+
+    """
+    orientations = len(transformed_stress)
+    dtype = transformed_stress.dtype
+    breakouts = 'breakouts' in analyses
+    tensile = 'tensile' in analyses
+    kernel = get_kernel(backend)
+
+    results = {}
+    if breakouts:
+        results['max_tangential_peak'] = max_tangential_peaks = np.empty(orientations)
+        results['ucs_theta'] = ucs_theta = np.empty(orientations)
+    if tensile:
+        results['min_tangential'] = min_tangentials = np.empty(orientations)
+        results['mud_pressure_theta'] = mud_pressure_theta = np.empty(orientations)
+    if wall_stresses:
+        results['szz'] = szz_all = np.empty((orientations, theta.size), dtype=dtype)
+        results['stt'] = stt_all = np.empty((orientations, theta.size), dtype=dtype)
+        results['tau'] = tau_all = np.empty((orientations, theta.size), dtype=dtype)
+
+    pressure_difference = mud_pressure - pore_pressure
+    for start in range(0, orientations, chunk_size):
+        if cancelled is not None and cancelled():
+            raise ComputationCancelled(f'Cancelled after {start} of {orientations} orientations.')
+        chunk = slice(start, start + chunk_size)
+        chunk_stress = transformed_stress[chunk]
+        if wall_stresses or theta_method == 'grid':
+            # breakouts: tangential stress with the mud pressure acting on the wall
+            max_tangential, _, szz, stt_breakouts, tau = kernel(
+                chunk_stress, theta, poisson_ratio, pressure_difference, trig=wall_trig
+            )
+
+        if breakouts:
+            if theta_method == 'grid':
+                index = np.argmax(max_tangential, axis=-1)
+                max_tangential_peak = np.take_along_axis(max_tangential, index[:, np.newaxis], axis=-1)[:, 0]
+                ucs_theta[chunk] = theta[index]
+            else:
+                max_tangential_peak, ucs_theta[chunk] = calculate_principal_tangential_extremum(
+                    chunk_stress, poisson_ratio, pressure_difference, 'max'
+                )
+            max_tangential_peaks[chunk] = max_tangential_peak
+
+        # tensile fractures: the pressure difference has the opposite sign
+        if tensile:
+            if theta_method == 'grid':
+                index = np.argmin(stt_breakouts, axis=-1)
+                min_tangential = (
+                    np.take_along_axis(stt_breakouts, index[:, np.newaxis], axis=-1)[:, 0]
+                    + pressure_difference - (pore_pressure - mud_pressure)
+                )
+                mud_pressure_theta[chunk] = theta[index]
+            else:
+                min_tangential, mud_pressure_theta[chunk] = calculate_minimum_tangential_stress(
+                    chunk_stress, pore_pressure - mud_pressure
+                )
+            min_tangentials[chunk] = min_tangential
+
+        if wall_stresses:
+            szz_all[chunk] = szz
+            stt_all[chunk] = stt_breakouts
+            tau_all[chunk] = tau
+
+        if progress is not None:
+            progress(min(start + chunk_size, orientations), orientations)
+
+    return results
+
+def calculate_polar_reduction(
+    pore_pressure: float,
+    mud_pressure: float,
+    s1: float,
+    s2: float,
+    s3: float,
+    poisson_ratio: float,
+    alpha_angle: float,
+    beta_angle: float,
+    gamma_angle: float,
+    wall_stresses: bool = False,
+    theta_method: str = 'extremum',
+    chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE,
+    dtype: str = 'float64',
+    max_memory: Optional[int] = None,
+    backend: str = 'numpy',
+    basis: Optional[OrientationBasis] = None,
+    analyses: Tuple[str, ...] = ANALYSES,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancelled: Optional[Callable[[], bool]] = None
+) -> PolarFields:
+    """Reduce the wall stresses of the polar grid of a scenario in a single pass.
+
+    The transformed stress tensors and the wall stresses are computed once and shared by
+    both analyses: the peak of the principal tangential stress for the breakouts and the
+    minimum of stt for the tensile fractures. The fields are not post-processed (see
+    `postprocess_polar_fields`), so they can be reused for any friction coefficient and
+    tensile strength.
+
+    Orientations are evaluated in chunks and reduced over theta chunk by chunk, so the
+    size of the temporaries is bounded by the chunk size and not by the grid.
+
+    Args:
+        pore_pressure: pore pressure [MPa]
+        mud_pressure: mud pressure [MPa]
+        s1: maximum principal stress [MPa]
+        s2: intermediate principal stress [MPa]
+        s3: minimum principal stress [MPa]
+        poisson_ratio: Poisson's ratio of the material
+        alpha_angle: first Euler angle [deg]
+        beta_angle: second Euler angle [deg]
+        gamma_angle: third Euler angle [deg]
+        wall_stresses: whether to keep szz, stt and tau in the result
+        theta_method: 'extremum' to locate the critical wall angles with the extremum
+            solver, 'grid' to take them from the THETA_STEP samples of the wall
+        chunk_size: orientations evaluated per chunk (None for the whole grid at once)
+        dtype: floating point precision of the chunks ('float64' or 'float32')
+        max_memory: cap of the estimated peak memory (bytes). The chunk size is reduced
+            to fit, MemoryError is raised if even a single orientation does not fit.
+        backend: kernel backend of the wall stresses (see kernels.KERNEL_BACKENDS)
+        basis: precomputed orientation basis (e.g. memory-mapped by `basis.load_basis`),
+            computed on the fly if None
+        analyses: analyses to evaluate, a subset of ANALYSES (e.g. only the one of the
+            plot on screen); the fields of the others are None
+        progress: called after every chunk with the orientations done and the total
+        cancelled: checked before every chunk, ComputationCancelled is raised when true
+            (e.g. when a newer request supersedes this one)
+
+    Returns:
+        PolarFields of the scenario, without ucs and mud_pressure_required
+
+    """
+    check_options(theta_method, dtype, analyses)
+    if basis is None:
+        basis = calculate_orientation_basis()
+    azimuth_mesh, inclination_mesh = orientation_grid()
+    shape = azimuth_mesh.shape
+    orientations = azimuth_mesh.size
+    theta = basis.theta_trig[0]
+    wall_trig = basis.theta_trig[1:].astype(dtype, copy=False)
+    chunk_size, peak_memory = fit_chunk_size(
+        orientations, chunk_size, dtype, theta_method, wall_stresses, max_memory
+    )
+
+    # Adjust stresses by subtracting pore pressure, the orientation part only depends
+    # on the Euler angles and is reused while they do not change
+    response = get_stress_response(
+        alpha_angle, beta_angle, gamma_angle, basis.borehole_rotation_matrices
+    )
+    transformed_stress = superpose_stress(
+        response, s1 - pore_pressure, s2 - pore_pressure, s3 - pore_pressure
+    ).astype(dtype, copy=False)
+
+    results = reduce_orientations(
+        transformed_stress,
+        pore_pressure,
+        mud_pressure,
+        poisson_ratio,
+        theta,
+        wall_trig,
+        theta_method=theta_method,
+        chunk_size=chunk_size,
+        backend=backend,
+        analyses=analyses,
+        wall_stresses=wall_stresses,
+        progress=progress,
+        cancelled=cancelled,
+    )
+
+    logger.debug(
+        f'Polar fields computed in {-(-orientations // chunk_size)} chunks of {chunk_size} orientations '
+        f'({dtype}), estimated peak memory {peak_memory / 1024**2:.1f} MB.'
+    )
+
+    fields = PolarFields(
+        azimuth_mesh=azimuth_mesh,
+        inclination_mesh=inclination_mesh,
+        ucs_theta=None,
+        mud_pressure_theta=None,
+        peak_memory=peak_memory,
+    )
+    for field in ('ucs_theta', 'mud_pressure_theta', 'max_tangential_peak', 'min_tangential'):
+        if field in results:
+            setattr(fields, field, results[field].reshape(shape))
+    if wall_stresses:
+        fields.szz = results['szz'].reshape(shape + theta.shape)
+        fields.stt = results['stt'].reshape(shape + theta.shape)
+        fields.tau = results['tau'].reshape(shape + theta.shape)
+    return fields
+
+def postprocess_polar_fields(
+    fields: PolarFields,
+    pore_pressure: float,
+    mud_pressure: float,
+    friction_coefficient: Optional[float] = None,
+    tensile_strength: Optional[float] = None
+) -> PolarFields:
+    """Post-process reduced polar fields into the quantities of the polar plots.
+
+    Args:
+        fields: polar fields reduced by `calculate_polar_reduction` for the same pressures
+        pore_pressure: pore pressure [MPa]
+        mud_pressure: mud pressure [MPa]
+        friction_coefficient: internal friction coefficient (None to skip the breakouts)
+        tensile_strength: tensile strength of the rock [MPa] (None to skip the tensile fractures)
+
+    Returns:
+        Copy of the fields with ucs and/or mud_pressure_required
+
+    """
+    changes = {}
+    if friction_coefficient is not None:
+        changes['ucs'] = calculate_mohr_coulomb_failure(
+            fields.max_tangential_peak, mud_pressure - pore_pressure, friction_coefficient
+        )[0]
+    if tensile_strength is not None:
+        changes['mud_pressure_required'] = fields.min_tangential - tensile_strength + pore_pressure
+    return replace(fields, **changes)
+
+def calculate_polar_fields(
+    pore_pressure: float,
+    mud_pressure: float,
+    s1: float,
+    s2: float,
+    s3: float,
+    poisson_ratio: float,
+    friction_coefficient: float,
+    tensile_strength: float,
+    alpha_angle: float,
+    beta_angle: float,
+    gamma_angle: float,
+    wall_stresses: bool = False,
+    theta_method: str = 'extremum',
+    chunk_size: Optional[int] = DEFAULT_CHUNK_SIZE,
+    dtype: str = 'float64',
+    max_memory: Optional[int] = None,
+    backend: str = 'numpy',
+    basis: Optional[OrientationBasis] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    cancelled: Optional[Callable[[], bool]] = None
+) -> PolarFields:
+    """Calculate the breakouts and tensile fracture fields of a scenario in a single pass.
+
+    The required UCS comes from the maximum of the principal tangential stress, the mud
+    pressure required for tensile failure from the minimum of stt (see
+    `calculate_polar_reduction` for the options and `postprocess_polar_fields`).
+
+    Args:
+        friction_coefficient: internal friction coefficient
+        tensile_strength: tensile strength of the rock [MPa]
+
+    Returns:
+        PolarFields of the scenario
+
+    """
+    fields = calculate_polar_reduction(
+        pore_pressure,
+        mud_pressure,
+        s1,
+        s2,
+        s3,
+        poisson_ratio,
+        alpha_angle,
+        beta_angle,
+        gamma_angle,
+        wall_stresses=wall_stresses,
+        theta_method=theta_method,
+        chunk_size=chunk_size,
+        dtype=dtype,
+        max_memory=max_memory,
+        backend=backend,
+        basis=basis,
+        progress=progress,
+        cancelled=cancelled,
+    )
+    return postprocess_polar_fields(
+        fields, pore_pressure, mud_pressure, friction_coefficient, tensile_strength
+    )
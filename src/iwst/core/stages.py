@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+from typing import Dict, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class Stage:
+    """Stage of an analysis.
+
+    Args:
+        name: name of the stage
+        inputs: inputs read by the stage itself
+        depends: stages whose results are read by the stage
+
+    """
+    name: str
+    inputs: Tuple[str, ...] = ()
+    depends: Tuple[str, ...] = ()
+
+
+class StageGraph:
+    """Dependency graph of the stages of an analysis.
+
+    A stage is rerun only when one of its inputs, or of the inputs of the stages it
+    depends on, changes: the inputs of a stage (see `inputs`) are the key of its cached
+    result, the results of the other stages are reused.
+
+    Args:
+        stages: stages of the graph, each one after the stages it depends on
+
+    """
+    def __init__(self, stages: Sequence[Stage]):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            for name in stage.depends:
+                if name not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on '{name}', which is not defined before it.")
+            self.stages[stage.name] = stage
+
+    def inputs(self, name: str) -> Tuple[str, ...]:
+        """Inputs of a stage and of the stages it depends on, in order of first use."""
+        stage = self.stages[name]
+        inputs = []
+        for dependency in stage.depends:
+            inputs.extend(self.inputs(dependency))
+        inputs.extend(stage.inputs)
+        return tuple(dict.fromkeys(inputs))
+
+
+REDUCTION_INPUTS = (
+    'alpha_angle', 'beta_angle', 'gamma_angle',
+    'pore_pressure', 'mud_pressure', 's1', 's2', 's3', 'poisson_ratio', 'theta_method', 'dtype',
+)
+
+# Cached stages of the breakouts and tensile fracture polar plots:
+# - reductions: wall stress peaks of every orientation for one analysis
+#   (`polar.calculate_polar_reduction`), so each plot is computed only when it is shown
+# - breakouts, tensile: post-processing of the peaks (`polar.postprocess_polar_fields`)
+# - renders of the plots, as images or as figures drawn by the browser
+# The current well orientation is not a stage: its marker is drawn by the page.
+POLAR_STAGES = StageGraph([
+    Stage('breakouts-reduction', REDUCTION_INPUTS),
+    Stage('tensile-reduction', REDUCTION_INPUTS),
+    Stage('breakouts', ('friction_coefficient',), ('breakouts-reduction',)),
+    Stage('tensile', ('tensile_strength',), ('tensile-reduction',)),
+    Stage('breakouts-render', ('polar_renderer',), ('breakouts',)),
+    Stage('tensile-render', ('polar_renderer',), ('tensile',)),
+])
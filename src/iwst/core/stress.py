@@ -0,0 +1,204 @@
+import numpy as np
+
+from collections import OrderedDict
+from typing import Tuple
+
+
+STRESS_RESPONSE_CACHE_SIZE = 8  # Euler angle triples kept per process
+
+# stress responses by Euler angles and grid size, least recently used first
+_stress_responses: 'OrderedDict[Tuple[float, float, float, int], np.ndarray]' = OrderedDict()
+
+
+def calculate_stress_matrix(
+    s1: float,
+    s2: float,
+    s3: float
+) -> np.ndarray:
+    """Calculate the stress matrix for the given principal stresses.
+
+    Args:
+        s1: The first principal stress.
+        s2: The second principal stress.
+        s3: The third principal stress.
+
+    Returns:
+        A 3x3 NumPy array representing the stress matrix.
+
+    """
+    stress_matrix = np.zeros((3, 3))
+    stress_matrix[0, 0] = s1
+    stress_matrix[1, 1] = s2
+    stress_matrix[2, 2] = s3
+    return stress_matrix
+
+def calculate_rotation_matrix(
+    alpha: float,
+    beta: float,
+    gamma: float
+) -> np.ndarray:
+    """Calculate the rotation matrix for the given Euler angles.
+
+    Args:
+        alpha: First Euler angle (rotation about the x-axis).
+        beta: Second Euler angle (rotation about the y-axis).
+        gamma: Third Euler angle (rotation about the z-axis).
+
+    Returns:
+        A 3x3 NumPy array representing the rotation matrix.
+
+    """
+    a = np.deg2rad(alpha)
+    b = np.deg2rad(beta)
+    g = np.deg2rad(gamma)
+    rotation_matrix = np.zeros((3, 3))
+    cos_a = np.cos(a); cos_b = np.cos(b); cos_g = np.cos(g)
+    sin_a = np.sin(a); sin_b = np.sin(b); sin_g = np.sin(g)
+    rotation_matrix[0, 0] = cos_a * cos_b
+    rotation_matrix[0, 1] = sin_a * cos_b
+    rotation_matrix[0, 2] = -sin_b
+    rotation_matrix[1, 0] = cos_a * sin_b * sin_g - sin_a * cos_g
+    rotation_matrix[1, 1] = sin_a * sin_b * sin_g + cos_a * cos_g
+    rotation_matrix[1, 2] = cos_b * sin_g
+    rotation_matrix[2, 0] = cos_a * sin_b * cos_g + sin_a * sin_g
+    rotation_matrix[2, 1] = sin_a * sin_b * cos_g - cos_a * sin_g
+    rotation_matrix[2, 2] = cos_b * cos_g
+    return rotation_matrix
+
+def calculate_rotation_matrix_azimuth_inclination(
+    az: float, 
+    ic: float
+) -> np.ndarray:
+    """Calculate the rotation matrix for azimuth and inclination angles.
+
+    Args:
+        az: Azimuth angle (in degrees).
+        ic: Inclination angle (in degrees).
+
+    Returns:
+        A 3x3 NumPy array representing the rotation matrix.
+
+    """
+    return calculate_borehole_rotation_matrices(np.deg2rad(az), np.deg2rad(ic))[0]
+
+def calculate_borehole_rotation_matrices(
+    azimuth: np.ndarray,
+    inclination: np.ndarray
+) -> np.ndarray:
+    """Calculate the borehole rotation matrices for a set of orientations at once.
+
+    Args:
+        azimuth: Array of azimuth angles in radians.
+        inclination: Array of inclination angles in radians (same shape as azimuth).
+
+    Returns:
+        A (N, 3, 3) NumPy array with one borehole rotation matrix per orientation.
+
+    """
+    azimuth = np.ravel(azimuth)
+    inclination = np.ravel(inclination)
+    rotation_matrices = np.zeros((azimuth.size, 3, 3))
+    cos_az = np.cos(azimuth); cos_inc = np.cos(inclination)
+    sin_az = np.sin(azimuth); sin_inc = np.sin(inclination)
+    rotation_matrices[:, 0, 0] = -cos_az * cos_inc
+    rotation_matrices[:, 0, 1] = -sin_az * cos_inc
+    rotation_matrices[:, 0, 2] = sin_inc
+    rotation_matrices[:, 1, 0] = sin_az
+    rotation_matrices[:, 1, 1] = -cos_az
+    rotation_matrices[:, 2, 0] = cos_az * sin_inc
+    rotation_matrices[:, 2, 1] = sin_az * sin_inc
+    rotation_matrices[:, 2, 2] = cos_inc
+    return rotation_matrices
+
+def transform_stress(
+    stress_matrix: np.ndarray,
+    rotation_matrix: np.ndarray,
+    borehole_rotation_matrices: np.ndarray
+) -> np.ndarray:
+    """Transform the principal stress tensor into the borehole frame of every orientation.
+
+    Args:
+        stress_matrix: A 3x3 NumPy array representing the stress matrix.
+        rotation_matrix: A 3x3 NumPy array representing the Euler rotation matrix.
+        borehole_rotation_matrices: A (N, 3, 3) stack of borehole rotation matrices.
+
+    Returns:
+        A (N, 3, 3) NumPy array with the transformed stress tensor of every orientation.
+
+    """
+    global_stress = rotation_matrix.T @ stress_matrix @ rotation_matrix
+    return np.einsum(
+        'nij,jk,nlk->nil',
+        borehole_rotation_matrices,
+        global_stress,
+        borehole_rotation_matrices,
+        optimize=True
+    )
+
+def calculate_stress_response(
+    rotation_matrix: np.ndarray,
+    borehole_rotation_matrices: np.ndarray
+) -> np.ndarray:
+    """Transformed stress of every orientation for unit principal stresses.
+
+    The transformed stress is linear in the principal stresses: with r_k the k-th row of
+    the Euler rotation matrix and B the borehole rotation, it is the sum over k of
+    s_k (B r_k)(B r_k)^T. The wall stresses are linear in the transformed components,
+    so together with the theta basis these tensors give the response of every
+    orientation and wall angle to each principal stress.
+
+    Args:
+        rotation_matrix: A 3x3 NumPy array representing the Euler rotation matrix.
+        borehole_rotation_matrices: A (N, 3, 3) stack of borehole rotation matrices.
+
+    Returns:
+        A (3, N, 3, 3) NumPy array, the transformed stress for s1 = 1, s2 = 1 and s3 = 1.
+
+    """
+    directions = np.einsum('nij,kj->kni', borehole_rotation_matrices, rotation_matrix)
+    return directions[..., :, np.newaxis] * directions[..., np.newaxis, :]
+
+def get_stress_response(
+    alpha: float,
+    beta: float,
+    gamma: float,
+    borehole_rotation_matrices: np.ndarray
+) -> np.ndarray:
+    """Stress response of the grid for a set of Euler angles, cached per process.
+
+    Scenarios that only change stress magnitudes, pressures or rock properties reuse the
+    response of the current Euler angles (see `calculate_stress_response`).
+    """
+    key = (float(alpha), float(beta), float(gamma), len(borehole_rotation_matrices))
+    response = _stress_responses.get(key)
+    if response is not None:
+        _stress_responses.move_to_end(key)
+        return response
+
+    rotation_matrix = calculate_rotation_matrix(alpha, beta, gamma)
+    response = calculate_stress_response(rotation_matrix, borehole_rotation_matrices)
+    response.flags.writeable = False
+    _stress_responses[key] = response
+    while len(_stress_responses) > STRESS_RESPONSE_CACHE_SIZE:
+        _stress_responses.popitem(last=False)
+    return response
+
+def superpose_stress(
+    response: np.ndarray,
+    s1: float,
+    s2: float,
+    s3: float
+) -> np.ndarray:
+    """Combine a stress response with principal stress magnitudes.
+
+    Args:
+        response: A (3, N, 3, 3) stress response (see `calculate_stress_response`).
+        s1: The first principal stress.
+        s2: The second principal stress.
+        s3: The third principal stress.
+
+    Returns:
+        A (N, 3, 3) NumPy array with the transformed stress tensor of every orientation.
+
+    """
+    return np.tensordot(np.array([s1, s2, s3], dtype=float), response, axes=1)
@@ -0,0 +1,176 @@
+import numpy as np
+
+from typing import Tuple
+from iwst.core.kernels import get_kernel
+
+
+THETA_BRACKET_STEP = 2.0  # degrees, coarse bracket of the extremum solver
+EXTREMUM_TOLERANCE = 1e-10  # radians
+EXTREMUM_MAX_ITERATIONS = 60
+
+
+def calculate_tangential_stress(
+    stress_matrix: np.ndarray, 
+    theta: float, 
+    poisson_ratio: float, 
+    pressure_difference: float,
+    backend: str = 'numpy'
+) -> Tuple[float, float, float, float]:
+    """Calculate the tangential stress components for the given stress tensor.
+    This function computes the maximum and minimum tangential stresses, as well as
+    the axium stresses, based on the provided stress matrix, angle, Poisson's ratio,
+    and pressure difference.
+
+    Args:
+        stress_matrix: A 3x3 (or (N, 3, 3)) NumPy array representing the stress tensor.
+        theta: Angles (in degrees) at which to calculate the stresses.
+        poisson_ratio: Poisson's ratio of the material.
+        pressure_difference: Pressure difference applied to the system.
+        backend: Kernel backend evaluating the Kirsch equations (numpy, numexpr or numba).
+
+    Returns:
+        A tuple containing:
+        - Maximum tangential stress.
+        - Minimum tangential stress.
+        - Axium stress in the z-direction (szz).
+        - Axium stress in the tangential direction (stt).
+
+    """
+    kernel = get_kernel(backend)
+    max_tangential_stress, min_tangential_stress, axium_zz, axium_tt, _ = kernel(
+        stress_matrix, theta, poisson_ratio, pressure_difference
+    )
+    return max_tangential_stress, min_tangential_stress, axium_zz, axium_tt
+
+def calculate_minimum_tangential_stress(
+    transformed_stress: np.ndarray,
+    pressure_difference: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Calculate the minimum of the tangential stress around the wall in closed form.
+
+    stt is a first order trigonometric polynomial in 2*theta,
+    stt = m - a * cos(2 * theta - phi), so its minimum is m - a at 2 * theta = phi.
+
+    Args:
+        transformed_stress: A 3x3 (or (N, 3, 3)) stress tensor in the borehole frame.
+        pressure_difference: Pressure difference applied to the system.
+
+    Returns:
+        A tuple containing:
+        - Minimum tangential stress.
+        - Wall angle (degrees, in [0, 180)) of the minimum.
+
+    """
+    s11 = transformed_stress[..., 0, 0]
+    s22 = transformed_stress[..., 1, 1]
+    s12 = transformed_stress[..., 0, 1]
+    mean = s11 + s22 - pressure_difference
+    amplitude = np.hypot(2 * (s11 - s22), 4 * s12)
+    theta = np.rad2deg(np.arctan2(4 * s12, 2 * (s11 - s22)) / 2) % 180
+    return mean - amplitude, theta
+
+def _principal_tangential_stress(
+    components: Tuple[np.ndarray, ...],
+    theta: np.ndarray,
+    poisson_ratio: float,
+    pressure_difference: float,
+    sign: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Principal tangential stress and its first two derivatives with respect to theta (radians)."""
+    s11, s22, s33, s12, s23, s13 = components
+    cos_theta = np.cos(theta)
+    sin_theta = np.sin(theta)
+    cos_2theta = np.cos(2 * theta)
+    sin_2theta = np.sin(2 * theta)
+    b = -2 * (s11 - s22)
+    c = -4 * s12
+    # harmonic part shared by szz and stt
+    wave = b * cos_2theta + c * sin_2theta
+    wave_d1 = 2 * (c * cos_2theta - b * sin_2theta)
+    wave_d2 = -4 * wave
+    tau = 2 * (s23 * cos_theta - s13 * sin_theta)
+    tau_d1 = -2 * (s23 * sin_theta + s13 * cos_theta)
+    tau_d2 = -tau
+    # difference szz - stt
+    diff = s33 - s11 - s22 + pressure_difference + (poisson_ratio - 1) * wave
+    diff_d1 = (poisson_ratio - 1) * wave_d1
+    diff_d2 = (poisson_ratio - 1) * wave_d2
+    radius = np.sqrt(diff**2 + 4 * tau**2)
+    safe_radius = np.maximum(radius, np.finfo(radius.dtype).tiny)
+    radius_d1 = (diff * diff_d1 + 4 * tau * tau_d1) / safe_radius
+    radius_d2 = (
+        diff_d1**2 + diff * diff_d2 + 4 * (tau_d1**2 + tau * tau_d2) - radius_d1**2
+    ) / safe_radius
+    value = (s11 + s22 + s33 - pressure_difference + (1 + poisson_ratio) * wave + sign * radius) / 2
+    value_d1 = ((1 + poisson_ratio) * wave_d1 + sign * radius_d1) / 2
+    value_d2 = ((1 + poisson_ratio) * wave_d2 + sign * radius_d2) / 2
+    return value, value_d1, value_d2
+
+def calculate_principal_tangential_extremum(
+    transformed_stress: np.ndarray,
+    poisson_ratio: float,
+    pressure_difference: float,
+    principal: str = 'max'
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Calculate the maximum around the wall of a principal tangential stress.
+
+    The wall is sampled on a coarse bracket (THETA_BRACKET_STEP), then the best sample of
+    every orientation is refined with a safeguarded Newton iteration on the analytic
+    derivative, falling back to bisection when the Newton step leaves the bracket.
+
+    Args:
+        transformed_stress: A 3x3 (or (N, 3, 3)) stress tensor in the borehole frame.
+        poisson_ratio: Poisson's ratio of the material.
+        pressure_difference: Pressure difference applied to the system.
+        principal: 'max' for the maximum principal tangential stress, 'min' for the minimum one.
+
+    Returns:
+        A tuple containing:
+        - Maximum around the wall of the principal tangential stress.
+        - Wall angle (degrees, in [0, 180)) of the maximum.
+
+    """
+    if principal not in ('max', 'min'):
+        raise ValueError(f"Unknown principal tangential stress '{principal}'. Available choices: 'max', 'min'")
+    sign = 1.0 if principal == 'max' else -1.0
+    components = tuple(
+        transformed_stress[..., i, j] for i, j in ((0, 0), (1, 1), (2, 2), (0, 1), (1, 2), (0, 2))
+    )
+
+    # coarse bracket
+    step = np.deg2rad(THETA_BRACKET_STEP)
+    coarse = np.arange(0, np.pi, step).astype(transformed_stress.dtype)
+    values, _, _ = _principal_tangential_stress(
+        tuple(component[..., np.newaxis] for component in components),
+        coarse, poisson_ratio, pressure_difference, sign
+    )
+    index = np.argmax(values, axis=-1)
+    coarse_value = np.take_along_axis(values, np.expand_dims(index, -1), axis=-1)[..., 0]
+    coarse_theta = coarse[index]
+
+    # safeguarded Newton refinement
+    tolerance = max(EXTREMUM_TOLERANCE, 8 * np.finfo(coarse.dtype).eps)
+    theta = coarse_theta
+    lower = theta - step
+    upper = theta + step
+    for _ in range(EXTREMUM_MAX_ITERATIONS):
+        _, slope, curvature = _principal_tangential_stress(
+            components, theta, poisson_ratio, pressure_difference, sign
+        )
+        rising = slope > 0
+        lower = np.where(rising, theta, lower)
+        upper = np.where(rising, upper, theta)
+        newton = theta - slope / np.where(curvature < 0, curvature, -1.0)
+        accepted = (curvature < 0) & (newton > lower) & (newton < upper)
+        updated = np.where(accepted, newton, (lower + upper) / 2)
+        converged = np.all(np.abs(updated - theta) < tolerance)
+        theta = updated
+        if converged:
+            break
+
+    value, _, _ = _principal_tangential_stress(components, theta, poisson_ratio, pressure_difference, sign)
+    # never return less than the best sample of the bracket
+    refined = value >= coarse_value
+    value = np.where(refined, value, coarse_value)
+    theta = np.where(refined, theta, coarse_theta)
+    return value, np.rad2deg(theta) % 180
@@ -0,0 +1,137 @@
+import json
+import os
+import tempfile
+import dash
+
+from typing import Any, Dict, Optional
+from plotly.utils import PlotlyJSONEncoder
+from iwst import __version__
+from iwst.routes.home.components.tabs import (
+    PLOT_ANALYSES,
+    TAB_PLOTS,
+    borehole_stress_plots,
+    default_inputs,
+    plots_scenario,
+    polar_plot_outputs,
+    scenario_polar_plot,
+    tabs,
+)
+from iwst.utils.cache import scenario_key
+from iwst.utils.config import ComputeConfig, get_compute_config
+import logging
+logger = logging.getLogger()
+
+
+def artifacts_path(folder: str, compute: Optional[ComputeConfig] = None) -> str:
+    """Path of the plots of the default scenario
+
+    The version, the default values and the settings changing the plots are part of the
+    file name, so a change of any of them never picks up a stale file.
+    """
+    compute = compute or get_compute_config()
+    key = scenario_key(
+        'default-artifacts',
+        __version__,
+        compute.mohr_circle_points,
+        compute.theta_method,
+        compute.dtype,
+        compute.polar_renderer,
+        *default_inputs().values(),
+    )
+    return os.path.join(folder, f'default-scenario-{key[:16]}.json')
+
+def compute_default_artifacts() -> Dict[str, Any]:
+    """Plots of the default scenario, as shown by the tabs at startup
+
+    Returns:
+        scenario (see `plots_scenario`) and plots of every tab by name (see TAB_PLOTS):
+        borehole stress and Mohr-Coulomb figures, PNG data URI (or Plotly figure) and
+        polar axes position of the polar plots
+
+    """
+    scenario = plots_scenario(True, default_inputs())
+    return {
+        'scenario': scenario,
+        'borehole-stress': list(borehole_stress_plots(True, scenario['inputs'])),
+        'breakouts-polar': list(scenario_polar_plot('breakouts-polar', scenario['inputs'])),
+        'tensile-fracture-polar': list(scenario_polar_plot('tensile-fracture-polar', scenario['inputs'])),
+    }
+
+def build_default_artifacts(folder: str) -> str:
+    """Compute the plots of the default scenario and store them as JSON in a folder
+
+    The file is written atomically, concurrent readers see either no file or the whole file.
+    """
+    os.makedirs(folder, exist_ok=True)
+    path = artifacts_path(folder)
+    data = json.dumps(compute_default_artifacts(), cls=PlotlyJSONEncoder)
+    fid, tmppath = tempfile.mkstemp(dir=folder, suffix='.json')
+    try:
+        with os.fdopen(fid, 'w') as tmpfile:
+            tmpfile.write(data)
+        os.replace(tmppath, path)
+    except BaseException:
+        os.remove(tmppath)
+        raise
+    logger.info(f'Plots of the default scenario stored in {path}.')
+    return path
+
+def ensure_default_artifacts(folder: str):
+    """Build the plots of the default scenario if their file is missing"""
+    if not os.path.exists(artifacts_path(folder)):
+        build_default_artifacts(folder)
+
+def load_default_artifacts(folder: str) -> Optional[Dict[str, Any]]:
+    """Read the plots of the default scenario of a folder
+
+    They are built before the workers start (`iwst`, or `iwst -precompute` at deploy
+    time), never by the workers themselves.
+
+    Returns:
+        artifacts (see `compute_default_artifacts`), None if they are not built or cannot be read
+
+    """
+    path = artifacts_path(folder)
+    if not os.path.exists(path):
+        logger.info('Plots of the default scenario not precomputed (iwst -precompute). They are computed by every page.')
+        return None
+    try:
+        with open(path, 'r') as fid:
+            return json.load(fid)
+    except (OSError, ValueError) as err:
+        logger.warning(f'Plots of the default scenario not available: {err}. They are computed by every page.')
+        return None
+
+def serve_default_artifacts(artifacts: Optional[Dict[str, Any]]):
+    """Put the plots of the default scenario in the layout of the tabs
+
+    A new page shows them as they are and the tabs know they show the default scenario,
+    so no plot is computed until a new scenario is submitted.
+    """
+    if artifacts is None:
+        return
+
+    scenario = artifacts['scenario']
+    fig_stress, fig_mohr_coulomb = artifacts['borehole-stress']
+    props = {
+        'borehole-stress-plot': {'figure': fig_stress},
+        'mohr-coulomb-plot': {'figure': fig_mohr_coulomb},
+        'plots-scenario': {'data': scenario},
+        **{f'{plot}-shown': {'data': scenario['key']} for plot in TAB_PLOTS.values()},
+        # requested scenario of the tabs, the downloads of the polar plots take it from there
+        **{f'{plot}-request': {'data': dict(scenario, notify=False)} for plot in TAB_PLOTS.values()},
+    }
+    for plot in PLOT_ANALYSES:
+        # the URLs of the images are in the layout of every page: they are never pruned
+        src, figure, geometry = polar_plot_outputs(
+            *artifacts[plot], scenario['inputs']['azimuth'], scenario['inputs']['inclination_angle'], pinned=True
+        )
+        props[f'{plot}-plot'] = {'src': src}
+        props[f'{plot}-figure'] = {'figure': figure}
+        props[f'{plot}-geometry'] = {'data': geometry}
+    for component in tabs._traverse():
+        component_id = getattr(component, 'id', None)
+        if isinstance(component_id, str):
+            for name, value in props.get(component_id, {}).items():
+                if value is not dash.no_update:
+                    setattr(component, name, value)
@@ -3,7 +3,7 @@ import numpy as np
 
 from dash import Output, Input, State
 from datetime import datetime
-from iwst.routes.home.utils.defaults import DEFAULT_VALUES
+from iwst.routes.home.utils.defaults import DEFAULT_VALUES, INPUT_STEPS
 
 
 sidebar = dmc.Flex(
@@ -28,7 +28,7 @@ sidebar = dmc.Flex(
                             dmc.NumberInput(
                                 id="max-principal-stress-input",
                                 value=70.0,
-                                step=0.1,
+                                step=INPUT_STEPS["max-principal-stress-input"],
                                 style={"width": "80px", "height": "30px"},
                                 styles={
                                     "input": {"textAlign": "right", "fontSize": "14px"},  
@@ -50,7 +50,7 @@ sidebar = dmc.Flex(
                             dmc.NumberInput(
                                 id="intermediate-principal-stress-input",
                                 value=67.0,
-                                step=0.1,
+                                step=INPUT_STEPS["intermediate-principal-stress-input"],
                                 style={"width": "80px", "height": "30px"},
                                 styles={
                                     "input": {"textAlign": "right", "fontSize": "14px"},  
@@ -72,7 +72,7 @@ sidebar = dmc.Flex(
                             dmc.NumberInput(
                                 id="min-principal-stress-input",
                                 value=45.0,
-                                step=0.1,
+                                step=INPUT_STEPS["min-principal-stress-input"],
                                 style={"width": "80px", "height": "30px"},
                                 styles={
                                     "input": {"textAlign": "right", "fontSize": "14px"},  
@@ -94,7 +94,7 @@ sidebar = dmc.Flex(
                             dmc.NumberInput(
                                 id="pore-pressure-input",
                                 value=32.0,
-                                step=0.1,
+                                step=INPUT_STEPS["pore-pressure-input"],
                                 style={"width": "80px", "height": "30px"},
                                 styles={
                                     "input": {"textAlign": "right", "fontSize": "14px"},  
@@ -116,7 +116,7 @@ sidebar = dmc.Flex(
                             dmc.NumberInput(
                                 id="mud-pressure-input",
                                 value=32.0,
-                                step=0.1,
+                                step=INPUT_STEPS["mud-pressure-input"],
                                 style={"width": "80px", "height": "30px"},
                                 styles={
                                     "input": {"textAlign": "right", "fontSize": "14px"},  
@@ -138,7 +138,7 @@ sidebar = dmc.Flex(
                             dmc.NumberInput(
                                 id="poisson-ratio-input",
                                 value=0.15,
-                                step=0.01,
+                                step=INPUT_STEPS["poisson-ratio-input"],
                                 style={"width": "80px", "height": "30px"},
                                 styles={
                                     "input": {"textAlign": "right", "fontSize": "14px"},  
@@ -160,7 +160,7 @@ sidebar = dmc.Flex(
                             dmc.NumberInput(
                                 id="azimuth-input",
                                 value=90.0,
-                                step=1,
+                                step=INPUT_STEPS["azimuth-input"],
                                 style={"width": "80px", "height": "30px"},
                                 styles={
                                     "input": {"textAlign": "right", "fontSize": "14px"},  
@@ -182,7 +182,7 @@ sidebar = dmc.Flex(
                             dmc.NumberInput(
                                 id="inclination-angle-input",
                                 value=85.0,
-                                step=1,
+                                step=INPUT_STEPS["inclination-angle-input"],
                                 style={"width": "80px", "height": "30px"},
                                 styles={
                                     "input": {"textAlign": "right", "fontSize": "14px"},  
@@ -204,7 +204,7 @@ sidebar = dmc.Flex(
                             dmc.NumberInput(
                                 id="friction-coefficient-input",
                                 value=1.0,
-                                step=0.01,
+                                step=INPUT_STEPS["friction-coefficient-input"],
                                 style={"width": "80px", "height": "30px"},
                                 styles={
                                     "input": {"textAlign": "right", "fontSize": "14px"},  
@@ -226,7 +226,7 @@ sidebar = dmc.Flex(
                             dmc.NumberInput(
                                 id="alpha-angle-input",
                                 value=0.0,
-                                step=1,
+                                step=INPUT_STEPS["alpha-angle-input"],
                                 style={"width": "80px", "height": "30px"},
                                 styles={
                                     "input": {"textAlign": "right", "fontSize": "14px"},  
@@ -248,7 +248,7 @@ sidebar = dmc.Flex(
                             dmc.NumberInput(
                                 id="beta-angle-input",
                                 value=90.0,
-                                step=1,
+                                step=INPUT_STEPS["beta-angle-input"],
                                 style={"width": "80px", "height": "30px"},
                                 styles={
                                     "input": {"textAlign": "right", "fontSize": "14px"},  
@@ -270,7 +270,7 @@ sidebar = dmc.Flex(
                             dmc.NumberInput(
                                 id="gamma-angle-input",
                                 value=0.0,
-                                step=1,
+                                step=INPUT_STEPS["gamma-angle-input"],
                                 style={"width": "80px", "height": "30px"},
                                 styles={
                                     "input": {"textAlign": "right", "fontSize": "14px"},  
@@ -292,7 +292,7 @@ sidebar = dmc.Flex(
                             dmc.NumberInput(
                                 id="tensile-strength-input",
                                 value=0.0, 
-                                step=0.1,
+                                step=INPUT_STEPS["tensile-strength-input"],
                                 style={"width": "80px", "height": "30px"},
                                 styles={
                                     "input": {"textAlign": "right", "fontSize": "14px"},  
@@ -3,27 +3,79 @@ import numpy as np
 import plotly.graph_objects as go
 import dash
 import base64
+import functools
 
 from dash import dcc, html, Output, Input, State
 from dash.exceptions import PreventUpdate
-from iwst.routes.home.utils.borehole_stress import (
-    calculate_stress_matrix,
-    calculate_rotation_matrix,
-    calculate_rotation_matrix_azimuth_inclination,
-    calculate_tangential_stress,
-    plot_mohr_coulomb_failure,
-    calculate_mohr_coulomb_circle,
-)
+from iwst.core.borehole import calculate_borehole_stress
+from iwst.core.mohr import calculate_mohr_coulomb_circle, MOHR_CIRCLE_POINTS
 from iwst.routes.home.utils.overlay import (
     info_drawer_borehole_stress_and_mohr_coulomb_plot,
     info_drawer_breakouts_polar_plot,
     info_drawer_tensile_fracture_polar_plot,
 )
-from iwst.routes.home.utils.polar_plot_borehole import generate_plot as generate_polar_plot_borehole
-from iwst.routes.home.utils.polar_tensile import generate_plot as generate_polar_plot_tensile
-from iwst.routes.home.utils.defaults import DEFAULT_VALUES 
+from iwst.core.polar import ComputationCancelled, calculate_polar_reduction, postprocess_polar_fields
+from iwst.core.parallel import calculate_polar_reduction_parallel
+from iwst.core.stages import POLAR_STAGES
+from iwst.core.basis import load_basis
+from iwst.routes.home.utils.polar_plots import render_background, render_figure, render_polar_plot, render_raster
+from iwst.routes.home.utils.polar_marker import MARKER_POSITION_JS, PRINT_DPI, composite_marker
+from iwst.routes.home.utils.polar_figure import MARKER_FIGURE_JS, with_marker
+from iwst.routes.home.utils.polar_raster import composite_raster_marker
+from iwst.routes.home.utils.defaults import DEFAULT_VALUES, INPUT_STEPS
+from iwst.utils.config import get_compute_config
+from iwst.utils.cache import get_result_cache, quantize, scenario_key
+from iwst.utils.tokens import get_request_tokens
+from iwst.utils.scheduler import SchedulerBusy, get_scheduler
+from iwst.utils.images import image_url
 from dash_iconify import DashIconify
 
+# inputs of a scenario, named as in the project data
+SCENARIO_INPUTS = (
+    "pore_pressure",
+    "mud_pressure",
+    "max_principal_stress",
+    "intermediate_principal_stress",
+    "min_principal_stress",
+    "poisson_ratio",
+    "inclination_angle",
+    "azimuth",
+    "friction_coefficient",
+    "alpha_angle",
+    "beta_angle",
+    "gamma_angle",
+    "tensile_strength",
+)
+
+# names of the inputs of a scenario in the stages of the polar plots (see POLAR_STAGES)
+STAGE_INPUT_NAMES = {
+    "s1": "max_principal_stress",
+    "s2": "intermediate_principal_stress",
+    "s3": "min_principal_stress",
+}
+
+# plots of every tab, computed when the tab is shown (see `dispatch_plots`)
+TAB_PLOTS = {
+    "tab1": "borehole-stress",
+    "tab2": "breakouts-polar",
+    "tab3": "tensile-fracture-polar",
+}
+
+# analysis of every polar plot
+PLOT_ANALYSES = {
+    "breakouts-polar": "breakouts",
+    "tensile-fracture-polar": "tensile",
+}
+
+# size of the image or of the figure of a polar plot (see `set_polar_renderer`)
+POLAR_PLOT_STYLE = {"height": "100%", "width": "100%"}
+
+# resolutions of the downloaded polar plots (see `polar_plot_download`)
+DOWNLOAD_RESOLUTIONS = [
+    {"value": "screen", "label": "Screen"},
+    {"value": "print", "label": f"Print ({PRINT_DPI} dpi)"},
+]
+
 borehole_stress_layout = html.Div(
     children=[
         dmc.Flex(
@@ -86,6 +138,17 @@ borehole_stress_layout = html.Div(
     ],
 )
 
+def polar_progress_spinner(progress_id):
+    """Loading overlay of a polar plot, with the progress of its background computation"""
+    return dmc.Stack(
+        align="center",
+        gap="xs",
+        children=[
+            dmc.Loader(color="blue"),
+            dmc.Text(id=progress_id, size="sm", c="dimmed"),
+        ],
+    )
+
 polar_plot_borehole_layout = html.Div(
     children=[
         dmc.Flex(
@@ -117,6 +180,13 @@ polar_plot_borehole_layout = html.Div(
                     color="blue",
                     style={"marginLeft": "10px"},
                 ),
+                dmc.SegmentedControl(
+                    id="download-breakouts-polar-resolution",
+                    data=DOWNLOAD_RESOLUTIONS,
+                    value="screen",
+                    size="xs",
+                    style={"marginRight": "10px"},
+                ),
             ],
         ),
         dcc.Download(id="download-breakouts-polar"),
@@ -125,14 +195,28 @@ polar_plot_borehole_layout = html.Div(
             align="center",
             children=[
                 dcc.Loading(
+                    custom_spinner=polar_progress_spinner("breakouts-polar-progress"),
+                    target_components={"breakouts-polar-plot": "src", "breakouts-polar-figure": "figure"},
                     children=[
-                        html.Img(
-                            id="breakouts-polar-plot",
-                            src="",
-                            style={"height": "500px", "width": "100%"},
+                        html.Div(
+                            style={"position": "relative", "height": "500px", "width": "100%"},
+                            children=[
+                                html.Img(
+                                    id="breakouts-polar-plot",
+                                    src="",
+                                    style=POLAR_PLOT_STYLE,
+                                ),
+                                html.Div(id="breakouts-polar-marker", style={"display": "none"}),
+                                dcc.Graph(
+                                    id="breakouts-polar-figure",
+                                    style=dict(POLAR_PLOT_STYLE, display="none"),
+                                    config={"modeBarButtonsToRemove": ["toImage"]},
+                                ),
+                            ],
                         ),
                     ],
                 ),
+                dcc.Store(id="breakouts-polar-geometry"),
             ],
         ),
     ],
@@ -169,6 +253,13 @@ polar_tensile_layout = html.Div(
                     color="blue",
                     style={"marginLeft": "10px"},
                 ),
+                dmc.SegmentedControl(
+                    id="download-tensile-fracture-polar-resolution",
+                    data=DOWNLOAD_RESOLUTIONS,
+                    value="screen",
+                    size="xs",
+                    style={"marginRight": "10px"},
+                ),
             ],
         ),
         dcc.Download(id="download-tensile-fracture-polar"),
@@ -177,14 +268,28 @@ polar_tensile_layout = html.Div(
             align="center",
             children=[
                 dcc.Loading(
+                    custom_spinner=polar_progress_spinner("tensile-fracture-polar-progress"),
+                    target_components={"tensile-fracture-polar-plot": "src", "tensile-fracture-polar-figure": "figure"},
                     children=[
-                        html.Img(
-                            id="tensile-fracture-polar-plot",
-                            src="",
-                            style={"height": "500px", "width": "100%"},
+                        html.Div(
+                            style={"position": "relative", "height": "500px", "width": "100%"},
+                            children=[
+                                html.Img(
+                                    id="tensile-fracture-polar-plot",
+                                    src="",
+                                    style=POLAR_PLOT_STYLE,
+                                ),
+                                html.Div(id="tensile-fracture-polar-marker", style={"display": "none"}),
+                                dcc.Graph(
+                                    id="tensile-fracture-polar-figure",
+                                    style=dict(POLAR_PLOT_STYLE, display="none"),
+                                    config={"modeBarButtonsToRemove": ["toImage"]},
+                                ),
+                            ],
                         ),
                     ],
                 ),
+                dcc.Store(id="tensile-fracture-polar-geometry"),
             ],
         ),
     ],
@@ -277,467 +382,797 @@ tabs = dmc.Flex(
         info_drawer_borehole_stress_and_mohr_coulomb_plot,
         info_drawer_breakouts_polar_plot,
         info_drawer_tensile_fracture_polar_plot,
+        # scenario of the plots, requested and shown scenario of the plots of every tab
+        dcc.Store(id="plots-scenario"),
+        *[dcc.Store(id=f"{plot}-request") for plot in TAB_PLOTS.values()],
+        *[dcc.Store(id=f"{plot}-shown") for plot in TAB_PLOTS.values()],
+        # hidden plots to prefetch and scenario prefetched
+        dcc.Store(id="plots-prefetch"),
+        dcc.Store(id="plots-prefetched"),
     ],
 )
 
-def register_callbacks(app):
-    @app.callback(
-        Output("borehole-stress-plot", "figure"),
-        Output("mohr-coulomb-plot", "figure"),
-        Output("notifications-container", "children"),
-        Input("generate-plots-button", "n_clicks"),  # Callback triggered only by the button
-        State("pore-pressure-input", "value"),  # Read input values without triggering the callback
-        State("mud-pressure-input", "value"),
-        State("max-principal-stress-input", "value"),
-        State("intermediate-principal-stress-input", "value"),
-        State("min-principal-stress-input", "value"),
-        State("poisson-ratio-input", "value"),
-        State("inclination-angle-input", "value"),
-        State("azimuth-input", "value"),
-        State("friction-coefficient-input", "value"),
-        State("alpha-angle-input", "value"),
-        State("beta-angle-input", "value"),
-        State("gamma-angle-input", "value"),
-        prevent_initial_call=False,  # Allows the callback to execute at startup
-        running=[
-            (Output("generate-plots-button", "disabled"), True, False),
-        ],
-    )
-    def generate_borehole_stress_and_mohr_coulomb_plots(
-        n_clicks, 
-        pore_pressure, 
-        mud_pressure, 
-        max_principal_stress, 
+def borehole_stress_and_mohr_coulomb_figures(
+    default_scenario,
+    pore_pressure,
+    mud_pressure,
+    max_principal_stress,
+    intermediate_principal_stress,
+    min_principal_stress,
+    poisson_ratio,
+    inclination_angle,
+    azimuth,
+    friction_coefficient,
+    alpha_angle,
+    beta_angle,
+    gamma_angle,
+    mohr_circle_points=MOHR_CIRCLE_POINTS
+):
+    """Borehole stress and Mohr-Coulomb figures (as plotly dicts) of a scenario.
+
+    The default scenario shown at startup is plotted in MPa, the scenarios of the
+    generate button are normalized by the effective maximum principal stress.
+    """
+    borehole = calculate_borehole_stress(
+        pore_pressure,
+        mud_pressure,
+        max_principal_stress,
         intermediate_principal_stress,
-        min_principal_stress, 
-        poisson_ratio, 
-        inclination_angle, 
-        azimuth, 
+        min_principal_stress,
+        poisson_ratio,
         friction_coefficient,
-        alpha_angle, 
-        beta_angle, 
-        gamma_angle
-    ):
+        azimuth,
+        inclination_angle,
+        alpha_angle,
+        beta_angle,
+        gamma_angle,
+        backend=get_compute_config().backend
+    )
+    max_principal_stress = max_principal_stress - pore_pressure
+    pressure_difference = mud_pressure - pore_pressure
+    theta_angles = borehole.theta
+    max_tangential, min_tangential = borehole.max_tangential, borehole.min_tangential
+    normal_zz, normal_tt = borehole.szz, borehole.stt
+    max_tangential_peak, min_tangential_peak = borehole.max_tangential_peak, borehole.min_tangential_peak
+    intercept = borehole.intercept
+    if default_scenario:  # If the button has never been pressed, use default values
+        fig_stress = go.Figure()
+        fig_stress.add_trace(go.Scatter(
+            x=theta_angles, y=normal_zz,
+            mode='lines', name='Axial Stress (σzz)',
+            line=dict(color='#1f77b4', width=2)
+        ))
+        fig_stress.add_trace(go.Scatter(
+            x=theta_angles, y=normal_tt,
+            mode='lines', name='Tangential Stress (σθθ)',
+            line=dict(color='#2ca02c', width=2)
+        ))
+        fig_stress.add_trace(go.Scatter(
+            x=theta_angles, y=max_tangential,
+            mode='lines', name='Max Tangential Stress',
+            line=dict(color='#d62728', width=2, dash='dash')
+        ))
+        fig_stress.add_trace(go.Scatter(
+            x=theta_angles, y=min_tangential,
+            mode='lines', name='Min Tangential Stress',
+            line=dict(color='black', width=2, dash='dot')
+        ))
+        fig_stress.update_layout(
+            xaxis_title='Theta [deg]',
+            yaxis_title='Stress [MPa]',
+            legend=dict(
+                orientation="h",
+                yanchor="top",
+                y=-0.4,
+                xanchor="center",
+                x=0.5,
+                traceorder="normal",
+                itemsizing="constant",
+                itemwidth=40,
+                font=dict(size=12),
+            ),
+            template='plotly_white',
+            font=dict(size=14),
+            xaxis=dict(showgrid=True, gridcolor='lightgrey'),
+            yaxis=dict(showgrid=True, gridcolor='lightgrey'),
+            margin=dict(l=50, r=50, t=50, b=100),
+        )
+        fig_mohr_coulomb = go.Figure()
+        x_coords_max_min, y_coords_max_min = calculate_mohr_coulomb_circle(
+            max_tangential_peak, pressure_difference, mohr_circle_points
+        )
+        x_coords_max_intermediate, y_coords_max_intermediate = calculate_mohr_coulomb_circle(
+            max_tangential_peak, min_tangential_peak, mohr_circle_points
+        )
+        x_coords_intermediate_min, y_coords_intermediate_min = calculate_mohr_coulomb_circle(
+            min_tangential_peak, pressure_difference, mohr_circle_points
+        )
+        fig_mohr_coulomb.add_trace(go.Scatter(
+            x=x_coords_max_min, y=y_coords_max_min,
+            mode='lines', name=r'$\sigma_{\theta\theta} - \sigma_{rr}$',
+            line=dict(color='#d62728', width=2)
+        ))
+        fig_mohr_coulomb.add_trace(go.Scatter(
+            x=x_coords_max_intermediate, y=y_coords_max_intermediate,
+            mode='lines', name=r'$\sigma_{\theta\theta} - \sigma_{zz}$',
+            line=dict(color='#1f77b4', width=2)
+        ))
+        fig_mohr_coulomb.add_trace(go.Scatter(
+            x=x_coords_intermediate_min, y=y_coords_intermediate_min,
+            mode='lines', name=r'$\sigma_{zz} - \sigma_{rr}$',
+            line=dict(color='#2ca02c', width=2)
+        ))
+        x_failure = np.linspace(0, max_tangential_peak * 1.5, 100)
+        y_failure = x_failure * friction_coefficient + intercept
+        fig_mohr_coulomb.add_trace(go.Scatter(
+            x=x_failure, y=y_failure,
+            mode='lines', name='Failure Envelope',
+            line=dict(color='#2f2f2f', width=2)
+        ))
+        fig_mohr_coulomb.update_layout(
+            xaxis_title=r'Effective stress [MPa]',
+            yaxis_title=r'Shear stress [MPa]',
+            legend=dict(
+                orientation="h",
+                yanchor="top",
+                y=-0.4,
+                xanchor="center",
+                x=0.5,
+                traceorder="normal",
+                itemsizing="constant",
+                itemwidth=40,
+                font=dict(size=12),
+            ),
+            xaxis_range=[0, max_tangential_peak * 1.5],
+            yaxis_range=[0, max_tangential_peak],
+            template='plotly_white',
+            font=dict(size=14),
+            xaxis=dict(showgrid=True, gridcolor='lightgrey'),
+            yaxis=dict(showgrid=True, gridcolor='lightgrey'),
+            margin=dict(l=50, r=50, t=50, b=100),
+            yaxis_scaleanchor="x",
+            yaxis_scaleratio=1,
+        )
+        return fig_stress.to_plotly_json(), fig_mohr_coulomb.to_plotly_json()
+    else:  # If the button has been pressed, generate graphs with new values
+        fig_stress = go.Figure()
+        fig_stress.add_trace(go.Scatter(
+            x=theta_angles, y=normal_zz / max_principal_stress,
+            mode='lines', name='Axial Stress (Szz)',
+            line=dict(color='#1f77b4', width=2)
+        ))
+        fig_stress.add_trace(go.Scatter(
+            x=theta_angles, y=normal_tt / max_principal_stress,
+            mode='lines', name='Tangential Stress (Stt)',
+            line=dict(color='#2ca02c', width=2)
+        ))
+        fig_stress.add_trace(go.Scatter(
+            x=theta_angles, y=max_tangential / max_principal_stress,
+            mode='lines', name='Max Tangential Stress (TsMax)',
+            line=dict(color='#d62728', width=2, dash='dash')
+        ))
+        fig_stress.add_trace(go.Scatter(
+            x=theta_angles, y=min_tangential / max_principal_stress,
+            mode='lines', name='Min Tangential Stress (TsMin)',
+            line=dict(color='black', width=2, dash='dot')
+        ))
+        fig_stress.update_layout(
+            xaxis_title='theta [deg]',
+            yaxis_title='Stress [MPa]',
+            legend=dict(
+                orientation="h",
+                yanchor="top",
+                y=-0.4,
+                xanchor="center",
+                x=0.5,
+                traceorder="normal",
+                itemsizing="constant",
+                itemwidth=40,
+                font=dict(size=12),
+            ),
+            template='plotly_white',
+            font=dict(size=14),
+            xaxis=dict(showgrid=True, gridcolor='lightgrey'),
+            yaxis=dict(showgrid=True, gridcolor='lightgrey'),
+            margin=dict(l=50, r=50, t=50, b=100),
+        )
+        fig_mohr_coulomb = go.Figure()
+        x_coords_max_min, y_coords_max_min = calculate_mohr_coulomb_circle(
+            max_tangential_peak, pressure_difference, mohr_circle_points
+        )
+        x_coords_max_intermediate, y_coords_max_intermediate = calculate_mohr_coulomb_circle(
+            max_tangential_peak, min_tangential_peak, mohr_circle_points
+        )
+        x_coords_intermediate_min, y_coords_intermediate_min = calculate_mohr_coulomb_circle(
+            min_tangential_peak, pressure_difference, mohr_circle_points
+        )
+        fig_mohr_coulomb.add_trace(go.Scatter(
+            x=x_coords_max_min, y=y_coords_max_min,
+            mode='lines', name='Max-Min Circle',
+            line=dict(color='#d62728', width=2)
+        ))
+        fig_mohr_coulomb.add_trace(go.Scatter(
+            x=x_coords_max_intermediate, y=y_coords_max_intermediate,
+            mode='lines', name='Max-Intermediate Circle',
+            line=dict(color='#1f77b4', width=2)
+        ))
+        fig_mohr_coulomb.add_trace(go.Scatter(
+            x=x_coords_intermediate_min, y=y_coords_intermediate_min,
+            mode='lines', name='Intermediate-Min Circle',
+            line=dict(color='#2ca02c', width=2)
+        ))
+        x_failure = np.linspace(0, max_tangential_peak * 1.5, 100)
+        y_failure = x_failure * friction_coefficient + intercept
+        fig_mohr_coulomb.add_trace(go.Scatter(
+            x=x_failure, y=y_failure,
+            mode='lines', name='Failure Envelope',
+            line=dict(color='#2f2f2f', width=2)
+        ))
+        fig_mohr_coulomb.update_layout(
+            xaxis_title=r'Effective stress [MPa]',
+            yaxis_title=r'Shear stress [MPa]',
+            legend=dict(
+                orientation="h",
+                yanchor="top",
+                y=-0.4,
+                xanchor="center",
+                x=0.5,
+                traceorder="normal",
+                itemsizing="constant",
+                itemwidth=40,
+                font=dict(size=12),
+            ),
+            xaxis_range=[0, max_tangential_peak * 1.5],
+            yaxis_range=[0, max_tangential_peak],
+            template='plotly_white',
+            font=dict(size=14),
+            xaxis=dict(showgrid=True, gridcolor='lightgrey'),
+            yaxis=dict(showgrid=True, gridcolor='lightgrey'),
+            margin=dict(l=50, r=50, t=50, b=100),
+            yaxis_scaleanchor="x",
+            yaxis_scaleratio=1,
+        )
+        return fig_stress.to_plotly_json(), fig_mohr_coulomb.to_plotly_json()
 
-        if n_clicks is None:
-            pore_pressure = DEFAULT_VALUES["pore-pressure-input"]
-            mud_pressure = DEFAULT_VALUES["mud-pressure-input"]
-            max_principal_stress = DEFAULT_VALUES["max-principal-stress-input"]
-            intermediate_principal_stress = DEFAULT_VALUES["intermediate-principal-stress-input"]
-            min_principal_stress = DEFAULT_VALUES["min-principal-stress-input"]
-            poisson_ratio = DEFAULT_VALUES["poisson-ratio-input"]
-            inclination_angle = DEFAULT_VALUES["inclination-angle-input"]
-            azimuth = DEFAULT_VALUES["azimuth-input"]
-            friction_coefficient = DEFAULT_VALUES["friction-coefficient-input"]
-            alpha_angle = DEFAULT_VALUES["alpha-angle-input"]
-            beta_angle = DEFAULT_VALUES["beta-angle-input"]
-            gamma_angle = DEFAULT_VALUES["gamma-angle-input"]
-
-        """Update the plots when the button is clicked or at startup."""
-        if n_clicks is None:  # If the button has never been pressed, use default values
-            max_principal_stress = max_principal_stress - pore_pressure
-            intermediate_principal_stress = intermediate_principal_stress - pore_pressure
-            min_principal_stress = min_principal_stress - pore_pressure
-            pressure_difference = mud_pressure - pore_pressure
-            stress_matrix = calculate_stress_matrix(
-                max_principal_stress, intermediate_principal_stress, min_principal_stress
-            )
-            rotation_matrix_global = calculate_rotation_matrix(
-                alpha_angle, beta_angle, gamma_angle
-            )
-            transformed_stress_global = (
-                rotation_matrix_global.T @ stress_matrix @ rotation_matrix_global
-            )
-            rotation_matrix_borehole = calculate_rotation_matrix_azimuth_inclination(
-                azimuth, inclination_angle
-            )
-            transformed_stress_borehole = (
-                rotation_matrix_borehole @ rotation_matrix_global.T @ stress_matrix
-                @ rotation_matrix_global @ rotation_matrix_borehole.T
-            )
-            theta_angles = np.arange(0, 360, 0.1)
-            max_tangential, min_tangential, normal_zz, normal_tt = calculate_tangential_stress(
-                transformed_stress_borehole, theta_angles, poisson_ratio, pressure_difference
-            )
-            fig_stress = go.Figure()
-            fig_stress.add_trace(go.Scatter(
-                x=theta_angles, y=normal_zz,
-                mode='lines', name='Axial Stress (σzz)',
-                line=dict(color='#1f77b4', width=2)
-            ))
-            fig_stress.add_trace(go.Scatter(
-                x=theta_angles, y=normal_tt,
-                mode='lines', name='Tangential Stress (σθθ)',
-                line=dict(color='#2ca02c', width=2)
-            ))
-            fig_stress.add_trace(go.Scatter(
-                x=theta_angles, y=max_tangential,
-                mode='lines', name='Max Tangential Stress',
-                line=dict(color='#d62728', width=2, dash='dash')
-            ))
-            fig_stress.add_trace(go.Scatter(
-                x=theta_angles, y=min_tangential,
-                mode='lines', name='Min Tangential Stress',
-                line=dict(color='black', width=2, dash='dot')
-            ))
-            fig_stress.update_layout(
-                xaxis_title='Theta [deg]',
-                yaxis_title='Stress [MPa]',
-                legend=dict(
-                    orientation="h",
-                    yanchor="top",
-                    y=-0.4,
-                    xanchor="center",
-                    x=0.5,
-                    traceorder="normal",
-                    itemsizing="constant",
-                    itemwidth=40,
-                    font=dict(size=12),
-                ),
-                template='plotly_white',
-                font=dict(size=14),
-                xaxis=dict(showgrid=True, gridcolor='lightgrey'),
-                yaxis=dict(showgrid=True, gridcolor='lightgrey'),
-                margin=dict(l=50, r=50, t=50, b=100),
-            )
-            unconfined_compressive_strength = plot_mohr_coulomb_failure(
-                np.max(max_tangential), np.max(min_tangential), pressure_difference, friction_coefficient
-            )
-            fig_mohr_coulomb = go.Figure()
-            x_coords_max_min, y_coords_max_min = calculate_mohr_coulomb_circle(
-                np.max(max_tangential), pressure_difference
-            )
-            x_coords_max_intermediate, y_coords_max_intermediate = calculate_mohr_coulomb_circle(
-                np.max(max_tangential), np.max(min_tangential)
-            )
-            x_coords_intermediate_min, y_coords_intermediate_min = calculate_mohr_coulomb_circle(
-                np.max(min_tangential), pressure_difference
-            )
-            x_coords_max_min, y_coords_max_min = x_coords_max_min[::100], y_coords_max_min[::100]
-            x_coords_max_intermediate, y_coords_max_intermediate = x_coords_max_intermediate[::100], y_coords_max_intermediate[::100]
-            x_coords_intermediate_min, y_coords_intermediate_min = x_coords_intermediate_min[::100], y_coords_intermediate_min[::100]
-            fig_mohr_coulomb.add_trace(go.Scatter(
-                x=x_coords_max_min, y=y_coords_max_min,
-                mode='lines', name=r'$\sigma_{\theta\theta} - \sigma_{rr}$',
-                line=dict(color='#d62728', width=2)
-            ))
-            fig_mohr_coulomb.add_trace(go.Scatter(
-                x=x_coords_max_intermediate, y=y_coords_max_intermediate,
-                mode='lines', name=r'$\sigma_{\theta\theta} - \sigma_{zz}$',
-                line=dict(color='#1f77b4', width=2)
-            ))
-            fig_mohr_coulomb.add_trace(go.Scatter(
-                x=x_coords_intermediate_min, y=y_coords_intermediate_min,
-                mode='lines', name=r'$\sigma_{zz} - \sigma_{rr}$',
-                line=dict(color='#2ca02c', width=2)
-            ))
-            intercept = (
-                (np.max(max_tangential) - pressure_difference)
-                / 2 / ((friction_coefficient**2 + 1)**0.5 + friction_coefficient)
-            )
-            x_failure = np.linspace(0, np.max(max_tangential) * 1.5, 100)
-            y_failure = x_failure * friction_coefficient + intercept
-            fig_mohr_coulomb.add_trace(go.Scatter(
-                x=x_failure, y=y_failure,
-                mode='lines', name='Failure Envelope',
-                line=dict(color='#2f2f2f', width=2)
-            ))
-            fig_mohr_coulomb.update_layout(
-                xaxis_title=r'Effective stress [MPa]',
-                yaxis_title=r'Shear stress [MPa]',
-                legend=dict(
-                    orientation="h",
-                    yanchor="top",
-                    y=-0.4,
-                    xanchor="center",
-                    x=0.5,
-                    traceorder="normal",
-                    itemsizing="constant",
-                    itemwidth=40,
-                    font=dict(size=12),
-                ),
-                xaxis_range=[0, np.max(max_tangential) * 1.5],
-                yaxis_range=[0, np.max(max_tangential)],
-                template='plotly_white',
-                font=dict(size=14),
-                xaxis=dict(showgrid=True, gridcolor='lightgrey'),
-                yaxis=dict(showgrid=True, gridcolor='lightgrey'),
-                margin=dict(l=50, r=50, t=50, b=100),
-                yaxis_scaleanchor="x",
-                yaxis_scaleratio=1,
-            )
-            return (
-                fig_stress, 
-                fig_mohr_coulomb, 
-                dmc.Notification(
-                    title="Success",
-                    message="Graphs generated correctly",
-                    color="green",
-                    action="show",
-                )
-            )
-        else:  # If the button has been pressed, generate graphs with new values
-            max_principal_stress = max_principal_stress - pore_pressure
-            intermediate_principal_stress = intermediate_principal_stress - pore_pressure
-            min_principal_stress = min_principal_stress - pore_pressure
-            pressure_difference = mud_pressure - pore_pressure
-            stress_matrix = calculate_stress_matrix(
-                max_principal_stress, intermediate_principal_stress, min_principal_stress
-            )
-            rotation_matrix_global = calculate_rotation_matrix(
-                alpha_angle, beta_angle, gamma_angle
-            )
-            transformed_stress_global = (
-                rotation_matrix_global.T @ stress_matrix @ rotation_matrix_global
-            )
-            rotation_matrix_borehole = calculate_rotation_matrix_azimuth_inclination(
-                azimuth, inclination_angle
-            )
-            transformed_stress_borehole = (
-                rotation_matrix_borehole @ rotation_matrix_global.T @ stress_matrix
-                @ rotation_matrix_global @ rotation_matrix_borehole.T
-            )
-            theta_angles = np.arange(0, 360, 0.1)
-            max_tangential, min_tangential, normal_zz, normal_tt = calculate_tangential_stress(
-                transformed_stress_borehole, theta_angles, poisson_ratio, pressure_difference
-            )
-            fig_stress = go.Figure()
-            fig_stress.add_trace(go.Scatter(
-                x=theta_angles, y=normal_zz / max_principal_stress,
-                mode='lines', name='Axial Stress (Szz)',
-                line=dict(color='#1f77b4', width=2)
-            ))
-            fig_stress.add_trace(go.Scatter(
-                x=theta_angles, y=normal_tt / max_principal_stress,
-                mode='lines', name='Tangential Stress (Stt)',
-                line=dict(color='#2ca02c', width=2)
-            ))
-            fig_stress.add_trace(go.Scatter(
-                x=theta_angles, y=max_tangential / max_principal_stress,
-                mode='lines', name='Max Tangential Stress (TsMax)',
-                line=dict(color='#d62728', width=2, dash='dash')
-            ))
-            fig_stress.add_trace(go.Scatter(
-                x=theta_angles, y=min_tangential / max_principal_stress,
-                mode='lines', name='Min Tangential Stress (TsMin)',
-                line=dict(color='black', width=2, dash='dot')
-            ))
-            fig_stress.update_layout(
-                xaxis_title='theta [deg]',
-                yaxis_title='Stress [MPa]',
-                legend=dict(
-                    orientation="h",
-                    yanchor="top",
-                    y=-0.4,
-                    xanchor="center",
-                    x=0.5,
-                    traceorder="normal",
-                    itemsizing="constant",
-                    itemwidth=40,
-                    font=dict(size=12),
-                ),
-                template='plotly_white',
-                font=dict(size=14),
-                xaxis=dict(showgrid=True, gridcolor='lightgrey'),
-                yaxis=dict(showgrid=True, gridcolor='lightgrey'),
-                margin=dict(l=50, r=50, t=50, b=100),
-            )
-            unconfined_compressive_strength = plot_mohr_coulomb_failure(
-                np.max(max_tangential), np.max(min_tangential), pressure_difference, friction_coefficient
-            )
-            fig_mohr_coulomb = go.Figure()
-            x_coords_max_min, y_coords_max_min = calculate_mohr_coulomb_circle(
-                np.max(max_tangential), pressure_difference
-            )
-            x_coords_max_intermediate, y_coords_max_intermediate = calculate_mohr_coulomb_circle(
-                np.max(max_tangential), np.max(min_tangential)
-            )
-            x_coords_intermediate_min, y_coords_intermediate_min = calculate_mohr_coulomb_circle(
-                np.max(min_tangential), pressure_difference
-            )
-            x_coords_max_min, y_coords_max_min = x_coords_max_min[::100], y_coords_max_min[::100]
-            x_coords_max_intermediate, y_coords_max_intermediate = x_coords_max_intermediate[::100], y_coords_max_intermediate[::100]
-            x_coords_intermediate_min, y_coords_intermediate_min = x_coords_intermediate_min[::100], y_coords_intermediate_min[::100]
-            fig_mohr_coulomb.add_trace(go.Scatter(
-                x=x_coords_max_min, y=y_coords_max_min,
-                mode='lines', name='Max-Min Circle',
-                line=dict(color='#d62728', width=2)
-            ))
-            fig_mohr_coulomb.add_trace(go.Scatter(
-                x=x_coords_max_intermediate, y=y_coords_max_intermediate,
-                mode='lines', name='Max-Intermediate Circle',
-                line=dict(color='#1f77b4', width=2)
-            ))
-            fig_mohr_coulomb.add_trace(go.Scatter(
-                x=x_coords_intermediate_min, y=y_coords_intermediate_min,
-                mode='lines', name='Intermediate-Min Circle',
-                line=dict(color='#2ca02c', width=2)
-            ))
-            intercept = (
-                (np.max(max_tangential) - pressure_difference)
-                / 2 / ((friction_coefficient**2 + 1)**0.5 + friction_coefficient)
-            )
-            x_failure = np.linspace(0, np.max(max_tangential) * 1.5, 100)
-            y_failure = x_failure * friction_coefficient + intercept
-            fig_mohr_coulomb.add_trace(go.Scatter(
-                x=x_failure, y=y_failure,
-                mode='lines', name='Failure Envelope',
-                line=dict(color='#2f2f2f', width=2)
-            ))
-            fig_mohr_coulomb.update_layout(
-                xaxis_title=r'Effective stress [MPa]',
-                yaxis_title=r'Shear stress [MPa]',
-                legend=dict(
-                    orientation="h",
-                    yanchor="top",
-                    y=-0.4,
-                    xanchor="center",
-                    x=0.5,
-                    traceorder="normal",
-                    itemsizing="constant",
-                    itemwidth=40,
-                    font=dict(size=12),
-                ),
-                xaxis_range=[0, np.max(max_tangential) * 1.5],
-                yaxis_range=[0, np.max(max_tangential)],
-                template='plotly_white',
-                font=dict(size=14),
-                xaxis=dict(showgrid=True, gridcolor='lightgrey'),
-                yaxis=dict(showgrid=True, gridcolor='lightgrey'),
-                margin=dict(l=50, r=50, t=50, b=100),
-                yaxis_scaleanchor="x",
-                yaxis_scaleratio=1,
+# renderers of the polar plots (of an analysis and its fields), by `compute.polar_renderer`;
+# the downloads for print are rendered by `render_polar_plot`, whatever the renderer
+POLAR_RENDERERS = {
+    'matplotlib': render_background,
+    'numpy': render_raster,
+    'plotly': render_figure,
+}
+
+def polar_plot(
+    analysis,
+    pore_pressure,
+    mud_pressure,
+    s1,
+    s2,
+    s3,
+    poisson_ratio,
+    friction_coefficient,
+    alpha_angle,
+    beta_angle,
+    gamma_angle,
+    tensile_strength,
+    progress=None,
+    cancelled=None,
+    render=None
+):
+    """Breakouts or tensile fracture plot (as PNG data URI or Plotly figure) of a scenario.
+
+    Only the analysis of the plot is evaluated by the polar engine. Every stage of the
+    plot (see `POLAR_STAGES`) is cached with the inputs it depends on as key, so only
+    the stages whose inputs changed are rerun: e.g. a new tensile strength only
+    post-processes the cached reduction and renders the tensile fracture plot again.
+    The plot is rendered without the current well orientation, which is drawn on an
+    overlay of the page at the position of its polar axes. The numpy renderer (see
+    `compute.polar_renderer`) rasterizes the image without matplotlib; with the plotly
+    renderer the server rasterizes nothing: the plot is a figure of the field drawn by
+    the browser, whose marker trace is moved by the page.
+
+    Returns:
+        PNG data URI and polar axes position (see polar_marker.marker_geometry) of the
+        plot, or Plotly figure and None with the plotly renderer
+
+    Args:
+        analysis: 'breakouts' or 'tensile'
+        progress: called with a message on the state of the computation
+        cancelled: checked between the chunks of the computation and while waiting for
+            the same stage computed by another request, ComputationCancelled is raised
+            when true
+        render: renders the polar fields of the plot instead of the renderer of
+            `compute.polar_renderer`; its result is not cached (e.g. the downloads for print)
+    """
+    compute = get_compute_config()
+    cache = get_result_cache()
+    scenario = dict(
+        pore_pressure=pore_pressure,
+        mud_pressure=mud_pressure,
+        s1=s1,
+        s2=s2,
+        s3=s3,
+        poisson_ratio=poisson_ratio,
+        friction_coefficient=friction_coefficient,
+        tensile_strength=tensile_strength,
+        alpha_angle=alpha_angle,
+        beta_angle=beta_angle,
+        gamma_angle=gamma_angle,
+        theta_method=compute.theta_method,
+        dtype=compute.dtype,
+        polar_renderer=compute.polar_renderer,
+    )
+
+    def stage_key(stage):
+        return scenario_key(
+            f'polar-{stage}', *(key_value(name, scenario[name]) for name in POLAR_STAGES.inputs(stage))
+        )
+
+    def fields_progress(done, total):
+        if progress is not None:
+            progress(f"Computing polar fields ({100 * done // total}%)")
+
+    def compute_reduction():
+        reduction_scenario = (
+            pore_pressure, 
+            mud_pressure, 
+            s1, 
+            s2, 
+            s3,
+            poisson_ratio, 
+            alpha_angle, 
+            beta_angle, 
+            gamma_angle, 
+        )
+        fields_progress(0, 1)
+        if compute.workers > 1:
+            return calculate_polar_reduction_parallel(
+                *reduction_scenario,
+                workers=compute.workers,
+                theta_method=compute.theta_method, 
+                chunk_size=compute.chunk_size, 
+                dtype=compute.dtype, 
+                max_memory=compute.max_memory * 1024**2, 
+                backend=compute.backend, 
+                basis_dir=compute.basis_dir,
+                analyses=(analysis,),
+                progress=fields_progress,
+                cancelled=cancelled
             )
-            return (
-                fig_stress, 
-                fig_mohr_coulomb, 
-                dmc.Notification(
-                    title="Success",
-                    message="Graphs generated correctly",
-                    color="green",
-                    action="show",
-                    autoClose=5000,
-                )
+        return calculate_polar_reduction(
+            *reduction_scenario,
+            theta_method=compute.theta_method, 
+            chunk_size=compute.chunk_size, 
+            dtype=compute.dtype, 
+            max_memory=compute.max_memory * 1024**2, 
+            backend=compute.backend, 
+            basis=load_basis(compute.basis_dir),
+            analyses=(analysis,),
+            progress=fields_progress,
+            cancelled=cancelled
+        )
+
+    def postprocess():
+        reduction = cache.get_or_compute(stage_key(f'{analysis}-reduction'), compute_reduction, cancelled)
+        if analysis == 'breakouts':
+            return postprocess_polar_fields(
+                reduction, pore_pressure, mud_pressure, friction_coefficient=friction_coefficient
             )
+        return postprocess_polar_fields(
+            reduction, pore_pressure, mud_pressure, tensile_strength=tensile_strength
+        )
+
+    def polar_fields():
+        fields = cache.get_or_compute(stage_key(analysis), postprocess, cancelled)
+        if cancelled is not None and cancelled():
+            raise ComputationCancelled('Cancelled before rendering the polar plot.')
+        if progress is not None:
+            progress("Rendering plot")
+        return fields
+
+    def render_plot():
+        fields = polar_fields()
+        renderer = POLAR_RENDERERS[compute.polar_renderer]
+        if compute.polar_renderer == 'plotly':
+            return renderer(analysis, fields), None
+        image_base64, geometry = renderer(analysis, fields)
+        return f"data:image/png;base64,{image_base64}", geometry
+
+    if render is not None:
+        return render(polar_fields())
+    return cache.get_or_compute(stage_key(f'{analysis}-render'), render_plot, cancelled)
+
+def borehole_stress_plots(default_scenario, inputs):
+    """Borehole stress and Mohr-Coulomb figures of a scenario.
+
+    Figures of a scenario already computed are taken from the result cache.
+
+    Args:
+        default_scenario: whether the plots are those of the default scenario, whose
+            inputs are the default values
+        inputs: inputs of the scenario by name (see SCENARIO_INPUTS)
+    """
+    if default_scenario:
+        inputs = default_inputs()
+    compute = get_compute_config()
+    names = (
+        "pore_pressure",
+        "mud_pressure",
+        "max_principal_stress",
+        "intermediate_principal_stress",
+        "min_principal_stress",
+        "poisson_ratio",
+        "inclination_angle",
+        "azimuth",
+        "friction_coefficient",
+        "alpha_angle",
+        "beta_angle",
+        "gamma_angle",
+    )
+    values = (*(inputs[name] for name in names), compute.mohr_circle_points)
+    key_values = (*(key_value(name, inputs[name]) for name in names), compute.mohr_circle_points)
+    return get_result_cache().get_or_compute(
+        scenario_key('borehole-stress', default_scenario, *key_values),
+        lambda: borehole_stress_and_mohr_coulomb_figures(default_scenario, *values)
+    )
+
+def scenario_polar_plot(plot, inputs, progress=None, cancelled=None, render=None):
+    """Polar plot of a tab (see TAB_PLOTS) for the inputs of a scenario (see `polar_plot`)"""
+    return polar_plot(
+        PLOT_ANALYSES[plot],
+        inputs["pore_pressure"],
+        inputs["mud_pressure"],
+        inputs["max_principal_stress"],
+        inputs["intermediate_principal_stress"],
+        inputs["min_principal_stress"],
+        inputs["poisson_ratio"],
+        inputs["friction_coefficient"],
+        inputs["alpha_angle"],
+        inputs["beta_angle"],
+        inputs["gamma_angle"],
+        inputs["tensile_strength"],
+        progress=progress,
+        cancelled=cancelled,
+        render=render,
+    )
+
+def polar_plot_outputs(plot, geometry, azimuth, inclination, pinned=False):
+    """Image, figure and polar axes position shown by the page for a polar plot.
+
+    Args:
+        plot: PNG data URI or Plotly figure of the plot (see `polar_plot`)
+        geometry: polar axes position of the image, None for a figure
+        azimuth: azimuth of the current well orientation (degrees)
+        inclination: inclination of the current well orientation (degrees)
+        pinned: whether the image is kept in the image store for good (e.g. the plots
+            of the default scenario in the layout)
+
+    Returns:
+        "src" of the image (its URL in the image store, see `iwst.utils.images`) and
+        "figure" of the graph, the one not drawn by the renderer left unchanged
+        (dash.no_update), and geometry of the overlay marker
+    """
+    if isinstance(plot, str):
+        return image_url(plot, pinned), dash.no_update, geometry
+    return dash.no_update, with_marker(plot, azimuth, inclination), None
+
+def polar_plot_download(plot, inputs, azimuth, inclination, resolution="screen"):
+    """PNG of the polar plot of a scenario, with the current well orientation marker.
+
+    The plot is taken from the result cache (computed if missing), the browser sends only
+    the scenario. For print, the cached polar fields are rendered again by matplotlib at
+    PRINT_DPI, whatever the renderer of the page.
+
+    Args:
+        plot: polar plot of a tab (see TAB_PLOTS)
+        inputs: inputs of the scenario by name (see SCENARIO_INPUTS)
+        azimuth: azimuth of the current well orientation (degrees)
+        inclination: inclination of the current well orientation (degrees)
+        resolution: "screen" for the plot as shown, "print" for the plot at PRINT_DPI
+    """
+    valid = isinstance(azimuth, (int, float)) and isinstance(inclination, (int, float))
+    if resolution == "print":
+        analysis = PLOT_ANALYSES[plot]
+        marker = (azimuth, inclination) if valid else None
+        image_base64, _ = scenario_polar_plot(
+            plot, inputs, render=lambda fields: render_polar_plot(analysis, fields, marker, PRINT_DPI)
+        )
+        return base64.b64decode(image_base64)
+    polar, geometry = scenario_polar_plot(plot, inputs)
+    if not isinstance(polar, str):
+        return go.Figure(with_marker(polar, azimuth, inclination)).to_image(format="png")
+    image = base64.b64decode(polar.split(",", 1)[1])
+    if valid:
+        if get_compute_config().polar_renderer == 'numpy':
+            image = composite_raster_marker(image, geometry, azimuth, inclination)
+        else:
+            image = composite_marker(image, geometry, azimuth, inclination)
+    return image
+
+def set_polar_renderer(renderer):
+    """Show the polar plots of the tabs as drawn by a renderer (see `compute.polar_renderer`).
+
+    The images and their overlay marker are shown with 'matplotlib' and 'numpy', the
+    Plotly figures with 'plotly'.
+    """
+    displays = {}
+    for plot in PLOT_ANALYSES:
+        displays[f"{plot}-plot"] = renderer != 'plotly'
+        displays[f"{plot}-figure"] = renderer == 'plotly'
+    for component in tabs._traverse():
+        component_id = getattr(component, 'id', None)
+        if isinstance(component_id, str) and component_id in displays:
+            component.style = POLAR_PLOT_STYLE if displays[component_id] else dict(POLAR_PLOT_STYLE, display="none")
+
+def input_id(name):
+    """Id of the sidebar input of a scenario input"""
+    return f"{name.replace('_', '-')}-input"
+
+def key_value(name, value):
+    """Value of an input in the keys of the cached results of a scenario
+
+    The inputs of a scenario (see SCENARIO_INPUTS, or their names in the stages of the
+    polar plots) are rounded to the steps of their sidebar inputs, so scenarios differing
+    only below them share their results; the computations use the values as entered.
+    The other inputs (e.g. compute settings) are kept as they are.
+    """
+    name = STAGE_INPUT_NAMES.get(name, name)
+    if name in SCENARIO_INPUTS:
+        return quantize(value, INPUT_STEPS[input_id(name)])
+    return value
+
+def default_inputs():
+    """Inputs of the default scenario by name"""
+    return {name: DEFAULT_VALUES[input_id(name)] for name in SCENARIO_INPUTS}
+
+def plots_scenario(default_scenario, inputs):
+    """Scenario of the plots, as kept by the "plots-scenario" store.
+
+    The key rounds the inputs to the steps of their sidebar inputs (see `key_value`),
+    the inputs themselves are kept as entered.
+
+    Args:
+        default_scenario: whether it is the scenario shown at startup
+        inputs: inputs of the scenario by name (see SCENARIO_INPUTS)
+
+    Returns:
+        dict with the inputs and the key of the scenario
+    """
+    return dict(
+        default=default_scenario,
+        inputs=inputs,
+        key=scenario_key('plots', default_scenario, *(key_value(name, inputs[name]) for name in SCENARIO_INPUTS)),
+    )
+
+def with_progress(background):
+    """Adapt a callback taking `set_progress` first to the way it is registered.
+
+    Background callbacks with progress outputs receive `set_progress`, the others are
+    called without it and get None.
+    """
+    def decorator(func):
+        if background:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            return func(None, *args)
+        return wrapper
+    return decorator
+
+
+def register_callbacks(app):
+    # heavy callbacks run as background callbacks if the app has a manager (see
+    # `compute.background`), so the web workers stay free for the light ones
+    background = getattr(app, '_background_manager', None) is not None
+
+    def polar_progress(plot):
+        return dict(
+            background=True,
+            interval=500,
+            progress=Output(f"{plot}-progress", "children"),
+            progress_default="",
+        ) if background else {}
 
     @app.callback(
-        Output("breakouts-polar-plot", "src"),
+        Output("plots-scenario", "data"),
         Input("generate-plots-button", "n_clicks"),  # Callback triggered only by the button
-        State("pore-pressure-input", "value"),  # Read input values without triggering the callback
-        State("mud-pressure-input", "value"),
-        State("max-principal-stress-input", "value"),
-        State("intermediate-principal-stress-input", "value"),
-        State("min-principal-stress-input", "value"),
-        State("poisson-ratio-input", "value"),
-        State("inclination-angle-input", "value"),
-        State("azimuth-input", "value"),
-        State("friction-coefficient-input", "value"),
-        State("alpha-angle-input", "value"),
-        State("beta-angle-input", "value"),
-        State("gamma-angle-input", "value"),
+        State("plots-scenario", "data"),
+        # Read input values without triggering the callback
+        *[State(input_id(name), "value") for name in SCENARIO_INPUTS],
         prevent_initial_call=False,  # Allows the callback to execute at startup
-        running=[
-            (Output("generate-plots-button", "disabled"), True, False),
-        ],
     )
-    def generate_breakouts_polar_plot(
-        n_clicks, 
-        pore_pressure, 
-        mud_pressure, 
-        s1, 
-        s2, 
-        s3,
-        poisson_ratio, 
-        inclination_angle, 
-        azimuth, 
-        friction_coefficient, 
-        alpha_angle, 
-        beta_angle, 
-        gamma_angle
+    def submit_scenario(n_clicks, scenario, *values):
+        """Submit the scenario of the sidebar when the button is clicked, the default one at startup.
+
+        Only the plots of the active tab are computed (see `dispatch_plots`). At startup
+        the page may already show the precomputed default scenario (see
+        `iwst.routes.home.artifacts`), which is not submitted again.
+        """
+        if n_clicks is None:
+            if scenario is not None:
+                raise PreventUpdate
+            return plots_scenario(True, default_inputs())
+        return plots_scenario(False, dict(zip(SCENARIO_INPUTS, values)))
+
+    @app.callback(
+        Output("borehole-stress-request", "data"),
+        Output("breakouts-polar-request", "data"),
+        Output("tensile-fracture-polar-request", "data"),
+        Output("plots-prefetch", "data"),
+        Input("plots-scenario", "data"),
+        Input("tabs", "value"),
+        Input("borehole-stress-shown", "data"),
+        Input("breakouts-polar-shown", "data"),
+        Input("tensile-fracture-polar-shown", "data"),
+        State("plots-prefetch", "data"),
+    )
+    def dispatch_plots(
+        scenario,
+        active_tab,
+        borehole_stress_shown,
+        breakouts_polar_shown,
+        tensile_fracture_polar_shown,
+        prefetch
     ):
-        """Update the plot when the button is clicked or at startup.
+        """Request the plots of the active tab, then prefetch those of the hidden tabs.
+
+        The plots of a tab are requested when the tab is shown and does not show the
+        current scenario yet. Once it does, the plots of the hidden tabs are computed into
+        the result cache by `prefetch_hidden_plots`, so switching tab only takes them
+        from the cache.
         """
-        if n_clicks is None:  # If the button has never been pressed, use default values
-            image_base64 = generate_polar_plot_borehole(
-                pore_pressure, 
-                mud_pressure, 
-                s1, 
-                s2, 
-                s3,
-                poisson_ratio, 
-                friction_coefficient, 
-                alpha_angle, 
-                beta_angle, 
-                gamma_angle, 
-                specific_azimuth=azimuth, 
-                specific_inclination=inclination_angle
-            )
-        else:  # If the button has been pressed, generate graphs with new values
-            image_base64 = generate_polar_plot_borehole(
-                pore_pressure, 
-                mud_pressure, 
-                s1, 
-                s2, 
-                s3,
-                poisson_ratio, 
-                friction_coefficient, 
-                alpha_angle, 
-                beta_angle, 
-                gamma_angle, 
-                specific_azimuth=azimuth, 
-                specific_inclination=inclination_angle
-            )
-        return f"data:image/png;base64,{image_base64}"
+        if scenario is None:
+            raise PreventUpdate
+
+        key = scenario["key"]
+        shown = dict(zip(TAB_PLOTS.values(), (borehole_stress_shown, breakouts_polar_shown, tensile_fracture_polar_shown)))
+        requests = {plot: dash.no_update for plot in TAB_PLOTS.values()}
+        prefetch_request = dash.no_update
+        visible = TAB_PLOTS.get(active_tab, "borehole-stress")
+        if shown[visible] != key:
+            # a new scenario is notified, switching to a tab showing an older one is not
+            requests[visible] = dict(scenario, notify=dash.ctx.triggered_id == "plots-scenario")
+        else:
+            hidden = [plot for plot, shown_key in shown.items() if shown_key != key]
+            if hidden and (prefetch is None or prefetch["key"] != key):
+                prefetch_request = dict(scenario, plots=hidden)
+        return *requests.values(), prefetch_request
+
+    def busy_notification():
+        """Notification of a computation refused because the server is busy"""
+        return dmc.Notification(
+            title="Server busy",
+            message="Too many computations are running, please try again in a moment.",
+            color="red",
+            action="show",
+            autoClose=5000,
+        )
+
+    def notification(request):
+        """Notification of the plots of a request, none if not notified"""
+        if not request.get("notify"):
+            return dash.no_update
+        notification = dict(
+            title="Success",
+            message="Graphs generated correctly",
+            color="green",
+            action="show",
+        )
+        if not request["default"]:
+            notification['autoClose'] = 5000
+        return dmc.Notification(**notification)
 
     @app.callback(
-        Output("tensile-fracture-polar-plot", "src"),
-        Input("generate-plots-button", "n_clicks"),  # Callback triggered only by the button
-        State("pore-pressure-input", "value"),  # Read input values without triggering the callback
-        State("mud-pressure-input", "value"),
-        State("max-principal-stress-input", "value"),
-        State("intermediate-principal-stress-input", "value"),
-        State("min-principal-stress-input", "value"),
-        State("poisson-ratio-input", "value"),
-        State("inclination-angle-input", "value"),
-        State("azimuth-input", "value"),
-        State("friction-coefficient-input", "value"),
-        State("alpha-angle-input", "value"),
-        State("beta-angle-input", "value"),
-        State("gamma-angle-input", "value"),
-        State("tensile-strength-input", "value"),
-        prevent_initial_call=False,  # Allows the callback to execute at startup
+        Output("borehole-stress-plot", "figure"),
+        Output("mohr-coulomb-plot", "figure"),
+        Output("borehole-stress-shown", "data"),
+        Output("notifications-container", "children"),
+        Input("borehole-stress-request", "data"),
+        prevent_initial_call=True,
         running=[
             (Output("generate-plots-button", "disabled"), True, False),
         ],
     )
-    def generate_tensile_fracture_polar_plot(
-        n_clicks, 
-        pore_pressure, 
-        mud_pressure, 
-        s1, 
-        s2, 
-        s3,
-        poisson_ratio, 
-        inclination_angle, 
-        azimuth, 
-        friction_coefficient, 
-        alpha_angle, 
-        beta_angle, 
-        gamma_angle, 
-        tensile_strength
-    ):
-        """Update the plot when the button is clicked or at startup."""
-        if n_clicks is None:  # If the button has never been pressed, use default values
-            image_base64 = generate_polar_plot_tensile(
-                pore_pressure, mud_pressure, s1, s2, s3,
-                poisson_ratio, tensile_strength, alpha_angle, beta_angle, gamma_angle, specific_azimuth=azimuth, specific_inclination=inclination_angle
+    def generate_borehole_stress_and_mohr_coulomb_plots(request):
+        """Update the borehole stress and Mohr-Coulomb plots when the first tab requests them.
+
+        They are interactive computations of the scheduler, which never wait behind the
+        polar plots.
+        """
+        try:
+            fig_stress, fig_mohr_coulomb = get_scheduler().run(
+                'interactive', borehole_stress_plots, request["default"], request["inputs"]
             )
-        else:  # If the button has been pressed, generate graphs with new values
-            image_base64 = generate_polar_plot_tensile(
-                pore_pressure, mud_pressure, s1, s2, s3,
-                poisson_ratio, tensile_strength, alpha_angle, beta_angle, gamma_angle, specific_azimuth=azimuth, specific_inclination=inclination_angle
+        except SchedulerBusy:
+            return dash.no_update, dash.no_update, dash.no_update, busy_notification()
+        return fig_stress, fig_mohr_coulomb, request["key"], notification(request)
+
+    def register_polar_plot_callback(plot):
+        @app.callback(
+            Output(f"{plot}-plot", "src"),
+            Output(f"{plot}-figure", "figure"),
+            Output(f"{plot}-geometry", "data"),
+            Output(f"{plot}-shown", "data"),
+            Output("notifications-container", "children", allow_duplicate=True),
+            Input(f"{plot}-request", "data"),
+            State("request-session", "data"),
+            State("azimuth-input", "value"),
+            State("inclination-angle-input", "value"),
+            prevent_initial_call=True,
+            running=[
+                (Output("generate-plots-button", "disabled"), True, False),
+            ],
+            **polar_progress(plot),
+        )
+        @with_progress(background)
+        def generate_polar_plot(set_progress, request, request_session, azimuth, inclination_angle):
+            """Update a polar plot when its tab requests it.
+
+            With a background callback manager the plot is computed in a job of its own
+            and the progress is shown on the loading overlay. A newer request of the same
+            page (e.g. a double click) supersedes this one, which stops without updating.
+            The plot is a polar computation of the scheduler, which pauses between its
+            chunks while interactive ones are running. The well orientation is not an
+            input: its marker is placed on the page, and only drawn on the figures of the
+            plotly renderer when they are sent.
+            """
+            scheduler = get_scheduler()
+            superseded = get_request_tokens().superseded(request_session, plot)
+            try:
+                polar, geometry = scheduler.run(
+                    'polar',
+                    scenario_polar_plot,
+                    plot,
+                    request["inputs"],
+                    progress=set_progress,
+                    cancelled=scheduler.checked('polar', superseded),
+                )
+            except SchedulerBusy:
+                return dash.no_update, dash.no_update, dash.no_update, dash.no_update, busy_notification()
+            except ComputationCancelled:
+                raise PreventUpdate
+            return (
+                *polar_plot_outputs(polar, geometry, azimuth, inclination_angle),
+                request["key"],
+                notification(request),
             )
-        return f"data:image/png;base64,{image_base64}"
+
+    for plot in PLOT_ANALYSES:
+        register_polar_plot_callback(plot)
+
+    @app.callback(
+        Output("plots-prefetched", "data"),
+        Input("plots-prefetch", "data"),
+        State("request-session", "data"),
+        prevent_initial_call=True,
+        background=background,
+    )
+    def prefetch_hidden_plots(prefetch, request_session):
+        """Compute the plots of the hidden tabs into the result cache.
+
+        Requested once the active tab shows the scenario, so prefetching never delays
+        it; a newer scenario of the same page supersedes the prefetch, which stops at its
+        next chunk of orientations. Prefetches are batch computations of the scheduler,
+        which pause while the interactive and polar ones are running.
+        """
+        scheduler = get_scheduler()
+        cancelled = scheduler.checked('batch', get_request_tokens().superseded(request_session, 'prefetch'))
+
+        def prefetch_plots():
+            for plot in prefetch["plots"]:
+                if cancelled():
+                    raise ComputationCancelled('Prefetch superseded by a newer scenario.')
+                if plot == "borehole-stress":
+                    borehole_stress_plots(prefetch["default"], prefetch["inputs"])
+                else:
+                    scenario_polar_plot(plot, prefetch["inputs"], cancelled=cancelled)
+
+        try:
+            scheduler.run('batch', prefetch_plots)
+        except (SchedulerBusy, ComputationCancelled):
+            raise PreventUpdate
+        return prefetch["key"]
 
     @app.callback(
         Output("tensile-strength-input", "disabled"),  
@@ -748,85 +1183,39 @@ def register_callbacks(app):
             return True
         return False
 
+    # markers of the current well orientation follow the sidebar on top of the plots,
+    # or in the figures of the plotly renderer
+    for name in ("breakouts", "tensile-fracture"):
+        app.clientside_callback(
+            MARKER_POSITION_JS,
+            Output(f"{name}-polar-marker", "style"),
+            Input("azimuth-input", "value"),
+            Input("inclination-angle-input", "value"),
+            Input(f"{name}-polar-geometry", "data"),
+        )
+        app.clientside_callback(
+            MARKER_FIGURE_JS,
+            Output(f"{name}-polar-figure", "figure", allow_duplicate=True),
+            Input("azimuth-input", "value"),
+            Input("inclination-angle-input", "value"),
+            State(f"{name}-polar-figure", "figure"),
+            prevent_initial_call=True,
+        )
+
     @app.callback(
-        Output("borehole-stress-plot", "figure", allow_duplicate=True),
-        Output("mohr-coulomb-plot", "figure", allow_duplicate=True),
-        Output("breakouts-polar-plot", "src", allow_duplicate=True),
-        Output("tensile-fracture-polar-plot", "src", allow_duplicate=True),
+        Output("plots-scenario", "data", allow_duplicate=True),
         Input("project-data", "data"),  # Triggered when project data is loaded
         prevent_initial_call=True,
     )
     def update_graphs_from_project_data(data):
+        """Submit the scenario of a loaded project; the plots of the active tab are computed first."""
         if not data or "inputs" not in data:
             raise PreventUpdate
 
-        inputs = data["inputs"]
-        pore_pressure = inputs.get("pore_pressure", 0)
-        mud_pressure = inputs.get("mud_pressure", 0)
-        max_principal_stress = inputs.get("max_principal_stress", 0)
-        intermediate_principal_stress = inputs.get("intermediate_principal_stress", 0)
-        min_principal_stress = inputs.get("min_principal_stress", 0)
-        poisson_ratio = inputs.get("poisson_ratio", 0)
-        inclination_angle = inputs.get("inclination_angle", 0)
-        azimuth = inputs.get("azimuth", 0)
-        friction_coefficient = inputs.get("friction_coefficient", 0)
-        alpha_angle = inputs.get("alpha_angle", 0)
-        beta_angle = inputs.get("beta_angle", 0)
-        gamma_angle = inputs.get("gamma_angle", 0)
-        tensile_strength = inputs.get("tensile_strength", 0)
-
-        # Generate borehole stress and Mohr-Coulomb plots
-        fig_stress, fig_mohr_coulomb, _ = generate_borehole_stress_and_mohr_coulomb_plots(
-            None,  # Simulate no button click
-            pore_pressure,
-            mud_pressure,
-            max_principal_stress,
-            intermediate_principal_stress,
-            min_principal_stress,
-            poisson_ratio,
-            inclination_angle,
-            azimuth,
-            friction_coefficient,
-            alpha_angle,
-            beta_angle,
-            gamma_angle,
-        )
-
-        # Generate breakouts polar plot
-        image_base64_breakouts = generate_polar_plot_borehole(
-            pore_pressure,
-            mud_pressure,
-            max_principal_stress,
-            intermediate_principal_stress,
-            min_principal_stress,
-            poisson_ratio,
-            friction_coefficient,
-            alpha_angle,
-            beta_angle,
-            gamma_angle,
-            specific_azimuth=azimuth,
-            specific_inclination=inclination_angle,
-        )
-        breakouts_src = f"data:image/png;base64,{image_base64_breakouts}"
-
-        # Generate tensile fracture polar plot
-        image_base64_tensile = generate_polar_plot_tensile(
-            pore_pressure,
-            mud_pressure,
-            max_principal_stress,
-            intermediate_principal_stress,
-            min_principal_stress,
-            poisson_ratio,
-            tensile_strength,
-            alpha_angle,
-            beta_angle,
-            gamma_angle,
-            specific_azimuth=azimuth,
-            specific_inclination=inclination_angle,
-        )
-        tensile_src = f"data:image/png;base64,{image_base64_tensile}"
-
-        return fig_stress, fig_mohr_coulomb, breakouts_src, tensile_src
+        inputs = {name: data["inputs"].get(name, 0) for name in SCENARIO_INPUTS}
+        # the borehole stress and Mohr-Coulomb plots of a project are those of the
+        # default scenario, as if the button had not been clicked
+        return plots_scenario(True, inputs)
 
     @app.callback(
         Output("download-borehole-stress", "data"),
@@ -841,8 +1230,13 @@ def register_callbacks(app):
     def download_borehole_stress_plot(n_clicks, figure):
         if n_clicks is None:
             raise PreventUpdate
+        # exports are batch computations, after the plots on screen
+        try:
+            image_data = get_scheduler().run('batch', go.Figure(figure).to_image, format="png")
+        except SchedulerBusy:
+            return dash.no_update, busy_notification()
         return (
-            dcc.send_bytes(go.Figure(figure).to_image(format="png"), filename="borehole_stress_plot.png"),
+            dcc.send_bytes(image_data, filename="borehole_stress_plot.png"),
             dmc.Notification(
                 title="Success",
                 message="Plot downloaded successfully",
@@ -865,8 +1259,13 @@ def register_callbacks(app):
     def download_mohr_coulomb_plot(n_clicks, figure):
         if n_clicks is None:
             raise PreventUpdate
+        # exports are batch computations, after the plots on screen
+        try:
+            image_data = get_scheduler().run('batch', go.Figure(figure).to_image, format="png")
+        except SchedulerBusy:
+            return dash.no_update, busy_notification()
         return (
-            dcc.send_bytes(go.Figure(figure).to_image(format="png"), filename="mohr_coulomb_plot.png"),
+            dcc.send_bytes(image_data, filename="mohr_coulomb_plot.png"),
             dmc.Notification(
                 title="Success",
                 message="Plot downloaded successfully",
@@ -880,16 +1279,26 @@ def register_callbacks(app):
         Output("download-breakouts-polar", "data"),
         Output("notifications-container", "children", allow_duplicate=True),
         Input("download-breakouts-polar-button", "n_clicks"),
-        State("breakouts-polar-plot", "src"),
+        State("breakouts-polar-request", "data"),
+        State("azimuth-input", "value"),
+        State("inclination-angle-input", "value"),
+        State("download-breakouts-polar-resolution", "value"),
         prevent_initial_call=True,
         running=[
             (Output("download-breakouts-polar-button", "disabled"), True, False),
         ],
     )
-    def download_breakouts_polar_plot(n_clicks, src):
-        if n_clicks is None:
+    def download_breakouts_polar_plot(n_clicks, request, azimuth, inclination_angle, resolution):
+        if n_clicks is None or request is None:
             raise PreventUpdate
-        image_data = base64.b64decode(src.split(",")[1])
+        # exports are batch computations, after the plots on screen, of the
+        # scenario of the tab taken from the result cache (nothing is sent by the browser)
+        try:
+            image_data = get_scheduler().run(
+                'batch', polar_plot_download, "breakouts-polar", request["inputs"], azimuth, inclination_angle, resolution
+            )
+        except SchedulerBusy:
+            return dash.no_update, busy_notification()
         return (
             dcc.send_bytes(image_data, filename="breakouts_polar_plot.png"),
             dmc.Notification(
@@ -905,16 +1314,26 @@ def register_callbacks(app):
         Output("download-tensile-fracture-polar", "data"),
         Output("notifications-container", "children", allow_duplicate=True),
         Input("download-tensile-fracture-polar-button", "n_clicks"),
-        State("tensile-fracture-polar-plot", "src"),
+        State("tensile-fracture-polar-request", "data"),
+        State("azimuth-input", "value"),
+        State("inclination-angle-input", "value"),
+        State("download-tensile-fracture-polar-resolution", "value"),
         prevent_initial_call=True,
         running=[
             (Output("download-tensile-fracture-polar-button", "disabled"), True, False),
         ],
     )
-    def download_tensile_fracture_polar_plot(n_clicks, src):
-        if n_clicks is None:
+    def download_tensile_fracture_polar_plot(n_clicks, request, azimuth, inclination_angle, resolution):
+        if n_clicks is None or request is None:
             raise PreventUpdate
-        image_data = base64.b64decode(src.split(",")[1])
+        # exports are batch computations, after the plots on screen, of the
+        # scenario of the tab taken from the result cache (nothing is sent by the browser)
+        try:
+            image_data = get_scheduler().run(
+                'batch', polar_plot_download, "tensile-fracture-polar", request["inputs"], azimuth, inclination_angle, resolution
+            )
+        except SchedulerBusy:
+            return dash.no_update, busy_notification()
         return (
             dcc.send_bytes(image_data, filename="tensile_fracture_polar_plot.png"),
             dmc.Notification(
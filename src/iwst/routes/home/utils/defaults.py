@@ -12,4 +12,20 @@ DEFAULT_VALUES = {
     "beta-angle-input": 90.0,
     "gamma-angle-input": 0.0,
     "tensile-strength-input": 0.0,
-}
\ No newline at end of file
+}
+# steps of the sidebar inputs, the precision of the inputs of a scenario
+INPUT_STEPS = {
+    "pore-pressure-input": 0.1,
+    "mud-pressure-input": 0.1,
+    "max-principal-stress-input": 0.1,
+    "intermediate-principal-stress-input": 0.1,
+    "min-principal-stress-input": 0.1,
+    "poisson-ratio-input": 0.01,
+    "azimuth-input": 1,
+    "inclination-angle-input": 1,
+    "friction-coefficient-input": 0.01,
+    "alpha-angle-input": 1,
+    "beta-angle-input": 1,
+    "gamma-angle-input": 1,
+    "tensile-strength-input": 0.1,
+}
@@ -0,0 +1,99 @@
+import numpy as np
+import plotly.graph_objects as go
+
+from typing import Any, Dict
+from iwst.core.polar import AZIMUTH_STEP, INCLINATION_STEP, PolarFields
+from iwst.routes.home.utils.polar_marker import MARKER_LABEL, MARKER_SIZE
+
+
+def polar_figure(fields: PolarFields, values: np.ndarray, label: str, reversescale: bool = False) -> Dict[str, Any]:
+    """Plotly figure of a field of the polar grid, rendered by the browser.
+
+    Every orientation of the grid is a cell of a polar bar trace, colored by its value,
+    so the server rasterizes nothing and the page shows the value of a cell on hover.
+    The arrays are small integers and float32, sent to the browser as typed arrays.
+    The last trace is the current well orientation marker (see `with_marker`).
+
+    Args:
+        fields: polar fields of the scenario
+        values: field of the plot on the grid of fields
+        label: name and unit of the field
+        reversescale: whether the colorscale is reversed
+
+    Returns:
+        figure as plotly dict
+
+    """
+    # the last azimuth of the grid is the first one again
+    azimuth = np.rad2deg(fields.azimuth_mesh[:, :-1])
+    inclination = np.rad2deg(fields.inclination_mesh[:, :-1])
+    # cells centered on the orientations, within 0 and 90 degrees of inclination
+    base = np.clip(inclination - INCLINATION_STEP / 2, 0, 90)
+    top = np.clip(inclination + INCLINATION_STEP / 2, 0, 90)
+    fig = go.Figure()
+    fig.add_trace(go.Barpolar(
+        theta=np.rint(azimuth).astype(np.uint16).ravel(),
+        base=np.rint(base).astype(int).ravel().tolist(),
+        r=np.rint(top - base).astype(np.uint8).ravel(),
+        width=AZIMUTH_STEP,
+        customdata=np.rint(inclination).astype(np.uint8).ravel(),
+        marker=dict(
+            color=values[:, :-1].astype(np.float32).ravel(),
+            colorscale='Jet',
+            reversescale=reversescale,
+            colorbar=dict(title=dict(text=label, side='right'), tickformat='.0f', len=0.75),
+            line=dict(width=0),
+        ),
+        hovertemplate=(
+            'Azimuth: %{theta}°<br>Inclination: %{customdata}°<br>'
+            f'{label}: %{{marker.color:.1f}}<extra></extra>'
+        ),
+        showlegend=False,
+    ))
+    fig.add_trace(go.Scatterpolar(
+        r=[],
+        theta=[],
+        mode='markers',
+        name=MARKER_LABEL,
+        marker=dict(color='white', size=MARKER_SIZE + 4, line=dict(color='black', width=1)),
+        hoverinfo='skip',
+    ))
+    fig.update_layout(
+        polar=dict(
+            bargap=0,
+            angularaxis=dict(rotation=90, direction='clockwise'),
+            radialaxis=dict(range=[0, 90], tickvals=[0, 30, 60, 90]),
+        ),
+        legend=dict(x=1, y=1.1, xanchor='right'),
+        margin=dict(l=40, r=40, t=60, b=40),
+        template='plotly_white',
+    )
+    return fig.to_plotly_json()
+
+def with_marker(figure: Dict[str, Any], azimuth, inclination) -> Dict[str, Any]:
+    """Copy of a polar figure with the marker of a well orientation (none if not given)
+
+    The page moves the marker in the same way (see `MARKER_FIGURE_JS`), the field is
+    not copied.
+    """
+    marker = dict(figure['data'][-1])
+    valid = isinstance(azimuth, (int, float)) and isinstance(inclination, (int, float))
+    marker['r'] = [inclination] if valid else []
+    marker['theta'] = [azimuth] if valid else []
+    return dict(figure, data=[*figure['data'][:-1], marker])
+
+# clientside callback moving the marker of a polar figure: (azimuth, inclination, figure) -> figure
+MARKER_FIGURE_JS = """
+function(azimuth, inclination, figure) {
+    if (!figure || !figure.data) {
+        return window.dash_clientside.no_update;
+    }
+    const data = figure.data.slice();
+    const marker = Object.assign({}, data[data.length - 1]);
+    const valid = typeof azimuth === "number" && typeof inclination === "number";
+    marker.r = valid ? [inclination] : [];
+    marker.theta = valid ? [azimuth] : [];
+    data[data.length - 1] = marker;
+    return Object.assign({}, figure, {data: data});
+}
+"""
@@ -0,0 +1,118 @@
+import numpy as np
+import json
+
+from io import BytesIO
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.image import imread
+from matplotlib.lines import Line2D
+from typing import Dict, Tuple
+
+# size of the figures of the polar plots (inches) and their dots per inch
+POLAR_FIGSIZE = (6.4, 4.8)
+POLAR_DPI = 120
+
+# dots per inch of the polar plots downloaded for print
+PRINT_DPI = 300
+
+# style of the current well orientation marker, in the plots and in the overlay
+MARKER_LABEL = 'Current well orientation'
+MARKER_SIZE = 8  # points
+MARKER_STYLE = dict(marker='o', color='w', markersize=MARKER_SIZE, markeredgecolor='k', linestyle='')
+OVERLAY_STYLE = {
+    "position": "absolute",
+    "width": "12px",
+    "height": "12px",
+    "borderRadius": "50%",
+    "backgroundColor": "white",
+    "border": "1px solid black",
+    "transform": "translate(-50%, -50%)",
+    "pointerEvents": "none",
+}
+
+
+def add_marker_legend(ax):
+    """Legend of the marker, drawn whether the marker is in the plot or in an overlay"""
+    handle = Line2D([], [], label=MARKER_LABEL, **MARKER_STYLE)
+    ax.legend(handles=[handle], loc='upper right', bbox_to_anchor=(1.5, 1.1), frameon=False)
+
+def marker_geometry(fig, ax) -> Dict[str, float]:
+    """Position of a polar axes (north up, clockwise, r up to 90) in the image of its figure
+
+    Args:
+        fig: figure of the axes, after its layout
+        ax: polar axes
+
+    Returns:
+        center ('x', 'y') and radius ('rx', 'ry') of the axes as fractions of the width and
+        height of the image, from the top left corner
+
+    """
+    width, height = fig.canvas.get_width_height()
+    center_x, center_y = ax.transData.transform((0, 0))
+    edge_x, edge_y = ax.transData.transform((0, 90))
+    radius = float(np.hypot(edge_x - center_x, edge_y - center_y))
+    return dict(
+        x=float(center_x) / width,
+        y=1 - float(center_y) / height,
+        rx=radius / width,
+        ry=radius / height,
+    )
+
+def marker_position(geometry: Dict[str, float], azimuth: float, inclination: float) -> Tuple[float, float]:
+    """Position of a well orientation as fractions of the width and height of the image
+
+    The overlay of the page computes the same position (see `MARKER_POSITION_JS`).
+    """
+    azimuth = np.radians(azimuth)
+    scale = inclination / 90
+    return (
+        geometry['x'] + scale * geometry['rx'] * np.sin(azimuth),
+        geometry['y'] - scale * geometry['ry'] * np.cos(azimuth),
+    )
+
+def composite_marker(image: bytes, geometry: Dict[str, float], azimuth: float, inclination: float) -> bytes:
+    """Draw the marker of a well orientation on a rendered polar plot.
+
+    The field of the plot is not rendered again, the PNG is only composited with the marker.
+
+    Args:
+        image: PNG of the polar plot without marker
+        geometry: position of its polar axes (see `marker_geometry`)
+        azimuth: azimuth of the well (degrees)
+        inclination: inclination of the well (degrees)
+
+    Returns:
+        PNG of the polar plot with the marker
+
+    """
+    pixels = imread(BytesIO(image), format='png')
+    height, width = pixels.shape[:2]
+    # figure of its own, not of pyplot, so threads composite concurrently
+    fig = Figure(figsize=(width / POLAR_DPI, height / POLAR_DPI), dpi=POLAR_DPI)
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.imshow(pixels, extent=(0, 1, 1, 0), aspect='auto', interpolation='none')
+    ax.plot(*marker_position(geometry, azimuth, inclination), **MARKER_STYLE)
+    ax.set_xlim(0, 1)
+    ax.set_ylim(1, 0)
+    ax.set_axis_off()
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', dpi=POLAR_DPI)
+    return buffer.getvalue()
+
+# clientside callback placing the overlay marker: (azimuth, inclination, geometry) -> style
+MARKER_POSITION_JS = """
+function(azimuth, inclination, geometry) {
+    const style = Object.assign({}, %s);
+    if (!geometry || typeof azimuth !== "number" || typeof inclination !== "number") {
+        style.display = "none";
+        return style;
+    }
+    const angle = azimuth * Math.PI / 180;
+    const scale = inclination / 90;
+    style.left = (100 * (geometry.x + scale * geometry.rx * Math.sin(angle))) + "%%";
+    style.top = (100 * (geometry.y - scale * geometry.ry * Math.cos(angle))) + "%%";
+    return style;
+}
+""" % json.dumps(OVERLAY_STYLE)
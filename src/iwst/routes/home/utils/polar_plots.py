@@ -0,0 +1,82 @@
+import numpy as np
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+from iwst.core.polar import PolarFields
+from iwst.routes.home.utils.polar_template import render_polar_field
+from iwst.routes.home.utils.polar_figure import polar_figure
+from iwst.routes.home.utils.polar_raster import raster_plot
+
+
+@dataclass(frozen=True)
+class PolarPlot:
+    """Field of the polar fields shown by the plot of an analysis.
+
+    Args:
+        field: name of the field in PolarFields
+        label: name and unit of the field, the label of the colorbar
+        reverse: whether the jet colormap is reversed
+
+    """
+    field: str
+    label: str
+    reverse: bool = False
+
+    def values(self, fields: PolarFields) -> np.ndarray:
+        """Field of the plot on the grid of fields"""
+        return getattr(fields, self.field)
+
+
+# polar plot of every analysis
+POLAR_PLOTS = {
+    'breakouts': PolarPlot('ucs', "Required UCS [MPa]"),
+    'tensile': PolarPlot('mud_pressure_required', "Mud Pressure Required for Tensile Failure [MPa]", reverse=True),
+}
+
+
+def render_background(analysis: str, fields: PolarFields) -> Tuple[str, Dict[str, float]]:
+    """Render the field of the plot without the current well orientation marker.
+
+    The marker is drawn on an overlay of the page (see polar_marker), so a new well
+    orientation does not render the field again.
+
+    Returns:
+        A base64-encoded string of the plot and the position of its polar axes in the image.
+
+    """
+    return render_polar_plot(analysis, fields, None)
+
+def render_figure(analysis: str, fields: PolarFields) -> Dict[str, Any]:
+    """Plotly figure of the field of the plot, rendered by the browser (see polar_figure).
+
+    Returns:
+        The figure as plotly dict, with the marker trace empty.
+
+    """
+    plot = POLAR_PLOTS[analysis]
+    return polar_figure(fields, plot.values(fields), plot.label, reversescale=plot.reverse)
+
+def render_raster(analysis: str, fields: PolarFields) -> Tuple[str, Dict[str, float]]:
+    """Render the field of the plot without matplotlib (see polar_raster), without the marker.
+
+    Returns:
+        A base64-encoded string of the plot and the position of its polar axes in the image.
+
+    """
+    plot = POLAR_PLOTS[analysis]
+    return raster_plot(plot.values(fields), plot.label, reverse=plot.reverse)
+
+def render_polar_plot(
+    analysis: str,
+    fields: PolarFields,
+    marker: Optional[Tuple[float, float]],
+    dpi: Optional[float] = None
+) -> Tuple[str, Dict[str, float]]:
+    """Render the plot, with the marker of a well orientation (azimuth, inclination) if given.
+
+    The plot is rendered by the figure template of this thread (see polar_template),
+    at `dpi` dots per inch if given.
+    """
+    plot = POLAR_PLOTS[analysis]
+    cmap = 'jet_r' if plot.reverse else 'jet'
+    return render_polar_field(fields, plot.values(fields), plot.label, cmap, marker, dpi)
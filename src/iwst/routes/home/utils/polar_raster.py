@@ -0,0 +1,264 @@
+import numpy as np
+import base64
+import functools
+
+from io import BytesIO
+from typing import Dict, Optional, Tuple
+from PIL import Image, ImageDraw, ImageFont
+from iwst.core.polar import AZIMUTH_STEP, INCLINATION_STEP
+from iwst.routes.home.utils.polar_marker import MARKER_LABEL, MARKER_SIZE, POLAR_DPI, POLAR_FIGSIZE
+
+
+def points(length: float) -> float:
+    """Pixels of a length in points in the images"""
+    return length * POLAR_DPI / 72
+
+
+# size of the images, as the matplotlib figures of the polar plots
+RASTER_WIDTH = round(POLAR_FIGSIZE[0] * POLAR_DPI)
+RASTER_HEIGHT = round(POLAR_FIGSIZE[1] * POLAR_DPI)
+
+# layout of the matplotlib figures of POLAR_FIGSIZE (see polar_template), as fractions of
+# their width and height from the top left corner: it does not depend on the dots per inch
+POLAR_AXES = (0.3848, 0.5014, 0.4048)  # center x, center y, radius (fraction of the height)
+COLORBAR_AXES = (0.8185, 0.1747, 0.8430, 0.8282)  # left, top, right, bottom
+COLORBAR_LABEL_X = 0.9210
+LEGEND_POSITION = (0.6712, 0.0564)  # marker of the legend
+
+# layout of the images (pixels from the top left corner)
+POLAR_CENTER = (POLAR_AXES[0] * RASTER_WIDTH, POLAR_AXES[1] * RASTER_HEIGHT)
+POLAR_RADIUS = POLAR_AXES[2] * RASTER_HEIGHT
+COLORBAR_BOX = tuple(
+    round(fraction * size)
+    for fraction, size in zip(COLORBAR_AXES, (RASTER_WIDTH, RASTER_HEIGHT) * 2)
+)
+
+# padding of the labels (points): angles, inclinations and legend text from their anchor,
+# colorbar ticks and their values
+ANGLE_PAD = 12
+INCLINATION_PAD = 7
+LEGEND_PAD = 18
+TICK_LENGTH = 2.5
+TICK_PAD = 4
+
+# filled contour levels of the field, as the matplotlib figures
+LEVELS = 100
+
+# PNG compression, low levels favour the encoding time over the size
+PNG_COMPRESS_LEVEL = 3
+
+FONT_SIZE = round(points(10))
+GRID_COLOR = (176, 176, 176)
+MARKER_RADIUS = round(points(MARKER_SIZE) / 2)
+
+# piecewise linear segments of the jet colormap (as in matplotlib): (x, value)
+JET_SEGMENTS = {
+    'red': ((0.0, 0.0), (0.35, 0.0), (0.66, 1.0), (0.89, 1.0), (1.0, 0.5)),
+    'green': ((0.0, 0.0), (0.125, 0.0), (0.375, 1.0), (0.64, 1.0), (0.91, 0.0), (1.0, 0.0)),
+    'blue': ((0.0, 0.5), (0.11, 1.0), (0.34, 1.0), (0.65, 0.0), (1.0, 0.0)),
+}
+
+
+def font() -> ImageFont.ImageFont:
+    """Font of the labels of the images"""
+    return ImageFont.load_default(size=FONT_SIZE)
+
+@functools.lru_cache(maxsize=None)
+def colormap(reverse: bool = False) -> np.ndarray:
+    """Lookup table of the jet colormap (jet_r if reversed): RGB of every level"""
+    x = (np.arange(LEVELS) + 0.5) / LEVELS
+    if reverse:
+        x = 1 - x
+    channels = [np.interp(x, *zip(*JET_SEGMENTS[name])) for name in ('red', 'green', 'blue')]
+    return np.rint(255 * np.stack(channels, axis=-1)).astype(np.uint8)
+
+@functools.lru_cache(maxsize=None)
+def index_map(shape: Tuple[int, int]) -> Tuple[np.ndarray, ...]:
+    """Pixels of the polar axes and where they read the field of the polar grid.
+
+    Computed once per grid: rendering a field is then a gather of the four orientations
+    around every pixel, interpolated bilinearly as the filled contours of matplotlib.
+
+    Args:
+        shape: shape of the polar grid (inclinations, azimuths), the last azimuth being
+            the first one again
+
+    Returns:
+        flat indices of the pixels in the image, flat indices of the four orientations
+        around them in the grid (4, pixels) and their weights (4, pixels)
+
+    """
+    rows, columns = np.mgrid[0:RASTER_HEIGHT, 0:RASTER_WIDTH]
+    dx = columns + 0.5 - POLAR_CENTER[0]
+    dy = POLAR_CENTER[1] - (rows + 0.5)
+    distance = np.hypot(dx, dy)
+    inside = distance <= POLAR_RADIUS
+    # north up, azimuth clockwise, inclination from the center to the edge
+    inclination = distance[inside] / POLAR_RADIUS * 90 / INCLINATION_STEP
+    azimuth = np.degrees(np.arctan2(dx[inside], dy[inside])) % 360 / AZIMUTH_STEP
+    i0 = np.minimum(np.floor(inclination).astype(np.int32), shape[0] - 2)
+    j0 = np.minimum(np.floor(azimuth).astype(np.int32), shape[1] - 2)
+    wi = inclination - i0
+    wj = azimuth - j0
+    corners = np.stack([
+        i0 * shape[1] + j0,
+        i0 * shape[1] + j0 + 1,
+        (i0 + 1) * shape[1] + j0,
+        (i0 + 1) * shape[1] + j0 + 1,
+    ])
+    weights = np.stack([(1 - wi) * (1 - wj), (1 - wi) * wj, wi * (1 - wj), wi * wj])
+    return np.flatnonzero(inside), corners, weights
+
+@functools.lru_cache(maxsize=None)
+def template(label: str, reverse: bool) -> Tuple[np.ndarray, Tuple[Tuple[np.ndarray, np.ndarray, np.ndarray], ...]]:
+    """Parts of the images that do not depend on the field, drawn once.
+
+    Returns:
+        RGB image with the decorations around the polar axes (angles, legend, colorbar)
+        and the layers drawn on top of the field (grid, edge, radial ticks), each as
+        flat indices of its pixels, their opacity and its color
+
+    """
+    image = Image.new('RGB', (RASTER_WIDTH, RASTER_HEIGHT), 'white')
+    draw = ImageDraw.Draw(image)
+    cx, cy = POLAR_CENTER
+    for angle in range(0, 360, 45):
+        x = cx + (POLAR_RADIUS + points(ANGLE_PAD)) * np.sin(np.radians(angle))
+        y = cy - (POLAR_RADIUS + points(ANGLE_PAD)) * np.cos(np.radians(angle))
+        draw.text((x, y), f'{angle}°', fill='black', font=font(), anchor='mm')
+    # legend of the marker
+    lx, ly = LEGEND_POSITION[0] * RASTER_WIDTH, LEGEND_POSITION[1] * RASTER_HEIGHT
+    draw.ellipse((lx - MARKER_RADIUS, ly - MARKER_RADIUS, lx + MARKER_RADIUS, ly + MARKER_RADIUS), fill='white', outline='black')
+    draw.text((lx + points(LEGEND_PAD), ly), MARKER_LABEL, fill='black', font=font(), anchor='lm')
+    # colorbar, one band per level
+    left, top, right, bottom = COLORBAR_BOX
+    levels = (bottom - np.arange(top, bottom) - 0.5) / (bottom - top) * LEVELS
+    pixels = np.asarray(image).copy()
+    pixels[top:bottom, left:right] = colormap(reverse)[np.clip(levels.astype(int), 0, LEVELS - 1)][:, np.newaxis]
+    image = Image.fromarray(pixels)
+    draw = ImageDraw.Draw(image)
+    draw.rectangle(COLORBAR_BOX, outline='black')
+    text = Image.new('L', (bottom - top, 2 * FONT_SIZE), 0)
+    ImageDraw.Draw(text).text(((bottom - top) / 2, FONT_SIZE), label, fill=255, font=font(), anchor='mm')
+    text = text.rotate(90, expand=True)
+    image.paste((0, 0, 0), (round(COLORBAR_LABEL_X * RASTER_WIDTH) - FONT_SIZE, top), text)
+
+    # layers on top of the field, antialiased by drawing them at 4 times the size
+    def layer(paint):
+        mask = Image.new('L', (4 * RASTER_WIDTH, 4 * RASTER_HEIGHT), 0)
+        paint(ImageDraw.Draw(mask), 4)
+        alpha = np.asarray(mask.resize((RASTER_WIDTH, RASTER_HEIGHT), Image.Resampling.BOX)).ravel()
+        return np.flatnonzero(alpha), alpha[alpha > 0].astype(np.float32)[:, np.newaxis] / 255
+
+    def grid(draw, scale):
+        for inclination in (30, 60):
+            radius = scale * POLAR_RADIUS * inclination / 90
+            draw.ellipse((scale * cx - radius, scale * cy - radius, scale * cx + radius, scale * cy + radius), outline=255, width=scale)
+        for angle in range(0, 360, 45):
+            x = cx + POLAR_RADIUS * np.sin(np.radians(angle))
+            y = cy - POLAR_RADIUS * np.cos(np.radians(angle))
+            draw.line((scale * cx, scale * cy, scale * x, scale * y), fill=255, width=scale)
+
+    def edge(draw, scale):
+        radius = scale * POLAR_RADIUS
+        draw.ellipse((scale * cx - radius, scale * cy - radius, scale * cx + radius, scale * cy + radius), outline=255, width=scale)
+        tick_font = ImageFont.load_default(size=scale * FONT_SIZE)
+        for inclination in (30, 60, 90):
+            radius = POLAR_RADIUS * inclination / 90 + points(INCLINATION_PAD)
+            x = cx + radius * np.sin(np.radians(22.5))
+            y = cy - radius * np.cos(np.radians(22.5))
+            draw.text((scale * x, scale * y), str(inclination), fill=255, font=tick_font, anchor='mm')
+
+    layers = (
+        (*layer(grid), np.array(GRID_COLOR, dtype=np.float32)),
+        (*layer(edge), np.zeros(3, dtype=np.float32)),
+    )
+    return np.asarray(image), layers
+
+def colorbar_ticks(vmin: float, vmax: float) -> np.ndarray:
+    """Round values of the colorbar, about 8 of them between vmin and vmax"""
+    span = vmax - vmin
+    if not span > 0:
+        return np.array([vmin])
+    raw = span / 8
+    magnitude = 10 ** np.floor(np.log10(raw))
+    step = next(s * magnitude for s in (1, 2, 2.5, 4, 5, 10) if s * magnitude >= raw)
+    return np.arange(np.ceil(vmin / step) * step, vmax + step / 1000, step)
+
+def draw_marker(image: Image.Image, geometry: Dict[str, float], azimuth: float, inclination: float):
+    """Draw the marker of a well orientation on an image, at the position of its polar axes"""
+    draw = ImageDraw.Draw(image)
+    azimuth = np.radians(azimuth)
+    scale = inclination / 90
+    width, height = image.size
+    x = (geometry['x'] + scale * geometry['rx'] * np.sin(azimuth)) * width
+    y = (geometry['y'] - scale * geometry['ry'] * np.cos(azimuth)) * height
+    draw.ellipse((x - MARKER_RADIUS, y - MARKER_RADIUS, x + MARKER_RADIUS, y + MARKER_RADIUS), fill='white', outline='black')
+
+def raster_geometry() -> Dict[str, float]:
+    """Position of the polar axes in the images (see polar_marker.marker_geometry)"""
+    return dict(
+        x=POLAR_CENTER[0] / RASTER_WIDTH,
+        y=POLAR_CENTER[1] / RASTER_HEIGHT,
+        rx=POLAR_RADIUS / RASTER_WIDTH,
+        ry=POLAR_RADIUS / RASTER_HEIGHT,
+    )
+
+def raster_plot(
+    values: np.ndarray,
+    label: str,
+    reverse: bool = False,
+    marker: Optional[Tuple[float, float]] = None
+) -> Tuple[str, Dict[str, float]]:
+    """Render a field of the polar grid to a PNG without matplotlib.
+
+    The image looks like the matplotlib figures of the polar plots (filled contours of
+    100 levels, grid, colorbar and legend of the marker), but the field is mapped to the
+    pixels by a cached index map and a colormap lookup table: a render is a gather, a few
+    labels of the colorbar and the PNG encoding.
+
+    Args:
+        values: field of the plot on the polar grid (see `index_map`)
+        label: name and unit of the field, for the colorbar
+        reverse: whether the colormap is jet_r instead of jet
+        marker: well orientation (azimuth, inclination) drawn on the plot, if given
+
+    Returns:
+        A base64-encoded string of the plot and the position of its polar axes in the image.
+
+    """
+    pixels, corners, weights = index_map(values.shape)
+    background, layers = template(label, reverse)
+    field = np.asarray(values, dtype=np.float32).ravel()
+    finite = np.isfinite(field)
+    vmin, vmax = (float(field[finite].min()), float(field[finite].max())) if finite.any() else (0.0, 0.0)
+    span = vmax - vmin if vmax > vmin else 1.0
+    interpolated = np.einsum('ij,ij->j', np.take(field, corners), weights)
+    levels = np.clip(((interpolated - vmin) / span * LEVELS).astype(np.int32), 0, LEVELS - 1)
+    image = background.reshape(-1, 3).copy()
+    image[pixels] = np.where(np.isfinite(interpolated)[:, np.newaxis], colormap(reverse)[levels], 255)
+    for indices, alpha, color in layers:
+        image[indices] = np.rint(image[indices] * (1 - alpha) + color * alpha).astype(np.uint8)
+    image = Image.fromarray(image.reshape(RASTER_HEIGHT, RASTER_WIDTH, 3))
+
+    draw = ImageDraw.Draw(image)
+    left, top, right, bottom = COLORBAR_BOX
+    for tick in colorbar_ticks(vmin, vmax):
+        y = bottom - (tick - vmin) / span * (bottom - top)
+        draw.line((right, y, right + points(TICK_LENGTH), y), fill='black')
+        draw.text((right + points(TICK_LENGTH + TICK_PAD), y), f'{tick:.0f}', fill='black', font=font(), anchor='lm')
+    geometry = raster_geometry()
+    if marker is not None:
+        draw_marker(image, geometry, *marker)
+
+    buffer = BytesIO()
+    image.save(buffer, format='png', compress_level=PNG_COMPRESS_LEVEL)
+    return base64.b64encode(buffer.getvalue()).decode('utf-8'), geometry
+
+def composite_raster_marker(image: bytes, geometry: Dict[str, float], azimuth: float, inclination: float) -> bytes:
+    """Draw the marker of a well orientation on a rendered polar plot (see polar_marker.composite_marker)."""
+    image = Image.open(BytesIO(image)).convert('RGB')
+    draw_marker(image, geometry, azimuth, inclination)
+    buffer = BytesIO()
+    image.save(buffer, format='png', compress_level=PNG_COMPRESS_LEVEL)
+    return buffer.getvalue()
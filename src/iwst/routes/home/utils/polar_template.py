@@ -0,0 +1,119 @@
+import numpy as np
+import base64
+import threading
+
+from io import BytesIO
+from typing import Dict, Optional, Tuple
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from iwst.core.polar import PolarFields
+from iwst.routes.home.utils.polar_marker import POLAR_DPI, POLAR_FIGSIZE, MARKER_STYLE, add_marker_legend, marker_geometry
+
+# filled contour levels of the polar plots
+LEVELS = 100
+
+# templates of the polar plots of every thread, by label and colormap
+_templates = threading.local()
+
+
+class PolarTemplate:
+    """Figure of a polar plot built once, whose field is swapped at every render.
+
+    The figure uses the object-oriented API of matplotlib with an Agg canvas of its own,
+    not the global state of pyplot, so threads render their own templates concurrently.
+    The axes, the ticks and the legend are set up once, and the layout of the figure and
+    of its colorbar by the first render: the next ones only replace the filled contours
+    and the colorbar.
+
+    Args:
+        label: label of the colorbar
+        cmap: colormap of the field
+
+    """
+    def __init__(self, label: str, cmap: str):
+        self.label = label
+        self.cmap = cmap
+        self.figure = Figure(figsize=POLAR_FIGSIZE, dpi=POLAR_DPI)
+        FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot(projection='polar')
+        self.ax.set_rlim(0, 90)
+        self.ax.set_rticks([0, 30, 60, 90])
+        self.ax.set_autoscale_on(False)
+        self.ax.set_theta_zero_location("N")
+        self.ax.set_theta_direction(-1)
+        self.marker, = self.ax.plot([], [], **MARKER_STYLE)
+        add_marker_legend(self.ax)
+        self.contour = None
+        self.colorbar = None
+
+    def render(
+        self,
+        fields: PolarFields,
+        values: np.ndarray,
+        marker: Optional[Tuple[float, float]],
+        dpi: Optional[float] = None
+    ) -> Tuple[str, Dict[str, float]]:
+        """Render a field, with the marker of a well orientation (azimuth, inclination) if given.
+
+        The image is saved at `dpi` dots per inch if given (e.g. for print), at POLAR_DPI
+        otherwise: the layout is the same, the position of the polar axes too.
+
+        Returns:
+            A base64-encoded string of the plot and the position of its polar axes in the image.
+
+        """
+        if self.contour is not None:
+            self.contour.remove()
+        self.contour = self.ax.contourf(
+            fields.azimuth_mesh, np.rad2deg(fields.inclination_mesh), values, LEVELS, cmap=self.cmap
+        )
+        if self.colorbar is None:
+            self.colorbar = self.figure.colorbar(self.contour, ax=self.ax, pad=0.15, shrink=0.75, format='%.0f')
+            self.colorbar.set_label(self.label)
+            self.figure.tight_layout()
+        else:
+            # a colorbar takes the levels of its contours when it is created: a new one
+            # is drawn in the axes of the previous one, so the layout is kept
+            cax = self.colorbar.ax
+            cax.clear()
+            self.colorbar = self.figure.colorbar(self.contour, cax=cax, format='%.0f')
+            self.colorbar.set_label(self.label)
+        if marker is not None:
+            specific_azimuth, specific_inclination = marker
+            self.marker.set_data([np.radians(specific_azimuth)], [specific_inclination])
+        self.marker.set_visible(marker is not None)
+        buffer = BytesIO()
+        self.figure.savefig(buffer, format='png', dpi=dpi or POLAR_DPI)
+        image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
+        return image_base64, marker_geometry(self.figure, self.ax)
+
+
+def render_polar_field(
+    fields: PolarFields,
+    values: np.ndarray,
+    label: str,
+    cmap: str,
+    marker: Optional[Tuple[float, float]] = None,
+    dpi: Optional[float] = None
+) -> Tuple[str, Dict[str, float]]:
+    """Render a field of the polar grid with the template of this thread (see `PolarTemplate`).
+
+    Args:
+        fields: polar fields of the scenario
+        values: field of the plot on the grid of fields
+        label: label of the colorbar
+        cmap: colormap of the field
+        marker: well orientation (azimuth, inclination) drawn on the plot, if given
+        dpi: dots per inch of the image, POLAR_DPI if not given
+
+    Returns:
+        A base64-encoded string of the plot and the position of its polar axes in the image.
+
+    """
+    templates = getattr(_templates, 'templates', None)
+    if templates is None:
+        templates = _templates.templates = {}
+    template = templates.get((label, cmap))
+    if template is None:
+        template = templates[label, cmap] = PolarTemplate(label, cmap)
+    return template.render(fields, values, marker, dpi)
@@ -0,0 +1,111 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from iwst.core.polar import ComputationCancelled, calculate_polar_fields, orientation_grid
+from iwst.core.stress import (
+    calculate_rotation_matrix,
+    calculate_rotation_matrix_azimuth_inclination,
+    calculate_stress_matrix,
+)
+from iwst.core.wall import calculate_tangential_stress
+from iwst.utils.cache import DiskCache, LRUCache
+
+# pore pressure, mud pressure, s1, s2, s3, Poisson's ratio, friction coefficient,
+# tensile strength and Euler angles of the scenario
+SCENARIO = (20.0, 25.0, 90.0, 60.0, 40.0, 0.25, 0.6, 5.0, 30.0, 70.0, 10.0)
+
+# wall angles of the loop [deg]
+THETA = np.arange(0, 180, 0.1)
+
+
+def loop_polar_fields(
+    pore_pressure, mud_pressure, s1, s2, s3, poisson_ratio, friction_coefficient,
+    tensile_strength, alpha_angle, beta_angle, gamma_angle
+):
+    """Required UCS and mud pressure of tensile failure, one orientation at a time"""
+    azimuth_mesh, inclination_mesh = orientation_grid()
+    stress_matrix = calculate_stress_matrix(s1 - pore_pressure, s2 - pore_pressure, s3 - pore_pressure)
+    rotation_matrix = calculate_rotation_matrix(alpha_angle, beta_angle, gamma_angle)
+    ucs = np.zeros(azimuth_mesh.shape)
+    mud_pressure_required = np.zeros(azimuth_mesh.shape)
+    for index in np.ndindex(azimuth_mesh.shape):
+        borehole_rotation_matrix = calculate_rotation_matrix_azimuth_inclination(
+            np.rad2deg(azimuth_mesh[index]), np.rad2deg(inclination_mesh[index])
+        )
+        transformed_stress = (
+            borehole_rotation_matrix @ rotation_matrix.T @ stress_matrix
+            @ rotation_matrix @ borehole_rotation_matrix.T
+        )
+        max_tangential_stress, _, _, _ = calculate_tangential_stress(
+            transformed_stress, THETA, poisson_ratio, mud_pressure - pore_pressure
+        )
+        ucs[index] = np.max(max_tangential_stress) - (mud_pressure - pore_pressure) * (
+            (friction_coefficient**2 + 1)**0.5 + friction_coefficient
+        )**2
+        _, _, _, axium_tt = calculate_tangential_stress(
+            transformed_stress, THETA, poisson_ratio, pore_pressure - mud_pressure
+        )
+        mud_pressure_required[index] = np.min(axium_tt) - tensile_strength + pore_pressure
+    return ucs, mud_pressure_required
+
+
+@pytest.fixture(scope='module')
+def loop_fields():
+    return loop_polar_fields(*SCENARIO)
+
+
+@pytest.mark.parametrize('theta_method, tolerance', [('grid', 1e-9), ('extremum', 1e-3)])
+def test_polar_fields_match_loop(loop_fields, theta_method, tolerance):
+    ucs, mud_pressure_required = loop_fields
+    fields = calculate_polar_fields(*SCENARIO, theta_method=theta_method, chunk_size=1000)
+    np.testing.assert_allclose(fields.ucs, ucs, rtol=0, atol=tolerance)
+    np.testing.assert_allclose(fields.mud_pressure_required, mud_pressure_required, rtol=0, atol=tolerance)
+
+def test_concurrent_computations_are_coalesced():
+    cache = LRUCache()
+    calls = []
+
+    def compute():
+        calls.append(threading.get_ident())
+        time.sleep(0.2)
+        return 42
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute('key', compute)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [42] * 4
+    assert len(calls) == 1
+    assert cache.stats()['coalesced'] == 3
+
+def test_none_is_cached():
+    cache = LRUCache()
+    calls = []
+    for _ in range(2):
+        assert cache.get_or_compute('key', lambda: calls.append(1)) is None
+    assert len(calls) == 1
+
+def test_lease_holder_value_is_awaited(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    worker, other_worker = DiskCache(path), DiskCache(path)
+    assert worker.acquire_lease('key', 'worker', 60)
+    threading.Timer(0.3, lambda: (worker.put('key', 42), worker.release_lease('key', 'worker'))).start()
+    assert other_worker.get_or_compute('key', lambda: pytest.fail('computed twice')) == 42
+    assert other_worker.stats()['coalesced'] == 1
+
+def test_lease_follower_is_cancelled(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    worker, other_worker = DiskCache(path), DiskCache(path)
+    assert worker.acquire_lease('key', 'worker', 60)
+    start = time.time()
+    with pytest.raises(ComputationCancelled):
+        other_worker.get_or_compute('key', lambda: 0, cancelled=lambda: time.time() > start + 0.3)
+    assert time.time() - start < 5
@@ -7,18 +7,43 @@ import os
 import json
 
 from iwst.app import create_app
-from iwst.utils.config import Config
+from iwst.utils.config import Config, set_app_config
+from iwst.core.kernels import warmup_kernel
+from iwst.core.basis import ensure_basis
+from iwst.routes.home.artifacts import build_default_artifacts, ensure_default_artifacts
 import iwst as iwst_app
 
 import logging
 logger = logging.getLogger()
 
 
+def precompute(config: Config, rebuild: bool = True):
+    """Build what the workers share, once, before they start
+
+    The kernels are compiled (and cached on disk), the orientation basis is built, and
+    the plots of the default scenario are computed for the new pages (see
+    iwst.routes.home.artifacts). The workers only load them: `create_app` does not build
+    the plots, so several workers never race to build the same file.
+
+    Args:
+        config: configuration settings of the app
+        rebuild: whether the plots of the default scenario are computed again if their
+            file already exists
+
+    """
+    warmup_kernel(config.compute.backend)
+    ensure_basis(config.compute.basis_dir)
+    if rebuild:
+        build_default_artifacts(config.compute.artifacts_dir)
+    else:
+        ensure_default_artifacts(config.compute.artifacts_dir)
+
 def iwst():
     """Command to start IWST - Isamgeo Wellbore stability Tool"""
     parser = argparse.ArgumentParser(description='Command to start IWST - Isamgeo Wellbore stability Tool')
     parser.add_argument('-dev', dest='dev', action='store_true', help='Use the server integrated in dash (for debugging)')
     parser.add_argument('-config', dest='config', help='IWST config file (default: /home/$USER/.config/iswt/iwst.conf)')
+    parser.add_argument('-precompute', dest='precompute', action='store_true', help='Build the orientation basis and the plots of the default scenario, then exit')
     parser.add_argument('-j', action='version')
 
     parser.version = iwst_app.__version__
@@ -26,6 +51,11 @@ def iwst():
     
     # read config file
     config = Config.load(args.config)
+
+    set_app_config(config)
+    if args.precompute:
+        precompute(config)
+        return
     
     # start server
     if args.dev:
@@ -42,12 +72,22 @@ def iwst():
             dev_tools_silence_routes_logging=False
         )
     else:
+        # the workers only load what the master built before starting them
+        precompute(config, rebuild=False)
+
         subprocess.call(
             [
                 "gunicorn", 
                 "iwst.wsgi:server", 
                 "-w", 
                 "4", 
+                # a worker serves several requests at once, so the priority classes of
+                # the scheduler overlap (the plots are rendered without the global
+                # state of pyplot)
+                "-k",
+                "gthread",
+                "--threads",
+                "4",
                 "-b", 
                 ":8051", 
                 "--timeout", 
@@ -0,0 +1,613 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+import dataclasses
+import hashlib
+import json
+import os
+import pickle
+import secrets
+import sqlite3
+import sys
+import threading
+import time
+import numpy as np
+from iwst.core.polar import ComputationCancelled
+from iwst.utils.config import get_app_config
+import logging
+logger = logging.getLogger()
+
+
+# decimals kept when hashing the inputs of a scenario
+SCENARIO_DECIMALS = 6
+CACHE_BACKENDS = ('memory', 'disk', 'redis', 'null')
+
+# seconds a computation lease of a shared cache is held at most (e.g. if its worker dies),
+# seconds another worker waits at most for it and between two lookups of the result
+LEASE_TTL = 120
+LEASE_WAIT = 120
+LEASE_POLL = 0.1
+
+# value of `ResultCache._get` for a missing or expired key: None is a value like the others
+_MISS = object()
+
+# result cache of this worker, created on first use
+_result_cache: Optional[ResultCache] = None
+
+
+def scenario_key(namespace: str, *values: Any) -> str:
+    """Canonical hash of the inputs of a scenario
+
+    Numbers are rounded to SCENARIO_DECIMALS so that values differing only by float noise
+    (e.g. 0.1 + 0.2 and 0.3, 0 and -0.0, 70 and 70.0) share the same key.
+
+    Args:
+        namespace: name of the computation the key is used for
+        values: inputs of the computation (numbers, strings, booleans or None)
+
+    Returns:
+        hex digest of the scenario
+
+    """
+    quantized = []
+    for value in values:
+        if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+            value = round(float(value), SCENARIO_DECIMALS) + 0.0
+        quantized.append(value)
+    payload = json.dumps([namespace, quantized], separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def quantize(value: Any, step: float) -> Any:
+    """Round a number to a multiple of step (e.g. the step of its input), other values unchanged
+
+    Applied to the values of a key (see `scenario_key`), scenarios differing only below
+    the precision of their inputs share their cached results.
+    """
+    if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+        return round(round(float(value) / step) * step, SCENARIO_DECIMALS) + 0.0
+    return value
+
+def sizeof(value: Any) -> int:
+    """Approximate size in bytes of a cached value (arrays, strings and containers of them)"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(sizeof(key) + sizeof(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(sizeof(item) for item in value)
+    if dataclasses.is_dataclass(value):
+        return sizeof(vars(value))
+    return sys.getsizeof(value)
+
+
+class Flight:
+    """Computation of a key in progress in this process, awaited by the other callers"""
+    def __init__(self):
+        self.done = threading.Event()
+        # _MISS until computed, kept if the computation fails
+        self.value: Any = _MISS
+
+
+class ResultCache(ABC):
+    """Base class of the result caches
+
+    Subclasses implement `_get`, `put` and `clear`; lookups are counted here. Cached values are
+    shared between callers and must not be modified.
+
+    Concurrent computations of the same key are coalesced (single flight): the first
+    caller computes the value, the others of the process wait for it. Shared caches also
+    take a lease of the key (see `acquire_lease`), so the workers of other processes wait
+    for the value instead of computing it again.
+    """
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._counters_lock = threading.Lock()
+        self._flights: Dict[Hashable, Flight] = {}
+
+    @abstractmethod
+    def _get(self, key: Hashable) -> Any:
+        """Get a cached value, _MISS if missing or expired, without counting the lookup"""
+
+    def _lookup(self, key: Hashable) -> Any:
+        """Get a cached value, _MISS if missing or expired, counting the lookup"""
+        value = self._get(key)
+        with self._counters_lock:
+            if value is _MISS:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get a cached value, None if missing or expired"""
+        value = self._lookup(key)
+        return None if value is _MISS else value
+
+    @abstractmethod
+    def put(self, key: Hashable, value: Any):
+        """Store a value"""
+
+    def acquire_lease(self, key: Hashable, owner: str, ttl: int) -> bool:
+        """Take the lease of computing a key for ttl seconds, false if another owner holds it
+
+        Caches not shared by other processes have nothing to coordinate and always grant it.
+        """
+        return True
+
+    def release_lease(self, key: Hashable, owner: str):
+        """Release the lease of a key if owner still holds it"""
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        cancelled: Optional[Callable[[], bool]] = None
+    ) -> Any:
+        """Get a cached value or compute and store it
+
+        If the key is being computed by another caller, its value is awaited instead. If
+        that computation fails (e.g. it is cancelled), the callers waiting for it compute
+        the value themselves.
+
+        Args:
+            key: key of the value
+            compute: computation of the value, called on a miss
+            cancelled: checked while waiting for the value of another caller,
+                ComputationCancelled is raised when true
+
+        Returns:
+            the cached or computed value
+
+        """
+        value = self._lookup(key)
+        while value is _MISS:
+            with self._counters_lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = Flight()
+            if not leader:
+                while not flight.done.wait(LEASE_POLL):
+                    if cancelled is not None and cancelled():
+                        raise ComputationCancelled(f'Cancelled while waiting for {key}.')
+                value = flight.value
+                if value is not _MISS:
+                    with self._counters_lock:
+                        self.coalesced += 1
+                continue
+
+            try:
+                value = flight.value = self._compute_leased(key, compute, cancelled)
+            finally:
+                with self._counters_lock:
+                    del self._flights[key]
+                flight.done.set()
+        return value
+
+    def _compute_leased(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        cancelled: Optional[Callable[[], bool]] = None
+    ) -> Any:
+        """Compute and store a value holding its lease, or wait for the holder's value"""
+        owner = secrets.token_hex(8)
+        deadline = time.time() + LEASE_WAIT
+        waited = False
+        while not self.acquire_lease(key, owner, LEASE_TTL):
+            waited = True
+            if cancelled is not None and cancelled():
+                raise ComputationCancelled(f'Cancelled while waiting for the lease of {key}.')
+            time.sleep(LEASE_POLL)
+            value = self._get(key)
+            if value is not _MISS:
+                with self._counters_lock:
+                    self.coalesced += 1
+                return value
+            if time.time() > deadline:
+                logger.warning(f'Lease of {key} not released in {LEASE_WAIT} s. Compute it anyway.')
+                break
+        try:
+            # the previous holder may have stored the value since the last lookup
+            value = self._get(key) if waited else _MISS
+            if value is not _MISS:
+                with self._counters_lock:
+                    self.coalesced += 1
+                return value
+            value = compute()
+            self.put(key, value)
+        finally:
+            self.release_lease(key, owner)
+        return value
+
+    @abstractmethod
+    def clear(self):
+        """Remove all the entries, counters are kept"""
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters of the cache"""
+        lookups = self.hits + self.misses
+        return {
+            'backend': type(self).__name__,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'coalesced': self.coalesced,
+        }
+
+
+class NullCache(ResultCache):
+    """Cache that stores nothing, every lookup is a miss (e.g. for tests)"""
+    def _get(self, key: Hashable) -> Any:
+        return _MISS
+
+    def put(self, key: Hashable, value: Any):
+        pass
+
+    def clear(self):
+        pass
+
+
+class LRUCache(ResultCache):
+    """Bounded least recently used cache of computed results in the memory of a worker
+
+    Entries are evicted, least recently used first, when either the number of entries or
+    their total size exceeds the limits.
+
+    Args:
+        max_entries: maximum number of entries
+        max_bytes: maximum total size of the entries in bytes
+        ttl: time to live of the entries in seconds (0 for no expiry)
+
+    """
+    def __init__(self, max_entries: int = 64, max_bytes: int = 128 * 1024**2, ttl: int = 0):
+        super().__init__()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._expires: Dict[Hashable, float] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: Hashable) -> Any:
+        with self._lock:
+            if key not in self._entries:
+                return _MISS
+            if self.ttl and self._expires[key] < time.time():
+                self._remove(key)
+                return _MISS
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def _remove(self, key: Hashable):
+        del self._entries[key]
+        del self._expires[key]
+        self._bytes -= self._sizes.pop(key)
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value, values larger than the whole cache are not stored"""
+        size = sizeof(value)
+        if size > self.max_bytes:
+            logger.debug(f'Result of {size / 1024**2:.1f} MB exceeds the cache size. Not cached.')
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._expires[key] = time.time() + self.ttl
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._expires.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **super().stats(),
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+
+class DiskCache(ResultCache):
+    """Result cache in a SQLite file, shared by all the workers of a node
+
+    Values are pickled. Entries expire after the time to live and the least recently used
+    ones are removed when the total size exceeds the limit.
+
+    Args:
+        path: path of the SQLite file
+        max_bytes: maximum total size of the entries in bytes
+        ttl: time to live of the entries in seconds (0 for no expiry)
+
+    """
+    def __init__(self, path: str, max_bytes: int = 1024**3, ttl: int = 0):
+        super().__init__()
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Connection of this process, connections are not inherited by forked workers"""
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, '
+                'expires REAL NOT NULL, accessed REAL NOT NULL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires REAL NOT NULL)'
+            )
+            connection.commit()
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def _get(self, key: Hashable) -> Any:
+        now = time.time()
+        try:
+            with self._lock:
+                connection = self._connect()
+                row = connection.execute(
+                    'SELECT value, expires FROM results WHERE key = ?', (str(key),)
+                ).fetchone()
+                if row is None:
+                    return _MISS
+                if self.ttl and row[1] < now:
+                    connection.execute('DELETE FROM results WHERE key = ?', (str(key),))
+                    connection.commit()
+                    return _MISS
+                connection.execute('UPDATE results SET accessed = ? WHERE key = ?', (now, str(key)))
+                connection.commit()
+            return pickle.loads(row[0])
+        except sqlite3.Error as err:
+            logger.warning(f'Disk cache lookup failed: {err}')
+            return _MISS
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value, values larger than the whole cache are not stored"""
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            logger.debug(f'Result of {len(data) / 1024**2:.1f} MB exceeds the cache size. Not cached.')
+            return
+
+        now = time.time()
+        try:
+            with self._lock:
+                connection = self._connect()
+                connection.execute(
+                    'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)',
+                    (str(key), data, len(data), now + self.ttl, now)
+                )
+                if self.ttl:
+                    connection.execute('DELETE FROM results WHERE expires < ?', (now,))
+                total, = connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()
+                while total > self.max_bytes:
+                    oldkey, size = connection.execute(
+                        'SELECT key, size FROM results ORDER BY accessed LIMIT 1'
+                    ).fetchone()
+                    connection.execute('DELETE FROM results WHERE key = ?', (oldkey,))
+                    total -= size
+                connection.commit()
+        except sqlite3.Error as err:
+            logger.warning(f'Disk cache store failed: {err}')
+
+    def acquire_lease(self, key: Hashable, owner: str, ttl: int) -> bool:
+        now = time.time()
+        try:
+            with self._lock:
+                connection = self._connect()
+                connection.execute('DELETE FROM leases WHERE expires < ?', (now,))
+                cursor = connection.execute(
+                    'INSERT OR IGNORE INTO leases VALUES (?, ?, ?)', (str(key), owner, now + ttl)
+                )
+                connection.commit()
+            return cursor.rowcount == 1
+        except sqlite3.Error as err:
+            logger.warning(f'Disk cache lease failed: {err}')
+            return True
+
+    def release_lease(self, key: Hashable, owner: str):
+        try:
+            with self._lock:
+                connection = self._connect()
+                connection.execute('DELETE FROM leases WHERE key = ? AND owner = ?', (str(key), owner))
+                connection.commit()
+        except sqlite3.Error as err:
+            logger.warning(f'Disk cache lease release failed: {err}')
+
+    def clear(self):
+        with self._lock:
+            connection = self._connect()
+            connection.execute('DELETE FROM results')
+            connection.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._connect().execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results'
+            ).fetchone()
+        return {
+            **super().stats(),
+            'entries': entries,
+            'bytes': size,
+            'max_bytes': self.max_bytes,
+        }
+
+
+class RedisCache(ResultCache):
+    """Result cache in a Redis-compatible server, shared by all the workers and nodes
+
+    Values are pickled and stored with the time to live; the total size is bounded by the
+    `maxmemory` policy of the server, values larger than `max_value_bytes` are not stored.
+    Connection errors are logged and count as misses.
+
+    Args:
+        url: URL of the server (e.g. redis://localhost:6379/0)
+        ttl: time to live of the entries in seconds (0 for no expiry)
+        max_value_bytes: maximum size of a single entry in bytes
+        prefix: prefix of the keys
+
+    """
+    def __init__(self, url: str, ttl: int = 0, max_value_bytes: int = 64 * 1024**2, prefix: str = 'iwst:'):
+        super().__init__()
+        import redis
+        self.url = url
+        self.ttl = ttl
+        self.max_value_bytes = max_value_bytes
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._errors = (redis.RedisError,)
+
+    def _get(self, key: Hashable) -> Any:
+        try:
+            data = self._client.get(f'{self.prefix}{key}')
+        except self._errors as err:
+            logger.warning(f'Redis cache lookup failed: {err}')
+            return _MISS
+        return _MISS if data is None else pickle.loads(data)
+
+    def put(self, key: Hashable, value: Any):
+        """Store a value, values larger than max_value_bytes are not stored"""
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_value_bytes:
+            logger.debug(f'Result of {len(data) / 1024**2:.1f} MB exceeds the cache entry size. Not cached.')
+            return
+        try:
+            self._client.set(f'{self.prefix}{key}', data, ex=self.ttl or None)
+        except self._errors as err:
+            logger.warning(f'Redis cache store failed: {err}')
+
+    def acquire_lease(self, key: Hashable, owner: str, ttl: int) -> bool:
+        try:
+            return bool(self._client.set(f'{self.prefix}lease:{key}', owner, nx=True, ex=ttl))
+        except self._errors as err:
+            logger.warning(f'Redis cache lease failed: {err}')
+            return True
+
+    def release_lease(self, key: Hashable, owner: str):
+        try:
+            if self._client.get(f'{self.prefix}lease:{key}') == owner.encode():
+                self._client.delete(f'{self.prefix}lease:{key}')
+        except self._errors as err:
+            logger.warning(f'Redis cache lease release failed: {err}')
+
+    def clear(self):
+        for key in self._client.scan_iter(f'{self.prefix}*'):
+            self._client.delete(key)
+
+
+class TieredCache(ResultCache):
+    """Memory cache of a worker in front of a shared cache
+
+    Values found in the shared cache are kept in memory as well, so repeated lookups of
+    a worker do not pay the deserialization again.
+
+    Args:
+        memory: cache in the memory of the worker
+        shared: cache shared by the workers
+
+    """
+    def __init__(self, memory: LRUCache, shared: ResultCache):
+        super().__init__()
+        self.memory = memory
+        self.shared = shared
+
+    def _get(self, key: Hashable) -> Any:
+        value = self.memory._lookup(key)
+        if value is _MISS:
+            value = self.shared._lookup(key)
+            if value is not _MISS:
+                self.memory.put(key, value)
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        self.memory.put(key, value)
+        self.shared.put(key, value)
+
+    def acquire_lease(self, key: Hashable, owner: str, ttl: int) -> bool:
+        return self.shared.acquire_lease(key, owner, ttl)
+
+    def release_lease(self, key: Hashable, owner: str):
+        self.shared.release_lease(key, owner)
+
+    def clear(self):
+        self.memory.clear()
+        self.shared.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **super().stats(),
+            'memory': self.memory.stats(),
+            'shared': self.shared.stats(),
+        }
+
+
+def create_result_cache(cacheconfig: Optional[Any] = None) -> ResultCache:
+    """Create the result cache of a backend from the cache settings
+
+    Missing settings give the default memory cache. If the redis package is not
+    installed the memory cache is used alone.
+
+    Args:
+        cacheconfig: cache settings (see iwst.utils.config.CacheConfig)
+
+    Returns:
+        ResultCache
+
+    """
+    if cacheconfig is None:
+        return LRUCache()
+
+    if cacheconfig.backend == 'null':
+        return NullCache()
+
+    memory = LRUCache(cacheconfig.entries, cacheconfig.size * 1024**2, cacheconfig.ttl)
+    if cacheconfig.backend == 'disk':
+        shared = DiskCache(cacheconfig.path, cacheconfig.shared_size * 1024**2, cacheconfig.ttl)
+    elif cacheconfig.backend == 'redis':
+        try:
+            shared = RedisCache(cacheconfig.url, cacheconfig.ttl)
+        except ImportError:
+            logger.warning("Cache backend 'redis' is not installed. Fall back to 'memory'.")
+            return memory
+    else:
+        return memory
+    return TieredCache(memory, shared)
+
+def get_result_cache() -> ResultCache:
+    """Result cache of this worker, created from the cache settings of the running app"""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = create_result_cache(getattr(get_app_config(), 'cache', None))
+    return _result_cache
@@ -5,6 +5,7 @@ import yaml
 import os
 import sys
 from pathlib import Path
+from flask import current_app, has_app_context
 from iwst.utils.logging import MongoFormatter, MongoHandler
 from iwst.utils.login import User
 import logging.config
@@ -173,6 +174,259 @@ class EmailSettings:
             subject=subject
         )
 
+@dataclass
+class CacheConfig:
+    """Settings of the result cache of the polar plots and Mohr circles
+
+    Args:
+        backend: where results are cached ('memory' for each worker, 'disk' or 'redis'
+            shared by the workers in front of the memory of each worker, 'null' to disable)
+        entries: maximum number of cached scenarios in the memory of a worker
+        size: maximum size of the cached results in the memory of a worker in MB
+        ttl: time to live of the cached results in seconds (0 for no expiry)
+        shared_size: maximum size of the disk cache in MB
+        path: SQLite file of the disk cache
+        url: URL of the Redis-compatible server
+        images_dir: folder of the rendered images of the plots, shared by the workers
+        images_size: maximum size of the rendered images in MB
+
+    """
+    backend: str = 'memory'
+    entries: int = 64
+    size: int = 128
+    ttl: int = 86400
+    shared_size: int = 1024
+    path: str = os.path.join(Path.home(), '.cache/iwst/results.sqlite')
+    url: str = 'redis://localhost:6379/0'
+    images_dir: str = os.path.join(Path.home(), '.cache/iwst/images')
+    images_size: int = 512
+
+    @classmethod
+    def load(cls, data: Optional[Dict[str, Any]]):
+        """Load cache config from dict"""
+        if data is None:
+            logger.debug('Cache configuration not found. Set defaults.')
+            return cls()
+
+        backend = data.get('backend', cls.backend)
+        if backend not in ['memory', 'disk', 'redis', 'null']:
+            logger.error("Passed wrong cache backend. Available choices: 'memory', 'disk', 'redis', 'null'")
+            sys.exit(1)
+
+        entries = data.get('entries', cls.entries)
+        if not isinstance(entries, int) or entries < 1:
+            logger.error('Cache entries must be a positive integer.')
+            sys.exit(1)
+
+        size = data.get('size', cls.size)
+        if not isinstance(size, int) or size < 1:
+            logger.error('Cache size must be a positive integer (MB).')
+            sys.exit(1)
+
+        ttl = data.get('ttl', cls.ttl)
+        if not isinstance(ttl, int) or ttl < 0:
+            logger.error('Cache ttl must be a non negative integer (seconds).')
+            sys.exit(1)
+
+        shared_size = data.get('shared_size', cls.shared_size)
+        if not isinstance(shared_size, int) or shared_size < 1:
+            logger.error('Cache shared size must be a positive integer (MB).')
+            sys.exit(1)
+
+        path = data.get('path', cls.path)
+        url = data.get('url', cls.url)
+        images_dir = data.get('images_dir', cls.images_dir)
+
+        images_size = data.get('images_size', cls.images_size)
+        if not isinstance(images_size, int) or images_size < 1:
+            logger.error('Cache images size must be a positive integer (MB).')
+            sys.exit(1)
+
+        return cls(
+            backend,
+            entries,
+            size,
+            ttl,
+            shared_size,
+            path,
+            url,
+            images_dir,
+            images_size
+        )
+
+@dataclass
+class ComputeConfig:
+    """Settings of the numeric engine of the polar plots
+
+    Args:
+        chunk_size: orientations evaluated per chunk
+        dtype: floating point precision of the chunks ('float64' or 'float32')
+        max_memory: cap of the estimated peak memory of a request in MB
+        theta_method: how the wall angle extrema are found ('extremum' or 'grid')
+        backend: kernel backend of the wall stresses ('numpy', 'numexpr' or 'numba')
+        jit_cache_dir: folder of the compiled Numba kernels
+        basis_dir: folder of the precomputed orientation basis (memory-mapped by the workers)
+        mohr_circle_points: points of each Mohr circle of the Mohr-Coulomb plot
+        workers: processes evaluating the polar fields of a web worker (1 to compute them
+            in the web worker itself); 1 with background callbacks, whose short-lived
+            jobs would start a pool each (see iwst.core.parallel.get_pool)
+        background: whether the polar plots are computed by background callbacks, in
+            processes of their own instead of the web workers (the priority classes
+            of the scheduler then no longer pause them for the interactive plots)
+        background_dir: folder of the disk cache of the background callback jobs
+        interactive_workers: threads of a web worker for the single orientation plots
+        polar_workers: threads of a web worker for the polar plots
+        batch_workers: threads of a web worker for the prefetches and the exports
+        interactive_queue: single orientation plots waiting for a thread at most
+        polar_queue: polar plots waiting for a thread at most
+        batch_queue: prefetches and exports waiting for a thread at most
+        artifacts_dir: folder of the precomputed plots of the default scenario
+        polar_renderer: how the polar plots are drawn ('matplotlib' PNG images rendered by
+            the server, 'numpy' PNG images rasterized by the server without matplotlib, or
+            'plotly' figures of the fields rendered by the browser)
+
+    """
+    chunk_size: int = 512
+    dtype: str = 'float64'
+    max_memory: int = 256
+    theta_method: str = 'extremum'
+    backend: str = 'numpy'
+    jit_cache_dir: str = os.path.join(Path.home(), '.cache/iwst/numba')
+    basis_dir: str = os.path.join(Path.home(), '.cache/iwst/basis')
+    mohr_circle_points: int = 181
+    workers: int = 1
+    background: bool = False
+    background_dir: str = os.path.join(Path.home(), '.cache/iwst/background')
+    interactive_workers: int = 2
+    polar_workers: int = 1
+    batch_workers: int = 1
+    interactive_queue: int = 16
+    polar_queue: int = 4
+    batch_queue: int = 8
+    artifacts_dir: str = os.path.join(Path.home(), '.cache/iwst/artifacts')
+    polar_renderer: str = 'matplotlib'
+
+    @classmethod
+    def load(cls, data: Optional[Dict[str, Any]]):
+        """Load compute config from dict"""
+        if data is None:
+            logger.debug('Compute configuration not found. Set defaults.')
+            return cls()
+
+        chunk_size = data.get('chunk_size', cls.chunk_size)
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            logger.error('Compute chunk size must be a positive integer.')
+            sys.exit(1)
+
+        dtype = data.get('dtype', cls.dtype)
+        if dtype not in ['float64', 'float32']:
+            logger.error("Passed wrong compute dtype. Available choices: 'float64', 'float32'")
+            sys.exit(1)
+
+        max_memory = data.get('max_memory', cls.max_memory)
+        if not isinstance(max_memory, int) or max_memory < 1:
+            logger.error('Compute max memory must be a positive integer (MB).')
+            sys.exit(1)
+
+        theta_method = data.get('theta_method', cls.theta_method)
+        if theta_method not in ['extremum', 'grid']:
+            logger.error("Passed wrong compute theta method. Available choices: 'extremum', 'grid'")
+            sys.exit(1)
+
+        backend = data.get('backend', cls.backend)
+        if backend not in ['numpy', 'numexpr', 'numba']:
+            logger.error("Passed wrong compute backend. Available choices: 'numpy', 'numexpr', 'numba'")
+            sys.exit(1)
+
+        # numba reads the cache folder from the environment when it is imported
+        jit_cache_dir = data.get('jit_cache_dir', cls.jit_cache_dir)
+        os.environ.setdefault('NUMBA_CACHE_DIR', jit_cache_dir)
+
+        basis_dir = data.get('basis_dir', cls.basis_dir)
+
+        mohr_circle_points = data.get('mohr_circle_points', cls.mohr_circle_points)
+        if not isinstance(mohr_circle_points, int) or mohr_circle_points < 2:
+            logger.error('Compute Mohr circle points must be an integer greater than 1.')
+            sys.exit(1)
+
+        workers = data.get('workers', cls.workers)
+        if not isinstance(workers, int) or workers < 1:
+            logger.error('Compute workers must be a positive integer.')
+            sys.exit(1)
+
+        background = data.get('background', cls.background)
+        if not isinstance(background, bool):
+            logger.error('Compute background must be a boolean.')
+            sys.exit(1)
+        if background and workers > 1:
+            logger.warning('Compute workers ignored with background callbacks. Polar fields are computed by the jobs themselves.')
+            workers = 1
+
+        background_dir = data.get('background_dir', cls.background_dir)
+
+        # threads and queue of every priority class of the scheduler
+        scheduler = {}
+        for name in ['interactive', 'polar', 'batch']:
+            scheduler[f'{name}_workers'] = data.get(f'{name}_workers', getattr(cls, f'{name}_workers'))
+            if not isinstance(scheduler[f'{name}_workers'], int) or scheduler[f'{name}_workers'] < 1:
+                logger.error(f'Compute {name} workers must be a positive integer.')
+                sys.exit(1)
+            scheduler[f'{name}_queue'] = data.get(f'{name}_queue', getattr(cls, f'{name}_queue'))
+            if not isinstance(scheduler[f'{name}_queue'], int) or scheduler[f'{name}_queue'] < 0:
+                logger.error(f'Compute {name} queue must be a non negative integer.')
+                sys.exit(1)
+
+        artifacts_dir = data.get('artifacts_dir', cls.artifacts_dir)
+
+        polar_renderer = data.get('polar_renderer', cls.polar_renderer)
+        if polar_renderer not in ['matplotlib', 'numpy', 'plotly']:
+            logger.error("Passed wrong compute polar renderer. Available choices: 'matplotlib', 'numpy', 'plotly'")
+            sys.exit(1)
+
+        return cls(
+            chunk_size,
+            dtype,
+            max_memory,
+            theta_method,
+            backend,
+            jit_cache_dir,
+            basis_dir,
+            mohr_circle_points,
+            workers,
+            background,
+            background_dir,
+            **scheduler,
+            artifacts_dir=artifacts_dir,
+            polar_renderer=polar_renderer
+        )
+
+
+# configuration of the app started by this process, for the code running outside of an
+# application context (e.g. the background callback jobs forked by a web worker)
+_app_config: Optional[Config] = None
+
+
+def set_app_config(config: Optional[Config]):
+    """Register the configuration of the app started by this process"""
+    global _app_config
+    _app_config = config
+
+
+def get_app_config() -> Optional[Config]:
+    """Configuration of the running app, or of the app started by this process"""
+    if has_app_context():
+        return current_app.config.get('IWST')
+    return _app_config
+
+
+def get_compute_config() -> ComputeConfig:
+    """Compute settings of the running app (defaults if no app is running)"""
+    compute = getattr(get_app_config(), 'compute', None)
+    if compute is not None:
+        return compute
+    return ComputeConfig()
+
+
 @dataclass
 class Config:
     """Manage configuration file
@@ -180,11 +434,15 @@ class Config:
     Args:
         database: settings of the database
         log: settings for logging
+        compute: settings of the numeric engine
+        cache: settings of the result cache
 
     """
     database: DatabaseConfig
     users: Users
     emailsettings: EmailSettings
+    compute: ComputeConfig
+    cache: CacheConfig
 
     @classmethod
     def load(cls, argconfig: Optional[str] = None):
@@ -263,11 +521,19 @@ class Config:
         # load email settings
         emailsettings = EmailSettings.load(config.get('emailsettings'))
 
+        # load compute settings
+        compute = ComputeConfig.load(config.get('compute'))
+
+        # load cache settings
+        cache = CacheConfig.load(config.get('cache'))
+
         # log end of parsing data
         logger.info('Configuration file loaded.')
 
         return cls(
             dbconfig,
             users,
-            emailsettings
+            emailsettings,
+            compute,
+            cache
         )
@@ -0,0 +1,130 @@
+from __future__ import annotations
+from typing import Optional
+import base64
+import hashlib
+import os
+import re
+import tempfile
+from iwst.utils.config import CacheConfig, get_app_config
+import logging
+logger = logging.getLogger()
+
+
+# route of the images, behind the login of the full app
+IMAGES_URL = '/full/images/'
+
+# names of the images: hash of their content and format
+IMAGE_NAME = re.compile(r'^[0-9a-f]{64}\.png$')
+
+# subfolder of the pinned images, never pruned
+PINNED_DIR = 'pinned'
+
+# image store of this process, created on first use
+_image_store: Optional[ImageStore] = None
+
+
+class ImageStore:
+    """Rendered images of the plots, stored in a folder under the hash of their content
+
+    The pages load the images from a route of the app (see `IMAGES_URL`) instead of
+    receiving them as data URIs in the callbacks, so the browser caches them: a scenario
+    shown again costs a conditional request answered by 304. The folder is shared by the
+    workers (and the background jobs) of a node. The least recently stored images are
+    removed when the folder exceeds its size; an image shown again is stored again.
+    The pinned images (e.g. the plots of the default scenario, whose URLs are in the
+    layout of every page) are stored in a subfolder (see `PINNED_DIR`), which no worker
+    prunes.
+
+    Args:
+        folder: folder of the images
+        max_size: maximum size of the images in bytes
+
+    """
+    def __init__(self, folder: str, max_size: int):
+        self.folder = folder
+        self.max_size = max_size
+        self.pinned_folder = os.path.join(folder, PINNED_DIR)
+        os.makedirs(self.pinned_folder, exist_ok=True)
+
+    def put(self, data: bytes, pinned: bool = False) -> str:
+        """Store a PNG image, if not stored yet
+
+        Args:
+            data: PNG image
+            pinned: whether the image is kept whatever the size of the folder (see `prune`)
+
+        Returns:
+            name of the image, the hash of its content
+
+        """
+        name = f'{hashlib.sha256(data).hexdigest()}.png'
+        folder = self.pinned_folder if pinned else self.folder
+        path = os.path.join(folder, name)
+        try:
+            # the image is recently used, it is kept by `prune`
+            os.utime(path)
+            return name
+        except FileNotFoundError:
+            pass
+        fid, tmppath = tempfile.mkstemp(dir=folder, suffix='.tmp')
+        try:
+            with os.fdopen(fid, 'wb') as tmpfile:
+                tmpfile.write(data)
+            os.replace(tmppath, path)
+        except BaseException:
+            os.remove(tmppath)
+            raise
+        if not pinned:
+            self.prune()
+        return name
+
+    def path(self, name: str) -> Optional[str]:
+        """Path of a stored image, None if the name is not one of an image or it is not stored"""
+        if not IMAGE_NAME.match(name):
+            return None
+        for folder in (self.pinned_folder, self.folder):
+            path = os.path.join(folder, name)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def prune(self):
+        """Remove the least recently stored images while the folder exceeds its size
+
+        Only the images of the folder itself are counted and removed, not the pinned ones.
+        """
+        images = []
+        for entry in os.scandir(self.folder):
+            if IMAGE_NAME.match(entry.name):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                images.append((stat.st_mtime, stat.st_size, entry.path))
+        size = sum(image[1] for image in images)
+        for _, image_size, path in sorted(images):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size -= image_size
+
+
+def create_image_store(cache: Optional[CacheConfig] = None) -> ImageStore:
+    """Image store of the cache settings"""
+    cache = cache or CacheConfig()
+    return ImageStore(cache.images_dir, cache.images_size * 1024**2)
+
+def get_image_store() -> ImageStore:
+    """Image store of this process, created from the cache settings of the running app"""
+    global _image_store
+    if _image_store is None:
+        _image_store = create_image_store(getattr(get_app_config(), 'cache', None))
+    return _image_store
+
+def image_url(src: str, pinned: bool = False) -> str:
+    """Store the image of a PNG data URI, pinned if asked (see `ImageStore.put`), and return its URL"""
+    name = get_image_store().put(base64.b64decode(src.split(',', 1)[1]), pinned)
+    return f'{IMAGES_URL}{name}'
@@ -0,0 +1,148 @@
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+import contextvars
+import os
+import threading
+from iwst.utils.config import ComputeConfig, get_compute_config
+import logging
+logger = logging.getLogger()
+
+
+# priority classes of the computations, from the most urgent:
+# - interactive: single orientation plots (borehole stress and Mohr-Coulomb)
+# - polar: polar grids of the plots on screen
+# - batch: prefetches of the hidden tabs and exports
+PRIORITY_CLASSES = ('interactive', 'polar', 'batch')
+
+# seconds a computation waits at most for the more urgent ones at a checkpoint
+YIELD_TIMEOUT = 2.0
+
+# scheduler of this process, created on first use
+_scheduler: Optional[ComputeScheduler] = None
+_scheduler_pid = 0
+
+
+class SchedulerBusy(Exception):
+    """Raised when the queue of a priority class is full"""
+
+
+class ComputeScheduler:
+    """Run the computations of a web worker by priority class
+
+    Every class has threads of its own and a bounded queue, so the single orientation
+    plots never wait behind the polar grids, which never wait behind the prefetches and
+    the exports. A computation submitted to a full class is refused with SchedulerBusy
+    instead of piling up. Long computations call `checkpoint` between their chunks and
+    pause while more urgent computations are running, so they do not compete for the
+    interpreter with them. The classes only overlap with workers serving several
+    requests at once (gunicorn `-k gthread`, as started by `iwst`): a sync worker runs
+    one computation at a time, whatever its class. The classes are accounted by the
+    process: with background callbacks (`ComputeConfig.background`), the polar plots
+    run in jobs of their own, whose checkpoints never see the interactive computations
+    of the web workers, so the priorities only apply when `background` is off.
+
+    Args:
+        workers: threads of every class
+        queues: computations of every class waiting for a thread at most
+
+    """
+    def __init__(self, workers: Dict[str, int], queues: Dict[str, int]):
+        self.executors = {
+            name: ThreadPoolExecutor(workers[name], thread_name_prefix=f'iwst-{name}')
+            for name in PRIORITY_CLASSES
+        }
+        self.slots = {
+            name: threading.BoundedSemaphore(workers[name] + queues[name])
+            for name in PRIORITY_CLASSES
+        }
+        self.running = {name: 0 for name in PRIORITY_CLASSES}
+        self.condition = threading.Condition()
+
+    def _run(self, priority: str, context: contextvars.Context, func: Callable, args, kwargs) -> Any:
+        with self.condition:
+            self.running[priority] += 1
+        try:
+            return context.run(func, *args, **kwargs)
+        finally:
+            with self.condition:
+                self.running[priority] -= 1
+                self.condition.notify_all()
+            self.slots[priority].release()
+
+    def submit(self, priority: str, func: Callable, *args, **kwargs) -> Future:
+        """Queue a computation in a class, with the context of the caller (e.g. the app)
+
+        Args:
+            priority: one of PRIORITY_CLASSES
+            func: computation, called with args and kwargs
+
+        Returns:
+            Future of the result
+
+        """
+        if not self.slots[priority].acquire(blocking=False):
+            raise SchedulerBusy(f"Queue of the {priority} computations is full.")
+        try:
+            return self.executors[priority].submit(
+                self._run, priority, contextvars.copy_context(), func, args, kwargs
+            )
+        except RuntimeError:
+            self.slots[priority].release()
+            raise
+
+    def run(self, priority: str, func: Callable, *args, **kwargs) -> Any:
+        """Run a computation in a class and wait for its result (see `submit`)"""
+        return self.submit(priority, func, *args, **kwargs).result()
+
+    def checkpoint(self, priority: str, timeout: float = YIELD_TIMEOUT):
+        """Wait while computations of more urgent classes are running
+
+        The wait is bounded by timeout, so a stream of urgent computations delays the
+        others without starving them.
+        """
+        urgent = PRIORITY_CLASSES[:PRIORITY_CLASSES.index(priority)]
+        with self.condition:
+            self.condition.wait_for(lambda: not any(self.running[name] for name in urgent), timeout)
+
+    def checked(self, priority: str, cancelled: Optional[Callable[[], bool]] = None) -> Callable[[], bool]:
+        """Cancellation check of a computation of a class, which is also its checkpoint
+
+        Args:
+            priority: class of the computation
+            cancelled: cancellation check of the computation (e.g. its supersession)
+
+        Returns:
+            check waiting at the checkpoint of the class, then calling cancelled
+
+        """
+        def check() -> bool:
+            self.checkpoint(priority)
+            return cancelled is not None and cancelled()
+        return check
+
+    def shutdown(self):
+        """Stop the threads of every class once their computations are done"""
+        for executor in self.executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def create_scheduler(compute: Optional[ComputeConfig] = None) -> ComputeScheduler:
+    """Scheduler with the threads and the queues of the compute settings"""
+    compute = compute or ComputeConfig()
+    return ComputeScheduler(
+        workers={name: getattr(compute, f'{name}_workers') for name in PRIORITY_CLASSES},
+        queues={name: getattr(compute, f'{name}_queue') for name in PRIORITY_CLASSES},
+    )
+
+def get_scheduler() -> ComputeScheduler:
+    """Scheduler of this process, configured by the compute settings of the running app
+
+    A forked process (e.g. a background callback job) starts its own scheduler, the
+    threads and the running computations of the parent are not inherited.
+    """
+    global _scheduler, _scheduler_pid
+    if _scheduler is None or _scheduler_pid != os.getpid():
+        _scheduler = create_scheduler(get_compute_config())
+        _scheduler_pid = os.getpid()
+    return _scheduler
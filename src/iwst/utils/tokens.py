@@ -0,0 +1,91 @@
+from __future__ import annotations
+from typing import Any, Callable, Optional
+import os
+import secrets
+from iwst.utils.cache import DiskCache, RedisCache, ResultCache
+from iwst.utils.config import CacheConfig, get_app_config
+import logging
+logger = logging.getLogger()
+
+
+# seconds a request token is kept after its last request
+TOKEN_TTL = 3600
+
+# request tokens of this worker, created on first use
+_request_tokens: Optional[RequestTokens] = None
+
+
+class RequestTokens:
+    """Latest request of every session and computation
+
+    Every request of a computation issues a new token for its session, which supersedes
+    the tokens issued before: the older requests of the session see that they are not
+    current anymore and stop at their next check. Tokens live in a store shared by the
+    workers (see `create_token_store`), so requests served by different workers, and
+    their background jobs, supersede each other.
+
+    Args:
+        store: where the latest token of every session is kept
+
+    """
+    def __init__(self, store: ResultCache):
+        self.store = store
+
+    @staticmethod
+    def _key(session: str, computation: str) -> str:
+        return f'token:{computation}:{session}'
+
+    def issue(self, session: str, computation: str) -> str:
+        """Issue the token of a new request, superseding the requests before it"""
+        token = secrets.token_hex(8)
+        self.store.put(self._key(session, computation), token)
+        return token
+
+    def is_current(self, session: str, computation: str, token: str) -> bool:
+        """Whether no newer request of the session has been issued (true if the store is unavailable)"""
+        latest = self.store.get(self._key(session, computation))
+        return latest is None or latest == token
+
+    def superseded(self, session: Optional[str], computation: str) -> Callable[[], bool]:
+        """Issue the token of a new request and return the check of its supersession
+
+        Without a session (e.g. a request from outside a page) the request is never
+        superseded.
+        """
+        if session is None:
+            return lambda: False
+        token = self.issue(session, computation)
+        return lambda: not self.is_current(session, computation, token)
+
+
+def create_token_store(cacheconfig: Optional[Any] = None) -> ResultCache:
+    """Store of the request tokens, shared by the workers and the background jobs of a node
+
+    A newer request served by another worker, or a background job started by another
+    worker, must see the tokens of the older ones, so tokens are never kept in the memory
+    of a worker: the redis backend keeps them as keys of their own on the server (shared
+    by all the nodes), the others in a SQLite file next to the disk cache (see
+    `CacheConfig.path`), even when the results themselves are cached in memory.
+
+    Args:
+        cacheconfig: cache settings (see iwst.utils.config.CacheConfig)
+
+    Returns:
+        ResultCache
+
+    """
+    cacheconfig = cacheconfig or CacheConfig()
+    if cacheconfig.backend == 'redis':
+        try:
+            return RedisCache(cacheconfig.url, TOKEN_TTL, prefix='iwst:token:')
+        except ImportError:
+            logger.warning("Cache backend 'redis' is not installed. Request tokens are kept on the disk of each node.")
+    path = f'{os.path.splitext(cacheconfig.path)[0]}-tokens.sqlite'
+    return DiskCache(path, ttl=TOKEN_TTL)
+
+def get_request_tokens() -> RequestTokens:
+    """Request tokens of this worker, stored according to the cache settings of the running app"""
+    global _request_tokens
+    if _request_tokens is None:
+        _request_tokens = RequestTokens(create_token_store(getattr(get_app_config(), 'cache', None)))
+    return _request_tokens